@@ -0,0 +1,436 @@
+"""
+CacheWskaznikow - trwały cache kolumn wskaźników (SQLite, tabela cache_wskaznikow).
+
+Klucz wpisu: (tyker, data ostatniej świecy, hash parametrów Konfiguracja,
+data ostatniej świecy benchmarku) + suma kontrolna cen (pierwsza świeca,
+ostatnie SWIECE_KONTROLNE świec i CRC32 całych kolumn close / volume).
+
+Wpisy tworzy oblicz() - wykres i panel szczegółów tykera. Skan rankingu
+korzysta z istniejących wpisów, ale nowych nie zakłada (patrz generuj_ranking).
+
+- Niezmieniony tyker    -> kolumny wczytane z cache, zero obliczeń
+- Nowe świece na końcu  -> StanWskaznikow (O(1) na świecę, tabela stan_wskaznikow),
+                           a gdy stanu brak - przeliczany tylko ogon (z rozbiegiem na najdłuższe okno)
+- Zmiana historii / konfiguracji -> pełne przeliczenie
+
+Kolumny są trzymane w float64 (TRYB_KOMPAKTOWY zwęża tylko zwracaną ramkę).
+Pełne przeliczenie i przeliczenie ogona zapisują całą ramkę (blob w
+cache_wskaznikow), a dopisanie ze stanu - tylko nowe wiersze (kawałek w
+cache_wskaznikow_przyrost), więc koszt zapisu zależy od liczby nowych świec.
+Po MAKS_PRZYROSTOW kawałkach wpis jest zapisywany od nowa w całości.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import zlib
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from dane.baza import BazaDanych
+from konfiguracja import Konfiguracja
+from .kalendarz_benchmarku import KalendarzBenchmarku
+from .stan_wskaznikow import StanWskaznikow
+from .typy_kompaktowe import TypyKompaktowe
+from .wskazniki import SilnikWskaznikow
+
+
+class CacheWskaznikow:
+    """
+    Cache wyników SilnikWskaznikow.oblicz_wskazniki per tyker.
+    """
+
+    # Podbić przy każdej zmianie formuł w oblicz_wskazniki
+    WERSJA = 3
+
+    # Liczba ostatnich świec objętych sumą kontrolną (oprócz pierwszej świecy)
+    SWIECE_KONTROLNE = 64
+
+    # Po tylu kawałkach przyrostowych wpis jest kompaktowany do jednego blobu
+    MAKS_PRZYROSTOW = 256
+
+    # Parametry Konfiguracja wpływające na wartości wskaźników
+    PARAMETRY_KONFIGURACJI = (
+        'SMA_SZYBKA', 'SMA_WOLNA', 'OKRES_ATR',
+        'MOMENTUM_KROTKIE', 'MOMENTUM_DLUGIE', 'OKRES_NACHYLENIA', 'TRYB_KOMPAKTOWY',
+        'OKRES_WOLUMENU', 'OKRES_WOLUMENU_DLUGI',
+    )
+
+    def __init__(self, polaczenie: Optional[sqlite3.Connection] = None):
+        self._polaczenie = polaczenie
+
+    @property
+    def polaczenie(self) -> sqlite3.Connection:
+        if self._polaczenie is None:
+            return BazaDanych().pobierz_polaczenie()
+        return self._polaczenie
+
+    # ── Klucze ──────────────────────────────
+
+    @staticmethod
+    def hash_konfiguracji() -> str:
+        """Hash wersji formuł i parametrów Konfiguracja używanych przez wskaźniki."""
+        wartosci = [CacheWskaznikow.WERSJA] + [
+            getattr(Konfiguracja, nazwa) for nazwa in CacheWskaznikow.PARAMETRY_KONFIGURACJI
+        ]
+        return hashlib.sha1(repr(wartosci).encode()).hexdigest()
+
+    @staticmethod
+    def rozbieg() -> int:
+        """Liczba świec historii potrzebna, by ostatni wiersz miał pełne okna."""
+        okres = Konfiguracja.OKRES_NACHYLENIA
+        return max(
+            Konfiguracja.SMA_WOLNA + okres,
+            Konfiguracja.MOMENTUM_DLUGIE + 1,
+            50 + okres,                      # RS_SMA50 -> RS_Slope
+            Konfiguracja.OKRES_ATR + 1,
+            Konfiguracja.OKRES_WOLUMENU_DLUGI + 1,  # UpDown_Vol - zmiana względem poprzedniej świecy
+        )
+
+    @staticmethod
+    def _suma_kontrolna(df: pd.DataFrame, n: int) -> str:
+        """
+        Suma kontrolna pierwszych n świec: daty i ceny pierwszej świecy i ostatnich
+        SWIECE_KONTROLNE świec oraz CRC32 całych kolumn close i volume.
+
+        CRC32 to jeden tani przebieg po danych - wykrywa korekty w środku historii
+        (np. wsteczne dostosowanie o dywidendę), których próbka ogona nie obejmuje.
+        """
+        pozycje = np.r_[0, np.arange(max(n - CacheWskaznikow.SWIECE_KONTROLNE, 1), n)]
+        pozycje = pozycje[pozycje < n]
+        h = hashlib.sha1(str(n).encode())
+        h.update(np.ascontiguousarray(df.index.asi8[pozycje]).tobytes())
+        for kolumna in ('high', 'low', 'close', 'volume'):
+            if kolumna not in df.columns:
+                continue
+            wartosci = df[kolumna].to_numpy(dtype=np.float64)
+            h.update(np.ascontiguousarray(wartosci[pozycje]).tobytes())
+            if kolumna in ('close', 'volume'):
+                h.update(zlib.crc32(np.ascontiguousarray(wartosci[:n])).to_bytes(4, 'little'))
+        return h.hexdigest()
+
+    @staticmethod
+    def _data_benchmarku(benchmark_df: Optional[pd.DataFrame]) -> str:
+        if benchmark_df is None or benchmark_df.empty:
+            return ''
+        return str(benchmark_df.index[-1])
+
+    # ── Główne API ──────────────────────────
+
+    def oblicz(self, tyker: str, df: pd.DataFrame, benchmark_df: pd.DataFrame = None,
+               w_miejscu: bool = True) -> pd.DataFrame:
+        """
+        Odpowiednik SilnikWskaznikow.oblicz_wskazniki korzystający z cache.
+
+        Args:
+            tyker: Symbol tykera (klucz cache)
+            df: DataFrame OHLCV z indeksem DateTime
+            benchmark_df: DataFrame benchmarku (opcjonalnie)
+            w_miejscu: True = kolumny dopisywane do df (jak oblicz_wskazniki);
+                False = df bez zmian, zwracana sama ramka wskaźników (jak oblicz_kolumny)
+
+        Returns:
+            pd.DataFrame: df z kolumnami wskaźników lub ramka samych wskaźników (w_miejscu=False)
+        """
+        if not w_miejscu:
+            if df.empty:
+                return SilnikWskaznikow.oblicz_kolumny(df, benchmark_df)
+            # Płytka kopia współdzieli OHLCV z df (copy-on-write) - dopisane kolumny nie trafiają do df
+            wynik = self.oblicz(tyker, SilnikWskaznikow.normalizuj_kolumny(df).copy(deep=False), benchmark_df)
+            return wynik[list(SilnikWskaznikow.KOLUMNY_WSKAZNIKOW)]
+
+        if df.empty:
+            return SilnikWskaznikow.oblicz_wskazniki(df, benchmark_df)
+
+        df = SilnikWskaznikow.normalizuj_kolumny(df)
+        hash_cfg = self.hash_konfiguracji()
+        data_bench = self._data_benchmarku(benchmark_df)
+        wpis = self._wczytaj(tyker)
+
+        if wpis is not None and wpis['hash_konfiguracji'] == hash_cfg:
+            zapisane = wpis['dane']
+            n_zap = wpis['liczba_swiec']
+
+            if n_zap <= len(df) and self._suma_kontrolna(df, n_zap) == wpis['suma_kontrolna']:
+                # 1. Trafienie - brak nowych świec i ten sam benchmark
+                if n_zap == len(df) and wpis['benchmark_data'] == data_bench:
+                    return self._typy(self._dolacz(df, zapisane))
+
+                # 2. Tylko dopisane świece -> aktualizacja przyrostowa ze stanu
+                wynik = self._dopisz_przyrostowo(tyker, df, benchmark_df, zapisane,
+                                                 wpis['benchmark_data'], hash_cfg)
+                if wynik is not None:
+                    if wpis['przyrosty'] < self.MAKS_PRZYROSTOW:
+                        self._zapisz_przyrost(tyker, wynik, n_zap, data_bench)
+                    else:
+                        self._zapisz(tyker, wynik, hash_cfg, data_bench)
+                    return self._typy(wynik)
+
+                # 3. Nowe świece / nowe dane benchmarku -> przelicz ogon
+                wynik = self._przelicz_ogon(df, benchmark_df, zapisane, wpis['benchmark_data'])
+                if wynik is not None:
+                    self._zapisz(tyker, wynik, hash_cfg, data_bench)
+                    self._zapisz_stan(tyker, wynik, benchmark_df, hash_cfg)
+                    return self._typy(wynik)
+
+        # 4. Brak wpisu / zmieniona historia lub konfiguracja -> pełne przeliczenie
+        wynik = SilnikWskaznikow.oblicz_wskazniki(df, benchmark_df)
+        self._zapisz(tyker, wynik, hash_cfg, data_bench)
+        self._zapisz_stan(tyker, wynik, benchmark_df, hash_cfg)
+        return self._typy(wynik)
+
+    def ma_wpis(self, tyker: str) -> bool:
+        """Czy tyker ma wpis dla bieżącej konfiguracji (bez wczytywania kolumn)."""
+        return self.polaczenie.execute(
+            "SELECT 1 FROM cache_wskaznikow WHERE tyker = ? AND hash_konfiguracji = ?",
+            (tyker, self.hash_konfiguracji()),
+        ).fetchone() is not None
+
+    def uniewaznij(self, tyker: str = None):
+        """Usuń wpis tykera (lub cały cache gdy tyker=None)."""
+        conn = self.polaczenie
+        for tabela in ('cache_wskaznikow', 'cache_wskaznikow_przyrost', 'stan_wskaznikow'):
+            if tyker is None:
+                conn.execute(f"DELETE FROM {tabela}")
+            else:
+                conn.execute(f"DELETE FROM {tabela} WHERE tyker = ?", (tyker,))
+        conn.commit()
+
+    # ── Implementacja ───────────────────────
+
+    @staticmethod
+    def _kolumny_wskaznikow(df: pd.DataFrame) -> list:
+        return [c for c in df.columns if c not in SilnikWskaznikow.KOLUMNY_OHLCV]
+
+    @staticmethod
+    def _ma_wspolne(indeks: pd.Index, benchmark_df: pd.DataFrame) -> bool:
+        """Czy daty tykera i benchmarku się przecinają (kalendarz benchmarku zamiast intersection)."""
+        kalendarz = KalendarzBenchmarku.dla(benchmark_df)
+        if kalendarz is not None and KalendarzBenchmarku.obslugiwany(indeks):
+            return kalendarz.ma_wspolne(indeks)
+        return not indeks.intersection(benchmark_df.index).empty
+
+    @staticmethod
+    def _typy(wynik: pd.DataFrame) -> pd.DataFrame:
+        """Zwarte typy zwracanej ramki (TRYB_KOMPAKTOWY) - stan i cache zostają w float64."""
+        if TypyKompaktowe.wlaczony():
+            return TypyKompaktowe.kompaktuj_wskazniki(wynik)
+        return wynik
+
+    @staticmethod
+    def _dolacz(df: pd.DataFrame, zapisane: pd.DataFrame) -> pd.DataFrame:
+        """Dopisz zapisane kolumny wskaźników do df (w miejscu, jak oblicz_wskazniki)."""
+        for kolumna in zapisane.columns:
+            df[kolumna] = zapisane[kolumna].to_numpy()
+        return df
+
+    def _przelicz_ogon(self, df: pd.DataFrame, benchmark_df: Optional[pd.DataFrame],
+                       zapisane: pd.DataFrame, data_bench_zapisana: str) -> Optional[pd.DataFrame]:
+        """
+        Przelicza wskaźniki tylko dla wierszy po ostatniej zapisanej świecy
+        (oraz po ostatniej zapisanej dacie benchmarku - RS mógł się zmienić).
+        Zwraca None, gdy pełne przeliczenie jest i tak konieczne.
+        """
+        rozbieg = self.rozbieg()
+        n_zap = len(zapisane)
+        if n_zap <= rozbieg:
+            return None
+
+        # Pierwszy wiersz do przeliczenia
+        start = n_zap
+        if benchmark_df is not None and not benchmark_df.empty:
+            if data_bench_zapisana:
+                start = min(start, int(df.index.searchsorted(pd.Timestamp(data_bench_zapisana), side='right')))
+            else:
+                start = 0
+        elif data_bench_zapisana:
+            # Benchmark zniknął - RS w całej historii wraca do wartości domyślnych
+            return None
+        if start <= rozbieg:
+            return None
+
+        ogon = df.iloc[start - rozbieg:].copy()
+        if benchmark_df is not None and not benchmark_df.empty:
+            # Brak wspólnych dat w ogonie - RS_SMA50 w pełnym obliczeniu zależałby od starszej historii
+            if not self._ma_wspolne(ogon.index, benchmark_df):
+                return None
+
+        ogon = SilnikWskaznikow.oblicz_wskazniki(ogon, benchmark_df)
+        kolumny = self._kolumny_wskaznikow(ogon)
+        if list(zapisane.columns) != kolumny:
+            return None
+
+        nowe = pd.concat([zapisane.iloc[:start], ogon[kolumny].iloc[rozbieg:]])
+        return self._dolacz(df, nowe)
+
+    def _dopisz_przyrostowo(self, tyker: str, df: pd.DataFrame, benchmark_df: Optional[pd.DataFrame],
+                            zapisane: pd.DataFrame, data_bench_zapisana: str,
+                            hash_cfg: str) -> Optional[pd.DataFrame]:
+        """
+        Dopisuje wiersze nowych świec z zapisanego StanWskaznikow (bez przeliczania okien).
+        Zwraca None, gdy stan nie pasuje - wtedy przeliczany jest ogon.
+        """
+        n_zap = len(zapisane)
+        liczba_nowych = len(df) - n_zap
+        if liczba_nowych <= 0 or liczba_nowych > self.rozbieg():
+            return None
+
+        stan = self._wczytaj_stan(tyker, hash_cfg, n_zap)
+        if stan is None:
+            return None
+
+        ma_benchmark = benchmark_df is not None and not benchmark_df.empty
+        if stan.rs_aktywny != ma_benchmark:
+            return None
+        # Benchmark zapisany przed ostatnią świecą - RS starszych wierszy też się zmienia
+        if ma_benchmark and pd.Timestamp(data_bench_zapisana) < df.index[n_zap - 1]:
+            return None
+
+        ogon = df.iloc[n_zap:]
+        ceny_bench = [None] * liczba_nowych
+        kalendarz = KalendarzBenchmarku.dla(benchmark_df) if ma_benchmark else None
+        if kalendarz is not None and KalendarzBenchmarku.obslugiwany(ogon.index):
+            pozycje, obecne = kalendarz.pozycje(ogon.index)
+            ceny_bench = [kalendarz.close[p] if jest else None for p, jest in zip(pozycje, obecne)]
+        elif ma_benchmark:
+            bench_close = SilnikWskaznikow.normalizuj_kolumny(benchmark_df)['close']
+            obecne = ogon.index.isin(bench_close.index)
+            wartosci = bench_close.reindex(ogon.index).to_numpy()
+            ceny_bench = [w if jest else None for w, jest in zip(wartosci, obecne)]
+
+        wolumeny = ogon['volume'].to_numpy(dtype=np.float64) if 'volume' in ogon.columns else [np.nan] * liczba_nowych
+        wiersze = [
+            stan.dodaj_swiece(data, h, l, c, cb, v)
+            for data, h, l, c, cb, v in zip(ogon.index, ogon['high'].to_numpy(), ogon['low'].to_numpy(),
+                                            ogon['close'].to_numpy(), ceny_bench, wolumeny)
+        ]
+        if set(wiersze[0]) != set(zapisane.columns):
+            return None
+
+        # Jedna kopia na kolumnę: zapisana historia + nowe wiersze prosto do df
+        for kolumna in zapisane.columns:
+            nowe = np.fromiter((w[kolumna] for w in wiersze), dtype=np.float64, count=liczba_nowych)
+            df[kolumna] = np.concatenate([zapisane[kolumna].to_numpy(dtype=np.float64), nowe])
+        self._zapisz_stan_obiekt(tyker, stan, hash_cfg)
+        return df
+
+    def _wczytaj_stan(self, tyker: str, hash_cfg: str, liczba_swiec: int) -> Optional[StanWskaznikow]:
+        row = self.polaczenie.execute(
+            "SELECT hash_konfiguracji, liczba_swiec, dane FROM stan_wskaznikow WHERE tyker = ?", (tyker,)
+        ).fetchone()
+        if row is None or row[0] != hash_cfg or row[1] != liczba_swiec:
+            return None
+        try:
+            return pickle.loads(row[2])
+        except Exception:
+            return None
+
+    def _zapisz_stan(self, tyker: str, wynik: pd.DataFrame, benchmark_df: Optional[pd.DataFrame], hash_cfg: str):
+        """Zbuduj stan z ogona świeżo policzonej ramki (lub usuń, gdy historia za krótka)."""
+        rs_aktywny = (
+            benchmark_df is not None and not benchmark_df.empty
+            and self._ma_wspolne(wynik.index, benchmark_df)
+        )
+        stan = StanWskaznikow.z_ramki(wynik, rs_aktywny)
+        if stan is None:
+            self.polaczenie.execute("DELETE FROM stan_wskaznikow WHERE tyker = ?", (tyker,))
+            self.polaczenie.commit()
+            return
+        self._zapisz_stan_obiekt(tyker, stan, hash_cfg)
+
+    def _zapisz_stan_obiekt(self, tyker: str, stan: StanWskaznikow, hash_cfg: str):
+        conn = self.polaczenie
+        conn.execute('''
+            INSERT INTO stan_wskaznikow (tyker, hash_konfiguracji, liczba_swiec, dane)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(tyker) DO UPDATE SET
+                hash_konfiguracji = excluded.hash_konfiguracji,
+                liczba_swiec      = excluded.liczba_swiec,
+                dane              = excluded.dane
+        ''', (tyker, hash_cfg, stan.liczba_swiec, pickle.dumps(stan, protocol=pickle.HIGHEST_PROTOCOL)))
+        conn.commit()
+
+    def _wczytaj(self, tyker: str) -> Optional[dict]:
+        """
+        Wpis tykera: blob pełnego zapisu sklejony z kawałkami dopisanymi przyrostowo
+        (data, benchmark i suma kontrolna z ostatniego kawałka).
+        """
+        c = self.polaczenie.cursor()
+        c.execute(
+            "SELECT liczba_swiec, hash_konfiguracji, benchmark_data, suma_kontrolna, dane "
+            "FROM cache_wskaznikow WHERE tyker = ?", (tyker,)
+        )
+        row = c.fetchone()
+        if row is None:
+            return None
+        try:
+            dane = pickle.loads(row[4])
+        except Exception:
+            return None
+        liczba_swiec, benchmark_data, suma_kontrolna = row[0], row[2], row[3]
+
+        przyrosty = c.execute(
+            "SELECT od, benchmark_data, suma_kontrolna, dane FROM cache_wskaznikow_przyrost "
+            "WHERE tyker = ? ORDER BY od", (tyker,)
+        ).fetchall()
+        if przyrosty:
+            bloki = [dane.to_numpy(dtype=np.float64)]
+            for od, benchmark_data, suma_kontrolna, blob in przyrosty:
+                if od != liczba_swiec:
+                    return None
+                blok = np.frombuffer(blob, dtype=np.float64).reshape(-1, len(dane.columns))
+                bloki.append(blok)
+                liczba_swiec += len(blok)
+            dane = pd.DataFrame(np.vstack(bloki), columns=dane.columns, copy=False)
+        if len(dane) != liczba_swiec:
+            return None
+
+        return {
+            'liczba_swiec': liczba_swiec,
+            'hash_konfiguracji': row[1],
+            'benchmark_data': benchmark_data or '',
+            'suma_kontrolna': suma_kontrolna,
+            'przyrosty': len(przyrosty),
+            'dane': dane,
+        }
+
+    def _zapisz_przyrost(self, tyker: str, wynik: pd.DataFrame, od: int, data_bench: str):
+        """Dopisz do wpisu tylko wiersze od pozycji od (wiersz z blobem pełnego zapisu bez zmian)."""
+        kolumny = self._kolumny_wskaznikow(wynik)
+        blok = np.column_stack([wynik[k].to_numpy(dtype=np.float64)[od:] for k in kolumny])
+        conn = self.polaczenie
+        conn.execute('''
+            INSERT OR REPLACE INTO cache_wskaznikow_przyrost
+                (tyker, od, ostatnia_data, benchmark_data, suma_kontrolna, dane)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            tyker, od, str(wynik.index[-1]), data_bench,
+            self._suma_kontrolna(wynik, len(wynik)), blok.tobytes(),
+        ))
+        conn.commit()
+
+    def _zapisz(self, tyker: str, wynik: pd.DataFrame, hash_cfg: str, data_bench: str):
+        """Pełny zapis wpisu (float64) - zastępuje blob i usuwa kawałki przyrostowe."""
+        kolumny = self._kolumny_wskaznikow(wynik)
+        dane = wynik[kolumny].reset_index(drop=True).astype(np.float64)
+        conn = self.polaczenie
+        conn.execute("DELETE FROM cache_wskaznikow_przyrost WHERE tyker = ?", (tyker,))
+        conn.execute('''
+            INSERT INTO cache_wskaznikow
+                (tyker, ostatnia_data, liczba_swiec, hash_konfiguracji, benchmark_data, suma_kontrolna, dane)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(tyker) DO UPDATE SET
+                ostatnia_data     = excluded.ostatnia_data,
+                liczba_swiec      = excluded.liczba_swiec,
+                hash_konfiguracji = excluded.hash_konfiguracji,
+                benchmark_data    = excluded.benchmark_data,
+                suma_kontrolna    = excluded.suma_kontrolna,
+                dane              = excluded.dane
+        ''', (
+            tyker, str(wynik.index[-1]), len(wynik), hash_cfg, data_bench,
+            self._suma_kontrolna(wynik, len(wynik)),
+            pickle.dumps(dane, protocol=pickle.HIGHEST_PROTOCOL),
+        ))
+        conn.commit()
@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+from .graf_wskaznikow import GrafWskaznikow
+from .kernele import last_max
 
 class SilnikWejscia:
     @staticmethod
@@ -53,24 +55,26 @@ class SilnikWejscia:
         # 1. Close > 20-day High (Donchian)
         # 2. RS Slope > 0 (siła relatywna rośnie)
         
-        max20 = df['high'].rolling(20).max().shift(1).iloc[-1] # Shift by nie patrzeć na dzisiejszy high wczoraj
+        max20 = last_max(df['high'].to_numpy()[:-1], 20) # Wczorajszy MAX20 (shift 1) - bez dzisiejszego high
         # Ale breakout to dzisiejsze close > wczorajszy MAX20
         
         if cena > max20:
             rs_slope = ostatni.get('RS_Slope', 0)
             if rs_slope > 0:
                 # Score za siłę wybicia (Volumen?)
-                vol_avg = df['volume'].rolling(20).mean().iloc[-1]
-                vol_curr = ostatni['volume']
+                # RVol z kolumn wskaźników (oblicz_wskazniki / cache), inaczej z grafu
+                rvol = ostatni.get('RVol', np.nan)
+                if pd.isna(rvol):
+                    rvol = ostatni['volume'] / GrafWskaznikow.dla(df)['VOL_SMA_20'].iloc[-1]
                 
                 bs_score = 80
-                if vol_curr > vol_avg * 1.5: bs_score += 10 # Mocny wolumen
+                if rvol > 1.5: bs_score += 10 # Mocny wolumen
                 if rs_slope > 0.1: bs_score += 10 # Silne RS
                 
                 return {
                     'typ': 'B (Breakout)',
                     'score': min(bs_score, 100),
-                    'detale': f"Wybicie > {max20:.2f}, Vol={vol_curr/vol_avg:.1f}x"
+                    'detale': f"Wybicie > {max20:.2f}, Vol={rvol:.1f}x"
                 }
                 
         return {'typ': 'BRAK', 'score': 0, 'detale': ''}
@@ -0,0 +1,265 @@
+"""
+GrafWskaznikow - deklaratywny graf (DAG) nazwanych wielkości pośrednich liczonych z ramki OHLCV.
+
+Konsument prosi o nazwane wyjście, np.:
+    graf = GrafWskaznikow.dla(df)
+    atr = graf['ATR14_ewm']
+    max6m = graf['HIGH_MAX_126']
+
+Każdy węzeł pobiera swoje zależności z tego samego grafu (np. ATR14_sma i ATR14_ewm
+korzystają z jednego TR), a wynik jest zapamiętywany dla danej ramki - kolejna reguła
+prosząca o ten sam węzeł nie robi dodatkowego przebiegu po danych.
+
+Graf z dla() jest ważny tak długo, jak odcisk ramki (długość, skrajne daty i suma
+kontrolna kolumn OHLCV) się nie zmienia - edycja cen w miejscu daje nowy graf.
+Węzły są zwracane jako płytkie kopie, więc zapis do wyniku nie psuje pamięci grafu.
+
+Dostępne węzły (n - liczba świec):
+    TR            True Range (max z high-low, |high-prev_close|, |low-prev_close|)
+    ATR{n}_sma    średnia krocząca TR (SilnikWskaznikow)
+    ATR{n}_ewm    EMA TR, adjust=False (VolatilityMetrics)
+    ATR{n}_wilder wygładzenie Wildera TR (+DI / -DI / ADX)
+    SMA_{n}       średnia krocząca close
+    HIGH_MAX_{n}  kroczące maksimum high (kernele.rolling_max)
+    LOW_MIN_{n}   kroczące minimum low (kernele.rolling_min)
+    DD_{n}        obsunięcie close od maksimum high z n świec (%)
+    BREAKOUT_{n}  close powyżej maksimum high z poprzednich n świec (Donchian, bool)
+    VOL_SMA_{n}   średnia krocząca wolumenu
+    DOLLAR_VOL_{n} średni obrót w $ (close * volume) z n świec
+    UPDOWN_VOL_{n} wolumen świec wzrostowych / spadkowych z n świec (NaN bez spadków)
+    RET_{n}       zwrot n-świecowy close (pct_change)
+    EMA_{n}       EMA close, adjust=False
+    RSI_{n}       RSI Wildera (0-100)
+    MACD_{f}_{s}  EMA_{f} - EMA_{s}
+    MACD_SIG_{f}_{s}_{g}  linia sygnału MACD (EMA_{g} z MACD_{f}_{s})
+    BB_WIDTH_{n}_{k}      szerokość wstęg Bollingera (SMA_{n} +/- k odchyleń) w % SMA
+    DI_PLUS_{n} / DI_MINUS_{n}  kierunkowe +DI / -DI Wildera
+    ADX_{n}       ADX Wildera (0-100)
+"""
+
+import re
+import weakref
+import zlib
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .kernele import rolling_max, rolling_min, sma_bank
+
+
+class GrafWskaznikow:
+    """
+    Graf wielkości pośrednich jednej ramki z pamięcią wyników.
+    """
+
+    # Zapamiętane grafy: id(ramki) -> graf (wpis usuwany, gdy ramka znika z pamięci)
+    _grafy: Dict[int, 'GrafWskaznikow'] = {}
+
+    # wzorzec nazwy -> metoda budująca węzeł (parametry z grup wzorca)
+    _WEZLY = (
+        (re.compile(r'^TR$'), '_tr'),
+        (re.compile(r'^ATR(\d+)_sma$'), '_atr_sma'),
+        (re.compile(r'^ATR(\d+)_ewm$'), '_atr_ewm'),
+        (re.compile(r'^ATR(\d+)_wilder$'), '_atr_wilder'),
+        (re.compile(r'^SMA_(\d+)$'), '_sma'),
+        (re.compile(r'^HIGH_MAX_(\d+)$'), '_high_max'),
+        (re.compile(r'^LOW_MIN_(\d+)$'), '_low_min'),
+        (re.compile(r'^DD_(\d+)$'), '_dd'),
+        (re.compile(r'^BREAKOUT_(\d+)$'), '_breakout'),
+        (re.compile(r'^VOL_SMA_(\d+)$'), '_vol_sma'),
+        (re.compile(r'^DOLLAR_VOL_(\d+)$'), '_dollar_vol'),
+        (re.compile(r'^UPDOWN_VOL_(\d+)$'), '_updown_vol'),
+        (re.compile(r'^RET_(\d+)$'), '_ret'),
+        (re.compile(r'^EMA_(\d+)$'), '_ema'),
+        (re.compile(r'^RSI_(\d+)$'), '_rsi'),
+        (re.compile(r'^MACD_(\d+)_(\d+)$'), '_macd'),
+        (re.compile(r'^MACD_SIG_(\d+)_(\d+)_(\d+)$'), '_macd_sig'),
+        (re.compile(r'^BB_WIDTH_(\d+)_(\d+)$'), '_bb_width'),
+        (re.compile(r'^DI_PLUS_(\d+)$'), '_di_plus'),
+        (re.compile(r'^DI_MINUS_(\d+)$'), '_di_minus'),
+        (re.compile(r'^ADX_(\d+)$'), '_adx'),
+    )
+
+    # Kolumny, których zmiana unieważnia zapamiętany graf
+    KOLUMNY_ODCISKU = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = weakref.ref(df)
+        self._odcisk = self._odcisk_ramki(df)
+        self._wyniki: Dict[str, pd.Series] = {}
+        self._banki: Dict[tuple, pd.DataFrame] = {}
+
+    @classmethod
+    def dla(cls, df: pd.DataFrame) -> 'GrafWskaznikow':
+        """Graf przypisany do ramki (nowy, gdy zmienił się odcisk danych ramki)."""
+        graf = cls.zapamietany(df)
+        if graf is not None:
+            return graf
+
+        klucz = id(df)
+        poprzedni = cls._grafy.get(klucz)
+        if poprzedni is None or poprzedni._df() is not df:
+            weakref.finalize(df, cls._grafy.pop, klucz, None)
+        graf = cls(df)
+        cls._grafy[klucz] = graf
+        return graf
+
+    @classmethod
+    def zapamietany(cls, df: pd.DataFrame):
+        """Aktualny graf ramki z pamięci albo None (bez tworzenia nowego wpisu)."""
+        graf = cls._grafy.get(id(df))
+        if graf is not None and graf._df() is df and graf._odcisk == cls._odcisk_ramki(df):
+            return graf
+        return None
+
+    @classmethod
+    def _odcisk_ramki(cls, df: pd.DataFrame) -> tuple:
+        # CRC32 bajtów kolumn: jeden przebieg po danych, wykrywa także zmiany w środku historii
+        if not len(df):
+            return (0,)
+        suma = 0
+        for kolumna in cls.KOLUMNY_ODCISKU:
+            if kolumna in df.columns:
+                wartosci = np.ascontiguousarray(df[kolumna].to_numpy(dtype=np.float64))
+                suma = zlib.crc32(wartosci, suma)
+        return len(df), df.index[0], df.index[-1], suma
+
+    # ── Dostęp ──────────────────────────────
+
+    def __getitem__(self, nazwa: str) -> pd.Series:
+        # Płytka kopia (copy-on-write) - zapis wywołującego nie trafia do pamięci grafu
+        return self._wezel(nazwa).copy(deep=False)
+
+    def _wezel(self, nazwa: str) -> pd.Series:
+        wynik = self._wyniki.get(nazwa)
+        if wynik is None:
+            wynik = self._zbuduj(nazwa)
+            self._wyniki[nazwa] = wynik
+        return wynik
+
+    def pobierz(self, *nazwy: str) -> Dict[str, pd.Series]:
+        return {nazwa: self[nazwa] for nazwa in nazwy}
+
+    def bank_sma(self, *okresy: int, kompensacja: bool = False) -> pd.DataFrame:
+        """
+        SMA close dla dowolnego zestawu okresów naraz (kernele.sma_bank - jedna suma skumulowana).
+
+        Returns:
+            pd.DataFrame: kolumny SMA_{n} w kolejności okresów
+        """
+        klucz = (okresy, kompensacja)
+        wynik = self._banki.get(klucz)
+        if wynik is None:
+            df = self._df()
+            if df is None:
+                raise ReferenceError("Ramka grafu wskaźników nie istnieje")
+            wynik = pd.DataFrame(sma_bank(df['close'], okresy, kompensacja), index=df.index,
+                                 columns=[f'SMA_{n}' for n in okresy])
+            self._banki[klucz] = wynik
+        return wynik.copy(deep=False)
+
+    def _zbuduj(self, nazwa: str) -> pd.Series:
+        df = self._df()
+        if df is None:
+            raise ReferenceError("Ramka grafu wskaźników nie istnieje")
+        for wzorzec, metoda in self._WEZLY:
+            dopasowanie = wzorzec.match(nazwa)
+            if dopasowanie:
+                parametry = [int(g) for g in dopasowanie.groups()]
+                return getattr(self, metoda)(df, *parametry).rename(nazwa)
+        raise KeyError(f"Nieznany węzeł grafu wskaźników: {nazwa}")
+
+    # ── Węzły ───────────────────────────────
+
+    def _tr(self, df):
+        high_low = df['high'] - df['low']
+        high_close = np.abs(df['high'] - df['close'].shift())
+        low_close = np.abs(df['low'] - df['close'].shift())
+        return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+
+    def _atr_sma(self, df, n):
+        return self._wezel('TR').rolling(window=n).mean()
+
+    def _atr_ewm(self, df, n):
+        return self._wezel('TR').ewm(span=n, adjust=False).mean()
+
+    def _atr_wilder(self, df, n):
+        return self._wilder(self._wezel('TR'), n)
+
+    def _sma(self, df, n):
+        return df['close'].rolling(window=n).mean()
+
+    def _high_max(self, df, n):
+        return pd.Series(rolling_max(df['high'], n), index=df.index)
+
+    def _low_min(self, df, n):
+        return pd.Series(rolling_min(df['low'], n), index=df.index)
+
+    def _dd(self, df, n):
+        maks = self._wezel(f'HIGH_MAX_{n}')
+        return (maks - df['close']) / maks * 100
+
+    def _breakout(self, df, n):
+        return df['close'] > self._wezel(f'HIGH_MAX_{n}').shift(1)
+
+    def _vol_sma(self, df, n):
+        return df['volume'].rolling(n).mean()
+
+    def _dollar_vol(self, df, n):
+        return (df['close'] * df['volume']).rolling(n).mean()
+
+    def _updown_vol(self, df, n):
+        # Pierwsza świeca (bez poprzedniego zamknięcia) nie jest ani wzrostowa, ani spadkowa
+        zmiana = df['close'].diff()
+        wzrosty = df['volume'].where(zmiana > 0, 0.0).rolling(n).sum()
+        spadki = df['volume'].where(zmiana < 0, 0.0).rolling(n).sum()
+        return wzrosty / spadki.where(spadki > 0)
+
+    def _ret(self, df, n):
+        return df['close'].pct_change(n)
+
+    def _ema(self, df, n):
+        return df['close'].ewm(span=n, adjust=False).mean()
+
+    @staticmethod
+    def _wilder(seria, n):
+        # Wygładzanie Wildera (RMA): EMA z alpha = 1/n, pierwsza wartość po n obserwacjach
+        return seria.ewm(alpha=1.0 / n, adjust=False, min_periods=n).mean()
+
+    def _rsi(self, df, n):
+        zmiana = df['close'].diff()
+        wzrosty = self._wilder(zmiana.clip(lower=0), n)
+        spadki = self._wilder(-zmiana.clip(upper=0), n)
+        # 100 * W / (W + S) == 100 - 100 / (1 + W / S), także dla S = 0 (RSI = 100)
+        return 100 * wzrosty / (wzrosty + spadki)
+
+    def _macd(self, df, f, s):
+        return self._wezel(f'EMA_{f}') - self._wezel(f'EMA_{s}')
+
+    def _macd_sig(self, df, f, s, g):
+        return self._wezel(f'MACD_{f}_{s}').ewm(span=g, adjust=False).mean()
+
+    def _bb_width(self, df, n, k):
+        # Wstęgi: SMA +/- k odchyleń populacyjnych -> szerokość 2k * std / SMA
+        return 2 * k * df['close'].rolling(n).std(ddof=0) / self._wezel(f'SMA_{n}') * 100
+
+    def _ruch_kierunkowy(self, df):
+        w_gore = df['high'].diff()
+        w_dol = -df['low'].diff()
+        plus = w_gore.where((w_gore > w_dol) & (w_gore > 0), 0.0)
+        minus = w_dol.where((w_dol > w_gore) & (w_dol > 0), 0.0)
+        return plus, minus
+
+    def _di_plus(self, df, n):
+        plus, _ = self._ruch_kierunkowy(df)
+        return 100 * self._wilder(plus, n) / self._wezel(f'ATR{n}_wilder')
+
+    def _di_minus(self, df, n):
+        _, minus = self._ruch_kierunkowy(df)
+        return 100 * self._wilder(minus, n) / self._wezel(f'ATR{n}_wilder')
+
+    def _adx(self, df, n):
+        plus, minus = self._wezel(f'DI_PLUS_{n}'), self._wezel(f'DI_MINUS_{n}')
+        dx = 100 * (plus - minus).abs() / (plus + minus)
+        return self._wilder(dx, n)
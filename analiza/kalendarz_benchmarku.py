@@ -0,0 +1,98 @@
+"""
+KalendarzBenchmarku - zamknięcia benchmarku przygotowane raz na skan do wyrównania RS.
+
+Zamiast df.index.intersection(benchmark.index) i wyrównania .loc po etykietach
+dla każdego tykera, kalendarz trzyma posortowane daty benchmarku (int64) i tablicę
+zamknięć. Tyker jest wyrównywany po pozycji (np.searchsorted na datach), więc
+RS_Ratio / RS_SMA50 / RS_Slope kosztują kilka operacji tablicowych na tyker.
+
+    kalendarz = KalendarzBenchmarku.dla(benchmark_df)   # zapamiętany dla ramki
+    ceny_bench = kalendarz.wyrownaj(df.index)           # NaN w dniach bez notowań
+"""
+
+import weakref
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class KalendarzBenchmarku:
+    """
+    Posortowane daty i zamknięcia jednego benchmarku.
+    """
+
+    # Zapamiętane kalendarze: id(ramki benchmarku) -> kalendarz
+    _kalendarze: Dict[int, 'KalendarzBenchmarku'] = {}
+
+    def __init__(self, benchmark_df: pd.DataFrame):
+        self._ramka = weakref.ref(benchmark_df)
+        kolumna = 'zamkniecie' if 'zamkniecie' in benchmark_df.columns else 'close'
+        close = benchmark_df[kolumna]
+        # Zduplikowane daty - pierwsza wartość (jak PanelWskaznikow)
+        close = close[~close.index.duplicated()].sort_index()
+
+        self.daty = self._daty_ns(close.index)
+        self.close = close.to_numpy(dtype=np.float64)
+        self._dlugosc = len(benchmark_df)
+        self._ostatni = benchmark_df.index[-1] if len(benchmark_df) else None
+
+    @staticmethod
+    def _daty_ns(indeks: pd.DatetimeIndex) -> np.ndarray:
+        """Daty jako int64 w nanosekundach (ramki mogą mieć różne jednostki datetime64)."""
+        return indeks.as_unit('ns').asi8
+
+    @staticmethod
+    def obslugiwany(indeks) -> bool:
+        """Wyrównanie po pozycji wymaga indeksu dat (inne indeksy - po etykietach)."""
+        return isinstance(indeks, pd.DatetimeIndex)
+
+    @classmethod
+    def dla(cls, benchmark_df: Optional[pd.DataFrame]) -> Optional['KalendarzBenchmarku']:
+        """
+        Kalendarz benchmarku (budowany raz dla danej ramki).
+
+        Returns:
+            KalendarzBenchmarku lub None, gdy benchmarku brak lub nie ma indeksu dat
+        """
+        if benchmark_df is None or benchmark_df.empty or not cls.obslugiwany(benchmark_df.index):
+            return None
+
+        klucz = id(benchmark_df)
+        kalendarz = cls._kalendarze.get(klucz)
+        if kalendarz is not None and kalendarz._ramka() is benchmark_df and kalendarz._aktualny(benchmark_df):
+            return kalendarz
+
+        if kalendarz is None or kalendarz._ramka() is not benchmark_df:
+            weakref.finalize(benchmark_df, cls._kalendarze.pop, klucz, None)
+        kalendarz = cls(benchmark_df)
+        cls._kalendarze[klucz] = kalendarz
+        return kalendarz
+
+    def _aktualny(self, benchmark_df: pd.DataFrame) -> bool:
+        return len(benchmark_df) == self._dlugosc and benchmark_df.index[-1] == self._ostatni
+
+    # ── Wyrównanie ──────────────────────────
+
+    def pozycje(self, indeks: pd.DatetimeIndex):
+        """
+        Pozycje dat tykera w kalendarzu benchmarku.
+
+        Returns:
+            (pozycje, obecne): int64 pozycje w self.close i maska dat notowanych w benchmarku
+        """
+        daty = self._daty_ns(indeks)
+        if not len(self.daty):
+            return np.zeros(len(daty), dtype=np.int64), np.zeros(len(daty), dtype=bool)
+        pozycje = np.searchsorted(self.daty, daty)
+        np.minimum(pozycje, len(self.daty) - 1, out=pozycje)
+        return pozycje, self.daty[pozycje] == daty
+
+    def wyrownaj(self, indeks: pd.DatetimeIndex) -> np.ndarray:
+        """Zamknięcia benchmarku w datach tykera (NaN, gdy benchmark nie notowany)."""
+        pozycje, obecne = self.pozycje(indeks)
+        return np.where(obecne, self.close[pozycje], np.nan)
+
+    def ma_wspolne(self, indeks: pd.DatetimeIndex) -> bool:
+        """Czy tyker ma choć jedną datę wspólną z benchmarkiem (czy RS jest liczony)."""
+        return bool(self.pozycje(indeks)[1].any())
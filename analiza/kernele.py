@@ -0,0 +1,366 @@
+"""
+Kernele - wektorowe (NumPy) odpowiedniki operacji rolling().apply(...) używanych w analizie.
+
+Każdy kernel przyjmuje tablicę float64 i zwraca tablicę tej samej długości,
+z takimi samymi wartościami NaN na rozbiegu jak odpowiadające mu rolling().apply().
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _jako_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def linear_slope(values) -> float:
+    """
+    Nachylenie regresji liniowej jednego okna, znormalizowane do średniej (% na świecę).
+
+    Odpowiednik np.polyfit(arange(n), y, 1)[0] / mean(y) * 100.
+    Zwraca 0.0 dla średniej równej 0 i dla wartości nieskończonych.
+    """
+    y = _jako_float(values)
+    n = len(y)
+    if n < 2 or not np.isfinite(y).all():
+        return 0.0
+    srednia = y.mean()
+    if srednia == 0:
+        return 0.0
+    xc = np.arange(n) - (n - 1) / 2.0
+    return float((xc @ y) / (xc @ xc) / srednia * 100)
+
+
+# Długość bloku okien, po której sumy bieżące rolling_slope startują od nowego poziomu
+# odniesienia - błąd zaokrągleń nie narasta z długością historii
+_BLOK_NACHYLENIA = 256
+
+
+def rolling_slope(values, window: int) -> np.ndarray:
+    """
+    Kroczące znormalizowane nachylenie regresji liniowej - O(n) niezależnie od okna.
+
+    Przy stałym x = 0..window-1 współczynnik kierunkowy to Σ(x - x̄)·y / Σ(x - x̄)²,
+    a Σ(x - x̄)·y okna to różnica sum bieżących Σy i Σt·y (t - pozycja w bloku).
+    Sumy liczone są blokami _BLOK_NACHYLENIA okien od wartości odniesienia bloku
+    (przecentrowanie), więc nie tracą precyzji na długich historiach. Wynik jak
+    rolling(window).apply(polyfit / mean * 100):
+      - okno z NaN                -> NaN (jak min_periods=window)
+      - okno ze średnią 0 lub inf -> 0.0
+      - pierwsze window-1 pozycji -> NaN
+
+    Args:
+        values: Seria / tablica wartości
+        window: Długość okna regresji
+
+    Returns:
+        np.ndarray: Nachylenia w % na świecę (długość jak values)
+    """
+    y = _jako_float(values)
+    n = len(y)
+    wynik = np.full(n, np.nan)
+    if window < 2 or n < window:
+        return wynik
+
+    # Blok b: okna kończące się na pozycjach b*blok + window-1 ... (widoki bez kopii)
+    m = n - window + 1
+    blok = _BLOK_NACHYLENIA
+    liczba_blokow = -(-m // blok)
+    dlugosc = blok + window - 1
+    uzupelnione = np.full(liczba_blokow * blok + window - 1, np.nan)
+    uzupelnione[:n] = y
+    segmenty = sliding_window_view(uzupelnione, dlugosc)[::blok]
+
+    # Poziom odniesienia bloku: pierwsza skończona wartość (NaN / inf poza sumami - maski niżej)
+    skonczone = np.isfinite(segmenty)
+    pierwsza = np.argmax(skonczone, axis=1)
+    poziom = np.where(skonczone.any(axis=1), segmenty[np.arange(liczba_blokow), pierwsza], 0.0)
+    odchylenia = np.where(skonczone, segmenty - poziom[:, None], 0.0)
+
+    suma_y = np.zeros((liczba_blokow, dlugosc + 1))
+    np.cumsum(odchylenia, axis=1, out=suma_y[:, 1:])
+    suma_ty = np.zeros((liczba_blokow, dlugosc + 1))
+    np.cumsum(odchylenia * np.arange(dlugosc), axis=1, out=suma_ty[:, 1:])
+
+    sy = suma_y[:, window:] - suma_y[:, :-window]
+    # Σ(x - x̄)·y = Σt·y - (początek okna + x̄)·Σy; stały poziom nie zmienia nachylenia
+    licznik = (suma_ty[:, window:] - suma_ty[:, :-window]) - (np.arange(blok) + (window - 1) / 2.0) * sy
+    xc = np.arange(window) - (window - 1) / 2.0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednia = (sy / window + poziom[:, None]).ravel()[:m]
+        znorm = licznik.ravel()[:m] / (xc @ xc) / srednia * 100
+
+    def okna_z(maska):
+        licznik_maski = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(maska, out=licznik_maski[1:])
+        return (licznik_maski[window:] - licznik_maski[:-window]) > 0
+
+    ma_nan = okna_z(np.isnan(y))
+    niepoprawne = ~ma_nan & (okna_z(np.isinf(y)) | ~np.isfinite(znorm) | (srednia == 0))
+    znorm[niepoprawne] = 0.0
+    znorm[ma_nan] = np.nan
+
+    wynik[window - 1:] = znorm
+    return wynik
+
+
+def percentile_rank(values, current_value: float) -> float:
+    """
+    Percentyl (0-100) wartości względem serii: ile % wartości jest <= current_value.
+
+    NaN w values liczą się do mianownika, ale nigdy nie są <= current_value
+    (jak porównanie pandas). Pusta seria -> NaN (wartość domyślną wybiera wywołujący).
+    """
+    v = _jako_float(values)
+    if len(v) == 0:
+        return np.nan
+    return float(np.count_nonzero(v <= current_value) / len(v) * 100)
+
+
+def rolling_percentile_rank(values, window: int, blok: int = None) -> np.ndarray:
+    """
+    Kroczący percentyl ostatniej wartości okna (0-100) - odpowiednik
+    rolling(window).apply(lambda x: (x <= x[-1]).sum() / len(x) * 100).
+
+    Porównanie idzie blokami wierszy na widoku okien (bez kopii danych),
+    więc pamięć pomocnicza to blok x window wartości logicznych.
+      - okno z NaN                -> NaN (jak min_periods=window)
+      - pierwsze window-1 pozycji -> NaN
+
+    Args:
+        values: Seria / tablica wartości
+        window: Długość okna
+        blok: Liczba okien porównywanych naraz (domyślnie ~1M porównań na blok)
+
+    Returns:
+        np.ndarray: Percentyle (długość jak values)
+    """
+    y = _jako_float(values)
+    n = len(y)
+    wynik = np.full(n, np.nan)
+    if window < 1 or n < window:
+        return wynik
+
+    okna = sliding_window_view(y, window)
+    liczba_okien = len(okna)
+    if blok is None:
+        blok = max(1, (1 << 20) // window)
+
+    rangi = np.empty(liczba_okien)
+    for start in range(0, liczba_okien, blok):
+        czesc = okna[start:start + blok]
+        rangi[start:start + blok] = np.count_nonzero(czesc <= czesc[:, -1:], axis=1)
+    rangi = rangi / window * 100
+
+    # Okna zawierające NaN (licznik NaN z sum skumulowanych)
+    nan_cum = np.concatenate(([0], np.cumsum(np.isnan(y))))
+    ma_nan = (nan_cum[window:] - nan_cum[:-window]) > 0
+    rangi[ma_nan] = np.nan
+
+    wynik[window - 1:] = rangi
+    return wynik
+
+
+def _rolling_ekstremum(arr, window: int, ufunc, neutralny: float, skipna: bool) -> np.ndarray:
+    """
+    Kroczące maksimum / minimum algorytmem van Herka / Gil-Wermana, O(n) niezależnie od okna.
+
+    Seria dzielona jest na bloki długości window; w każdym bloku liczone są
+    ekstrema prefiksowe (g) i sufiksowe (h). Okno [j, i] obejmuje koniec jednego
+    bloku i początek następnego, więc jego ekstremum to ufunc(h[j], g[i]).
+    Działa wzdłuż osi 0 (1D lub daty x tykery).
+    """
+    a = _jako_float(arr)
+    n = a.shape[0]
+    wynik = np.full(a.shape, np.nan)
+    if window < 1 or n < window:
+        return wynik
+
+    nan = np.isnan(a)
+    z = np.where(nan, neutralny, a)
+    blokow = -(-n // window)
+    dopelnienie = np.full((blokow * window - n,) + a.shape[1:], neutralny)
+    bloki = np.concatenate([z, dopelnienie]).reshape((blokow, window) + a.shape[1:])
+
+    g = ufunc.accumulate(bloki, axis=1).reshape((blokow * window,) + a.shape[1:])
+    h = ufunc.accumulate(bloki[:, ::-1], axis=1)[:, ::-1].reshape((blokow * window,) + a.shape[1:])
+    ekstrema = ufunc(h[:n - window + 1], g[window - 1:n])
+
+    # NaN: jak rolling(window).max() (okno z NaN) lub min_periods=1 przy skipna
+    nan_cum = np.zeros((n + 1,) + a.shape[1:], dtype=np.int64)
+    np.cumsum(nan, axis=0, out=nan_cum[1:])
+    liczba_nan = nan_cum[window:] - nan_cum[:-window]
+    ekstrema[liczba_nan == window if skipna else liczba_nan > 0] = np.nan
+
+    wynik[window - 1:] = ekstrema
+    return wynik
+
+
+def rolling_max(values, window: int, skipna: bool = False) -> np.ndarray:
+    """
+    Kroczące maksimum (1D lub 2D wzdłuż osi 0) - odpowiednik rolling(window).max().
+
+      - okno z NaN                -> NaN (skipna=True: maksimum z pominięciem NaN,
+                                     NaN tylko gdy całe okno to NaN)
+      - pierwsze window-1 pozycji -> NaN
+    """
+    return _rolling_ekstremum(values, window, np.maximum, -np.inf, skipna)
+
+
+def rolling_min(values, window: int, skipna: bool = False) -> np.ndarray:
+    """Kroczące minimum - jak rolling_max."""
+    return _rolling_ekstremum(values, window, np.minimum, np.inf, skipna)
+
+
+def last_max(values, window: int, skipna: bool = False) -> float:
+    """
+    Ostatnia wartość rolling_max(values, window) - tylko ostatnie window elementów.
+    """
+    return _ostatnie_ekstremum(values, window, np.max, np.nanmax, skipna)
+
+
+def last_min(values, window: int, skipna: bool = False) -> float:
+    """Ostatnia wartość rolling_min(values, window)."""
+    return _ostatnie_ekstremum(values, window, np.min, np.nanmin, skipna)
+
+
+def _ostatnie_ekstremum(values, window: int, funkcja, funkcja_nan, skipna: bool) -> float:
+    y = _jako_float(values)
+    if window < 1 or len(y) < window:
+        return np.nan
+    okno = y[-window:]
+    if not skipna:
+        return float(funkcja(okno))  # NaN w oknie propaguje się
+    if np.isnan(okno).all():
+        return np.nan
+    return float(funkcja_nan(okno))
+
+
+def _cumsum_kompensowana(y: np.ndarray) -> np.ndarray:
+    """Suma skumulowana z kompensacją błędu zaokrągleń (Kahan-Babuška / Neumaier)."""
+    wynik = np.empty(len(y))
+    suma = 0.0
+    korekta = 0.0
+    for i, v in enumerate(y.tolist()):
+        t = suma + v
+        if abs(suma) >= abs(v):
+            korekta += (suma - t) + v
+        else:
+            korekta += (v - t) + suma
+        suma = t
+        wynik[i] = suma + korekta
+    return wynik
+
+
+def sma_bank(values, okresy, kompensacja: bool = False) -> np.ndarray:
+    """
+    Średnie kroczące dla dowolnego zestawu okresów z jednej sumy skumulowanej.
+
+    Kolumna j to rolling(okresy[j]).mean() (okno z NaN -> NaN, pierwsze okres-1
+    pozycji -> NaN). Suma liczona jest od poziomu odniesienia (pierwsza wartość),
+    a kompensacja=True dodatkowo kompensuje błąd zaokrągleń (wolniejsza pętla,
+    dla bardzo długich historii).
+
+    Args:
+        values: Seria / tablica (np. close)
+        okresy: Lista długości okien
+        kompensacja: Suma skumulowana z kompensacją (Neumaier)
+
+    Returns:
+        np.ndarray: (len(values), len(okresy))
+    """
+    y = _jako_float(values)
+    okresy = [int(o) for o in okresy]
+    n = len(y)
+    wynik = np.full((n, len(okresy)), np.nan)
+    if n == 0:
+        return wynik
+
+    nan = np.isnan(y)
+    poziom = y[~nan][0] if (~nan).any() else 0.0
+    odchylenia = np.where(nan, 0.0, y - poziom)
+
+    cum = np.zeros(n + 1)
+    if kompensacja:
+        cum[1:] = _cumsum_kompensowana(odchylenia)
+    else:
+        np.cumsum(odchylenia, out=cum[1:])
+    nan_cum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(nan, out=nan_cum[1:])
+
+    for j, okres in enumerate(okresy):
+        if okres < 1 or okres > n:
+            continue
+        srednie = (cum[okres:] - cum[:-okres]) / okres + poziom
+        srednie[(nan_cum[okres:] - nan_cum[:-okres]) > 0] = np.nan
+        wynik[okres - 1:, j] = srednie
+    return wynik
+
+
+# ─────────────────────────────────────────────
+#   Kernele 2D (daty x tykery) - okno wzdłuż osi 0
+# ─────────────────────────────────────────────
+
+def _okna_z_nan(arr: np.ndarray, window: int) -> np.ndarray:
+    """Maska (n - window + 1, k): czy okno kończące się w wierszu zawiera NaN."""
+    nan_cum = np.zeros((arr.shape[0] + 1,) + arr.shape[1:], dtype=np.int64)
+    np.cumsum(np.isnan(arr), axis=0, out=nan_cum[1:])
+    return (nan_cum[window:] - nan_cum[:-window]) > 0
+
+
+def rolling_mean_2d(arr, window: int) -> np.ndarray:
+    """
+    Średnia krocząca każdej kolumny (jak rolling(window).mean() per kolumna).
+
+    Sumy skumulowane liczone od poziomu odniesienia kolumny (pierwsza wartość),
+    żeby długie historie nie traciły precyzji. Okno z NaN -> NaN.
+    """
+    a = _jako_float(arr)
+    n = a.shape[0]
+    wynik = np.full(a.shape, np.nan)
+    if window < 1 or n < window:
+        return wynik
+
+    poziom = np.nan_to_num(a[np.argmax(~np.isnan(a), axis=0), np.arange(a.shape[1])])
+    odchylenia = np.nan_to_num(a - poziom)
+    cum = np.zeros((n + 1, a.shape[1]))
+    np.cumsum(odchylenia, axis=0, out=cum[1:])
+
+    srednie = (cum[window:] - cum[:-window]) / window + poziom
+    srednie[_okna_z_nan(a, window)] = np.nan
+    wynik[window - 1:] = srednie
+    return wynik
+
+
+def rolling_slope_2d(arr, window: int) -> np.ndarray:
+    """
+    rolling_slope dla każdej kolumny naraz - ta sama semantyka NaN / 0.0.
+
+    Σ(x - x̄)·y liczone jako window przesuniętych iloczynów całych macierzy
+    (okno regresji jest krótkie, więc to kilkanaście operacji na tablicy).
+    """
+    a = _jako_float(arr)
+    n = a.shape[0]
+    wynik = np.full(a.shape, np.nan)
+    if window < 2 or n < window:
+        return wynik
+
+    m = n - window + 1
+    xc = np.arange(window) - (window - 1) / 2.0
+    licznik = np.zeros((m, a.shape[1]))
+    suma = np.zeros((m, a.shape[1]))
+    for k in range(window):
+        czesc = a[k:k + m]
+        licznik += xc[k] * czesc
+        suma += czesc
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednia = suma / window
+        znorm = licznik / (xc @ xc) / srednia * 100
+
+    ma_nan = _okna_z_nan(a, window)
+    znorm[~ma_nan & (~np.isfinite(znorm) | (srednia == 0))] = 0.0
+    znorm[ma_nan] = np.nan
+    wynik[window - 1:] = znorm
+    return wynik
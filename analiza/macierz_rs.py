@@ -0,0 +1,82 @@
+"""
+MacierzRS - siła względna (RS) tykerów wobec wielu benchmarków w jednym przebiegu.
+
+Dla każdego benchmarku z listy (Konfiguracja.BENCHMARKI_RS, np. SPY / QQQ / IWM /
+ETF-y sektorowe) budowany jest raz KalendarzBenchmarku, a każdy tyker jest do niego
+wyrównywany po pozycji. Wynik to macierz tykery x benchmarki dla ostatniej świecy:
+
+    macierz = MacierzRS.oblicz(dane_tykerow, {'SPY': df_spy, 'QQQ': df_qqq})
+    macierz[('RS_Slope', 'QQQ')]               # kolumna dla jednego benchmarku
+    MacierzRS.dla_benchmarku(macierz, 'QQQ')   # RS_Ratio / RS_SMA50 / RS_Slope
+
+Wartości są takie jak ostatni wiersz SilnikWskaznikow.oblicz_wskazniki(df, benchmark)
+(RS liczony, gdy tyker ma choć jedną datę wspólną z benchmarkiem; inaczej 1.0 / 1.0 / 0.0).
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from konfiguracja import Konfiguracja
+from .kalendarz_benchmarku import KalendarzBenchmarku
+from .kernele import rolling_slope
+from .wskazniki import SilnikWskaznikow
+
+
+class MacierzRS:
+    """
+    Macierz RS tykery x benchmarki.
+    """
+
+    KOLUMNY = ('RS_Ratio', 'RS_SMA50', 'RS_Slope')
+    DOMYSLNE = (1.0, 1.0, 0.0)
+
+    @staticmethod
+    def oblicz(dane_tykerow: Dict[str, pd.DataFrame],
+               benchmarki: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        RS ostatniej świecy każdego tykera wobec każdego benchmarku.
+
+        Args:
+            dane_tykerow: Dict {symbol: DataFrame OHLCV z indeksem DateTime}
+            benchmarki: Dict {symbol benchmarku: DataFrame benchmarku}
+
+        Returns:
+            pd.DataFrame: indeks - tykery, kolumny - MultiIndex (kolumna RS, benchmark)
+        """
+        okres = Konfiguracja.OKRES_NACHYLENIA
+        dl_ogona = max(50, okres)
+        kalendarze = {b: KalendarzBenchmarku.dla(df) for b, df in benchmarki.items()}
+
+        wyniki = np.empty((len(dane_tykerow), len(MacierzRS.KOLUMNY), len(kalendarze)))
+        wyniki[:] = np.array(MacierzRS.DOMYSLNE)[:, None]
+
+        for i, df in enumerate(dane_tykerow.values()):
+            if df.empty or not KalendarzBenchmarku.obslugiwany(df.index):
+                continue
+            df = SilnikWskaznikow.normalizuj_kolumny(df)
+            indeks_ogona = df.index[-dl_ogona:]
+            close = df['close'].to_numpy(dtype=np.float64)[-dl_ogona:]
+
+            for j, kalendarz in enumerate(kalendarze.values()):
+                if kalendarz is None:
+                    continue
+                pozycje, wspolne = kalendarz.pozycje(indeks_ogona)
+                if not (wspolne.any() or kalendarz.ma_wspolne(df.index)):
+                    continue
+
+                rs = np.ones(len(close))
+                rs[wspolne] = close[wspolne] / kalendarz.close[pozycje[wspolne]]
+                wyniki[i, 0, j] = rs[-1]
+                wyniki[i, 1, j] = rs[-50:].mean() if len(rs) >= 50 else np.nan
+                wyniki[i, 2, j] = rolling_slope(rs[-okres:], okres)[-1] if len(rs) >= okres else np.nan
+
+        kolumny = pd.MultiIndex.from_product([MacierzRS.KOLUMNY, list(kalendarze)], names=['kolumna', 'benchmark'])
+        return pd.DataFrame(wyniki.reshape(len(dane_tykerow), -1), index=pd.Index(list(dane_tykerow), name='Tyker'),
+                            columns=kolumny)
+
+    @staticmethod
+    def dla_benchmarku(macierz: pd.DataFrame, benchmark: str) -> pd.DataFrame:
+        """Kolumny RS_Ratio / RS_SMA50 / RS_Slope jednego benchmarku (indeks - tykery)."""
+        return macierz.xs(benchmark, axis=1, level='benchmark')[list(MacierzRS.KOLUMNY)]
@@ -0,0 +1,220 @@
+"""
+PanelWskaznikow - wskaźniki SilnikWskaznikow dla całego uniwersum naraz.
+
+Tykery są układane jako gęste tablice NumPy (daty x tykery) na wspólnym kalendarzu
+dat (suma dat tykerów), z NaN poza historią tykera - wiersz panelu to ta sama data
+dla wszystkich kolumn. Benchmark jest wyrównywany do kalendarza raz (KalendarzBenchmarku),
+a SMA, ATR, momentum, RS i nachylenia liczone są jedną operacją tablicową.
+
+Wynik jest kolumna w kolumnę taki jak SilnikWskaznikow.oblicz_wskazniki, bo okna
+kroczące liczą się po świecach tykera: w panelu zostają tylko tykery notowane w każdej
+dacie kalendarza od pierwszej do ostatniej swojej świecy. Tykery z lukami / zawieszeniem
+notowań, ramki puste lub z nieposortowanymi / zduplikowanymi datami liczone są osobno.
+Data notowana tylko przez mniejszość tykerów, których historia ją obejmuje (np. świeca
+w sobotę u jednego tykera), nie wchodzi do kalendarza - osobno liczony jest wtedy tylko ten tyker.
+
+Ramki wejściowe nie są modyfikowane - zwracane są nowe ramki (OHLCV + wskaźniki).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from konfiguracja import Konfiguracja
+from .kalendarz_benchmarku import KalendarzBenchmarku
+from .kernele import rolling_mean_2d, rolling_slope_2d
+from .typy_kompaktowe import TypyKompaktowe
+from .wskazniki import SilnikWskaznikow
+
+
+class PanelWskaznikow:
+    """
+    Panelowy (przekrojowy) silnik wskaźników.
+    """
+
+    # Kolejność jak w oblicz_wskazniki
+    KOLUMNY = SilnikWskaznikow.KOLUMNY_WSKAZNIKOW
+
+    @staticmethod
+    def podziel(dane_tykerow: Dict[str, pd.DataFrame]):
+        """
+        Rozdziel tykery na panelowe i liczone osobno.
+
+        Returns:
+            (kalendarz, {tyker: (wiersz_startowy, df)}, [tykery_osobno])
+        """
+        kandydaci = {}
+        osobno = []
+        for tyker, df in dane_tykerow.items():
+            if (not df.empty and isinstance(df.index, pd.DatetimeIndex)
+                    and df.index.is_monotonic_increasing and df.index.is_unique):
+                kandydaci[tyker] = df.index.as_unit('ns').asi8
+            else:
+                osobno.append(tyker)
+        if not kandydaci:
+            return pd.DatetimeIndex([]), {}, osobno
+
+        # Kalendarz: daty notowane przez większość tykerów, których historia je obejmuje
+        wszystkie = np.unique(np.concatenate(list(kandydaci.values())))
+        notowane = np.zeros(len(wszystkie), dtype=np.int64)
+        w_zakresie = np.zeros(len(wszystkie) + 1, dtype=np.int64)
+        for daty in kandydaci.values():
+            pozycje = np.searchsorted(wszystkie, daty)
+            notowane[pozycje] += 1
+            w_zakresie[pozycje[0]] += 1
+            w_zakresie[pozycje[-1] + 1] -= 1
+        kalendarz = wszystkie[2 * notowane > np.cumsum(w_zakresie[:-1])]
+
+        # W panelu tylko tykery bez luk względem kalendarza (okna po świecach = okna po wierszach)
+        panel = {}
+        for tyker, daty in kandydaci.items():
+            start = int(np.searchsorted(kalendarz, daty[0]))
+            koniec = start + len(daty)
+            if koniec <= len(kalendarz) and np.array_equal(kalendarz[start:koniec], daty):
+                panel[tyker] = (start, dane_tykerow[tyker])
+            else:
+                osobno.append(tyker)
+
+        # Kolejność osobno jak na wejściu
+        kolejnosc = {t: i for i, t in enumerate(dane_tykerow)}
+        osobno.sort(key=kolejnosc.get)
+        return pd.DatetimeIndex(kalendarz.view('datetime64[ns]')), panel, osobno
+
+    @staticmethod
+    def oblicz(dane_tykerow: Dict[str, pd.DataFrame],
+               benchmark_df: Optional[pd.DataFrame] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Odpowiednik {tyker: oblicz_wskazniki(df, benchmark_df)} dla całego słownika.
+
+        Args:
+            dane_tykerow: Dict {symbol: DataFrame OHLCV z indeksem DateTime}
+            benchmark_df: DataFrame benchmarku (opcjonalnie)
+
+        Returns:
+            Dict {symbol: nowy DataFrame z kolumnami wskaźników} - ramki wejściowe bez zmian
+        """
+        dane = {t: SilnikWskaznikow.normalizuj_kolumny(df) for t, df in dane_tykerow.items()}
+        kalendarz, panel, osobno = PanelWskaznikow.podziel(dane)
+
+        wyniki = {}
+        if panel:
+            wyniki.update(PanelWskaznikow._oblicz_panel(kalendarz, panel, benchmark_df))
+        for tyker in osobno:
+            # Płytka kopia - kolumny wskaźników nie trafiają do ramki wywołującego
+            wyniki[tyker] = SilnikWskaznikow.oblicz_wskazniki(dane[tyker].copy(deep=False), benchmark_df)
+            if TypyKompaktowe.wlaczony():
+                TypyKompaktowe.kompaktuj_wskazniki(wyniki[tyker])
+
+        # Kolejność jak na wejściu
+        return {t: wyniki[t] for t in dane_tykerow}
+
+    @staticmethod
+    def _oblicz_panel(kalendarz: pd.DatetimeIndex, panel: dict,
+                      benchmark_df: Optional[pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        n, k = len(kalendarz), len(panel)
+        tykery = list(panel)
+
+        def macierz(nazwa):
+            m = np.full((n, k), np.nan)
+            for j, tyker in enumerate(tykery):
+                start, df = panel[tyker]
+                if nazwa in df.columns:
+                    m[start:start + len(df), j] = df[nazwa].to_numpy(dtype=np.float64)
+            return m
+
+        close, high, low, volume = (macierz(nazwa) for nazwa in ('close', 'high', 'low', 'volume'))
+        starty = np.array([panel[t][0] for t in tykery])
+        konce = starty + np.array([len(panel[t][1]) for t in tykery])
+        wiersze = np.arange(n)[:, None]
+        w_historii = (wiersze >= starty) & (wiersze < konce)
+
+        # Zamknięcia benchmarku w datach kalendarza - jedno wyrównanie dla wszystkich tykerów
+        bench_close = None
+        if benchmark_df is not None and not benchmark_df.empty:
+            kalendarz_bench = KalendarzBenchmarku.dla(benchmark_df)
+            if kalendarz_bench is not None:
+                bench = kalendarz_bench.wyrownaj(kalendarz)
+            else:
+                bench = SilnikWskaznikow.normalizuj_kolumny(benchmark_df)['close']
+                bench = bench[~bench.index.duplicated()]
+                bench = bench.reindex(kalendarz).to_numpy(dtype=np.float64)
+            bench_close = np.where(w_historii, bench[:, None], np.nan)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            wyniki = PanelWskaznikow._wskazniki(close, high, low, volume, w_historii, bench_close)
+
+        # Nowe ramki tykerów: płytka kopia OHLCV (copy-on-write) + kolumny wskaźników z panelu
+        typ = np.float32 if TypyKompaktowe.wlaczony() else np.float64
+        out = {}
+        for j, tyker in enumerate(tykery):
+            start, df = panel[tyker]
+            wynik = df.copy(deep=False)
+            for kolumna in PanelWskaznikow.KOLUMNY:
+                wynik[kolumna] = wyniki[kolumna][start:start + len(df), j].astype(typ)
+            out[tyker] = wynik
+        return out
+
+    @staticmethod
+    def _wskazniki(close, high, low, volume, w_historii, bench_close) -> dict:
+        okres = Konfiguracja.OKRES_NACHYLENIA
+        w = {}
+
+        w['SMA50'] = rolling_mean_2d(close, Konfiguracja.SMA_SZYBKA)
+        w['SMA200'] = rolling_mean_2d(close, Konfiguracja.SMA_WOLNA)
+        w['Dist_SMA50'] = (close - w['SMA50']) / w['SMA50'] * 100
+        w['Dist_SMA200'] = (close - w['SMA200']) / w['SMA200'] * 100
+
+        # Nachylenia tylko dla tykerów z dostatecznie długą historią (inaczej 0.0 w całej kolumnie)
+        dlugie = w_historii.sum(axis=0) > okres + Konfiguracja.SMA_WOLNA
+        for zrodlo, cel in (('SMA50', 'SMA50_Slope'), ('SMA200', 'SMA200_Slope')):
+            nachylenie = rolling_slope_2d(w[zrodlo], okres)
+            nachylenie[:, ~dlugie] = 0.0
+            w[cel] = nachylenie
+
+        # ATR: True Range z pominięciem NaN (pierwsza świeca tykera -> high - low)
+        poprz = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+        tr = np.fmax(np.fmax(high - low, np.abs(high - poprz)), np.abs(low - poprz))
+        w['ATR14'] = rolling_mean_2d(tr, Konfiguracja.OKRES_ATR)
+        w['ATR_Pct'] = w['ATR14'] / close * 100
+
+        def momentum(p):
+            m = np.full_like(close, np.nan)
+            m[p:] = close[p:] / close[:-p] - 1
+            return m
+
+        w['Mom3M'] = momentum(Konfiguracja.MOMENTUM_KROTKIE)
+        w['Mom6M'] = momentum(Konfiguracja.MOMENTUM_DLUGIE)
+
+        # RS - domyślnie neutralne, nadpisywane dla tykerów mających wspólne daty z benchmarkiem
+        w['RS_Ratio'] = np.ones_like(close)
+        w['RS_SMA50'] = np.ones_like(close)
+        w['RS_Slope'] = np.zeros_like(close)
+
+        if bench_close is not None:
+            wspolne = w_historii & ~np.isnan(bench_close)
+            aktywne = wspolne.any(axis=0)
+            if aktywne.any():
+                rs = np.where(wspolne, close / bench_close, 1.0)
+                rs[~w_historii] = np.nan
+                rs_sma = rolling_mean_2d(rs, 50)
+                rs_slope = rolling_slope_2d(rs, okres)
+                w['RS_Ratio'][:, aktywne] = rs[:, aktywne]
+                w['RS_SMA50'][:, aktywne] = rs_sma[:, aktywne]
+                w['RS_Slope'][:, aktywne] = rs_slope[:, aktywne]
+
+        # Wolumen - okna poza historią tykera (NaN) dają NaN, jak rolling() na ramce tykera
+        krotki, dlugi = Konfiguracja.OKRES_WOLUMENU, Konfiguracja.OKRES_WOLUMENU_DLUGI
+        w['Vol_SMA20'] = rolling_mean_2d(volume, krotki)
+        w['Vol_SMA50'] = rolling_mean_2d(volume, dlugi)
+        w['RVol'] = volume / w['Vol_SMA20']
+        zmiana = close - poprz
+        wzrosty = np.where(zmiana > 0, volume, 0.0)
+        spadki = np.where(zmiana < 0, volume, 0.0)
+        wzrosty[~w_historii] = np.nan
+        spadki[~w_historii] = np.nan
+        srednia_spadkow = rolling_mean_2d(spadki, dlugi)
+        w['UpDown_Vol'] = rolling_mean_2d(wzrosty, dlugi) / np.where(srednia_spadkow > 0, srednia_spadkow, np.nan)
+        w['DollarVol20'] = rolling_mean_2d(close * volume, krotki)
+
+        return w
@@ -0,0 +1,94 @@
+"""
+PomiarPamieci - szczytowe zużycie pamięci potoku wskaźników na tyker.
+
+Mierzy tracemalloc-iem ile pamięci alokuje obliczenie wskaźników jednego tykera
+(domyślnie ścieżka bez mutacji: SilnikWskaznikow.oblicz_kolumny / CacheWskaznikow
+z w_miejscu=False), w porównaniu z rozmiarem ramki OHLCV i ramki wyników:
+
+    raport = PomiarPamieci.na_tyker(dane_tykerow, benchmark_df)
+    print(raport.sort_values('Szczyt_KB', ascending=False).head())
+"""
+
+import tracemalloc
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+
+from .wskazniki import SilnikWskaznikow
+
+
+class PomiarPamieci:
+    """
+    Pomiar szczytowej alokacji (tracemalloc) dla potoku wskaźników.
+    """
+
+    @staticmethod
+    def szczyt(funkcja: Callable, *args, **kwargs) -> Tuple[object, int]:
+        """
+        Wywołaj funkcję i zmierz szczyt pamięci zaalokowanej w trakcie wywołania.
+
+        Returns:
+            Tuple: (wynik funkcji, szczyt w bajtach ponad stan sprzed wywołania)
+        """
+        juz_sledzone = tracemalloc.is_tracing()
+        if juz_sledzone:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        try:
+            przed = tracemalloc.get_traced_memory()[0]
+            wynik = funkcja(*args, **kwargs)
+            szczyt = tracemalloc.get_traced_memory()[1]
+        finally:
+            if not juz_sledzone:
+                tracemalloc.stop()
+        return wynik, max(szczyt - przed, 0)
+
+    @staticmethod
+    def na_tyker(dane_tykerow: Dict[str, pd.DataFrame], benchmark_df: pd.DataFrame = None,
+                 cache=None, w_miejscu: bool = False) -> pd.DataFrame:
+        """
+        Szczytowe zużycie pamięci obliczenia wskaźników dla każdego tykera.
+
+        Args:
+            dane_tykerow: Dict {symbol: DataFrame OHLCV}
+            benchmark_df: DataFrame benchmarku (opcjonalnie)
+            cache: CacheWskaznikow (opcjonalnie) - mierzona ścieżka z cache
+            w_miejscu: True = mierzona ścieżka dopisująca kolumny do df (na płytkiej kopii,
+                ramki z dane_tykerow zostają bez zmian)
+
+        Returns:
+            DataFrame: Tyker, Swiece, Wejscie_KB, Wynik_KB, Szczyt_KB
+        """
+        wiersze = []
+        for tyker, df in dane_tykerow.items():
+            if df is None or df.empty:
+                continue
+
+            wejscie = df.memory_usage(deep=False).sum()
+            if cache is not None:
+                ramka = df.copy(deep=False) if w_miejscu else df
+                wynik, szczyt = PomiarPamieci.szczyt(cache.oblicz, tyker, ramka, benchmark_df,
+                                                     w_miejscu=w_miejscu)
+            elif w_miejscu:
+                wynik, szczyt = PomiarPamieci.szczyt(SilnikWskaznikow.oblicz_wskazniki,
+                                                     df.copy(deep=False), benchmark_df)
+            else:
+                wynik, szczyt = PomiarPamieci.szczyt(SilnikWskaznikow.oblicz_kolumny, df, benchmark_df)
+
+            # Przy w_miejscu wynik zawiera też kolumny OHLCV - liczone są tylko wskaźniki
+            kolumny = [k for k in SilnikWskaznikow.KOLUMNY_WSKAZNIKOW if k in wynik.columns]
+            wiersze.append({
+                'Tyker': tyker,
+                'Swiece': len(df),
+                'Wejscie_KB': wejscie / 1024,
+                'Wynik_KB': wynik[kolumny].memory_usage(index=False).sum() / 1024,
+                'Szczyt_KB': szczyt / 1024,
+            })
+
+        raport = pd.DataFrame(wiersze, columns=['Tyker', 'Swiece', 'Wejscie_KB', 'Wynik_KB', 'Szczyt_KB'])
+        if not raport.empty:
+            print(f"Pomiar pamięci: {len(raport)} tykerów, szczyt średnio "
+                  f"{raport['Szczyt_KB'].mean():.1f} KB, maks. {raport['Szczyt_KB'].max():.1f} KB "
+                  f"({raport.loc[raport['Szczyt_KB'].idxmax(), 'Tyker']})")
+        return raport
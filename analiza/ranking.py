@@ -4,6 +4,11 @@ from .wskazniki import SilnikWskaznikow
 from .status import SilnikStatusu
 from .slope import SlopeMetrics
 from .volatility import VolatilityMetrics
+from .kernele import percentile_rank
+from .macierz_rs import MacierzRS
+from .rejestr_wskaznikow import RejestrWskaznikow
+from .typy_kompaktowe import TypyKompaktowe
+from .widoki_interwalow import WidokiInterwalow
 from konfiguracja import Konfiguracja
 
 
@@ -60,8 +65,21 @@ class RankingEngine:
         if df.empty or len(df) < 50:
             return result
 
+        return RankingEngine.checklist_z_wiersza(ticker, df.iloc[-1])
+
+    @staticmethod
+    def checklist_z_wiersza(ticker: str, last_row: pd.Series) -> dict:
+        """
+        ChecklistScore z samego ostatniego wiersza wskaźników
+        (np. z SilnikWskaznikow.oblicz_ostatnie) - warunki jak w calculate_checklist_score.
+        """
+        result = {
+            'checklist_score': 0,
+            'tier': 'D',
+            'checklist_details': {}
+        }
+
         try:
-            last_row = df.iloc[-1]
             close = last_row.get('close', 0)
             sma200 = last_row.get('SMA200', close)
             sma50 = last_row.get('SMA50', close)
@@ -160,6 +178,72 @@ class RankingEngine:
 
         return result
 
+    # Klucze checklist_details w kolejności warunków
+    WARUNKI_CHECKLISTY = (
+        '1_close_above_sma200',
+        '2_sma200_slope_rising',
+        '3_close_above_sma50',
+        '4_sma50_slope_rising',
+        '5_rs_slope_positive',
+        '6_rs_ratio_strong',
+        '7_momentum_6m_positive',
+        '8_momentum_3m_positive',
+        '9_distance_within_range',
+        '10_atr_below_threshold',
+    )
+
+    # Tier dla wyniku 0-10 (A: 8-10, B: 6-7, C: 4-5, D: 0-3)
+    _TIERY = np.array(['D', 'D', 'D', 'D', 'C', 'C', 'B', 'B', 'A', 'A', 'A'], dtype=object)
+
+    @staticmethod
+    def checklist_wsadowo(metryki: pd.DataFrame) -> pd.DataFrame:
+        """
+        checklist_z_wiersza dla całego uniwersum naraz - te same warunki, bez pętli po tykerach.
+
+        Args:
+            metryki: DataFrame (tykery x metryki) - ostatnie wartości wskaźników,
+                kolumny jak w wierszu oblicz_wskazniki (close, SMA200, SMA50, ...)
+
+        Returns:
+            pd.DataFrame: indeks metryki, kolumny checklist_score (0-10), tier (A-D)
+                i warunki WARUNKI_CHECKLISTY (bool)
+        """
+        kolumna = SilnikStatusu.kolumna_metryki
+        close = kolumna(metryki, 'close', 0)
+        sma200 = kolumna(metryki, 'SMA200', close)
+        sma50 = kolumna(metryki, 'SMA50', close)
+        sma200_slope = kolumna(metryki, 'SMA200_Slope', 0)
+        sma50_slope = kolumna(metryki, 'SMA50_Slope', 0)
+        rs_slope = kolumna(metryki, 'RS_Slope', 0)
+        rs_ratio = kolumna(metryki, 'RS_Ratio', 1.0)
+        rs_sma50 = kolumna(metryki, 'RS_SMA50', 0)
+        mom3m = kolumna(metryki, 'Mom3M', 0)
+        mom6m = kolumna(metryki, 'Mom6M', 0)
+        atr_pct = kolumna(metryki, 'ATR_Pct', 0)
+        dist_sma200 = kolumna(metryki, 'Dist_SMA200', 0)
+
+        dist_min = getattr(Konfiguracja, 'DISTANCE_MIN_PCT', -20.0)
+        dist_max = getattr(Konfiguracja, 'DISTANCE_MAX_PCT', 20.0)
+        atr_max = getattr(Konfiguracja, 'ATR_MAX_PCT', 4.0)
+
+        warunki = (
+            close > sma200,
+            sma200_slope > Konfiguracja.SLOPE_RISING_THRESHOLD,
+            close > sma50,
+            sma50_slope > Konfiguracja.SLOPE_RISING_THRESHOLD,
+            rs_slope > 0,
+            np.where(rs_sma50 > 0, rs_ratio > rs_sma50, rs_ratio > 1.0),
+            mom6m > 0,
+            mom3m > 0,
+            (dist_min <= dist_sma200) & (dist_sma200 <= dist_max),
+            atr_pct < atr_max,
+        )
+        score = np.sum(warunki, axis=0, dtype=np.int64)
+
+        wynik = {'checklist_score': score, 'tier': RankingEngine._TIERY[score]}
+        wynik.update(zip(RankingEngine.WARUNKI_CHECKLISTY, warunki))
+        return pd.DataFrame(wynik, index=metryki.index)
+
     @staticmethod
     def calculate_percentile_rank(values: pd.Series, current_value: float) -> float:
         """
@@ -177,7 +261,7 @@ class RankingEngine:
 
         try:
             # Percentyl: ile % wartości jest <= current_value
-            percentile = (values <= current_value).sum() / len(values) * 100
+            percentile = percentile_rank(values, current_value)
             return max(0.0, min(100.0, percentile))  # Clamp do 0-100
         except Exception:
             return 50.0
@@ -228,9 +312,8 @@ class RankingEngine:
         try:
             # Weź ostatni wiersz danych tykera
             last_row = df.iloc[-1]
-            close = last_row['close']
-            sma200 = last_row.get('SMA200', close)
-            sma50 = last_row.get('SMA50', close)
+            # Brak close -> wynik domyślny (KeyError przed percentylami)
+            last_row['close']
 
             # === 1. RS PERCENTILE (30%) ===
             rs_percentile = 50.0
@@ -296,84 +379,222 @@ class RankingEngine:
                 slope_score = 75.0 if sma200_slope > Konfiguracja.SLOPE_RISING_THRESHOLD else 25.0
                 result['slope_score'] = slope_score
 
-            # === 4. MULTI-TIMEFRAME ALIGNMENT (20%) ===
-            alignment_score = 0.0
+            RankingEngine._zloz_composite(result, df, last_row, rs_percentile, momentum_score, slope_score)
 
-            # Daily: Trend OK (Close > 200MA AND slope > 0)
-            daily_ok = close > sma200 and sma200_slope > Konfiguracja.SLOPE_RISING_THRESHOLD
-            if daily_ok:
-                alignment_score += 1.0
+        except Exception as e:
+            print(f"Error in calculate_composite_score for {ticker}: {e}")
 
-            # Check RS Alignment
-            rs_ratio = last_row.get('RS_Ratio', 1.0)
-            rs_sma50 = last_row.get('RS_SMA50', 0) if 'RS_SMA50' in df.columns else 0
-            rs_trend_ok = rs_ratio > rs_sma50 if rs_sma50 > 0 else rs_ratio > 1.0
-            if rs_trend_ok:
-                alignment_score += 1.0
+        return result
 
-            # Weekly check (simplified: resample i oblicz)
-            if len(df) >= Konfiguracja.OKRES_NACHYLENIA:
-                try:
-                    df_weekly = df.resample('W').agg({'close': 'last', 'SMA200': 'last'}).dropna()
-                    if len(df_weekly) >= 10:
-                        weekly_close = df_weekly.iloc[-1]['close']
-                        weekly_sma200 = df_weekly.iloc[-1]['SMA200']
-                        if weekly_close > weekly_sma200:
-                            alignment_score += 1.0
-                except Exception:
-                    pass
-
-            # Max 3.0 alignment score
-            alignment_score = min(3.0, alignment_score)
-            # Konwertuj na percentyl (0-3 -> 0-100)
-            alignment_percentile = (alignment_score / 3.0) * 100
-            result['alignment_score'] = alignment_score
-
-            # === 5. DISTANCE PENALTY (10%) ===
-            # Penalty jeśli cena >30% od SMA200
-            distance_pct = ((close - sma200) / sma200) * 100 if sma200 > 0 else 0
-            distance_penalty = 0.0
-
-            if distance_pct > Konfiguracja.DISTANCE_PENALTY_THRESHOLD:
-                # Penalty: każdy 1% powyżej 30% to -1 punkt
-                excess_pct = distance_pct - Konfiguracja.DISTANCE_PENALTY_THRESHOLD
-                distance_penalty = min(100.0, excess_pct * 1.0)  # Cap na 100
-            elif distance_pct < -Konfiguracja.DISTANCE_PENALTY_THRESHOLD:
-                # Penalty jeśli pod 30%
-                excess_pct = abs(distance_pct) - Konfiguracja.DISTANCE_PENALTY_THRESHOLD
-                distance_penalty = min(100.0, excess_pct * 0.5)  # Mniejsza penaltzy dla cen pod SMA200
-
-            result['distance_penalty'] = distance_penalty
-            distance_score = max(0.0, 100.0 - distance_penalty)
-
-            # === COMPOSITE SCORE ===
-            weights = Konfiguracja.WAGI_RANKINGU
-            composite = (
-                rs_percentile * weights['rs_percentile'] +
-                momentum_score * weights['momentum'] +
-                slope_score * weights['sma200_slope'] +
-                alignment_percentile * weights['mtf_alignment'] +
-                distance_score * weights['distance_penalty']
-            )
-
-            composite = round(composite, 2)
-            result['composite_score'] = composite
+    @staticmethod
+    def composite_wsadowo(all_tickers_data: dict, benchmark_df: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        calculate_composite_score dla całej watchlisty naraz - O(N log N) zamiast O(N²).
 
-            # === TIER CLASSIFICATION ===
-            if composite > Konfiguracja.TIER_A_THRESHOLD:
-                result['tier'] = 'A'
-            elif composite >= Konfiguracja.TIER_B_THRESHOLD:
-                result['tier'] = 'B'
-            else:
-                result['tier'] = 'C'
+        Ostatnie wiersze są pobierane raz na tyker, a każdy rozkład (RS_Ratio, Mom3M,
+        SMA200_Slope) jest sortowany raz; percentyl tykera to np.searchsorted w posortowanym
+        rozkładzie. Tygodniowy warunek alignment liczony z tablic, bez resample.
+        Wyniki są identyczne z calculate_composite_score(t, df, benchmark_df,
+        all_tickers_data) dla każdego tykera.
 
-        except Exception as e:
-            print(f"Error in calculate_composite_score for {ticker}: {e}")
+        Args:
+            all_tickers_data: Dict {symbol: df} z kolumnami wskaźników
+            benchmark_df: DataFrame benchmarku (zgodność sygnatury, nieużywany jak w wersji skalarnej)
 
-        return result
+        Returns:
+            pd.DataFrame: indeks tykery, kolumny jak klucze wyniku calculate_composite_score
+        """
+        kolumny = ['composite_score', 'rs_percentile', 'momentum_score', 'slope_score',
+                   'alignment_score', 'distance_penalty', 'tier']
+        if not all_tickers_data:
+            return pd.DataFrame(columns=kolumny)
+
+        # Ostatnie wiersze - raz na tyker
+        ostatnie = {t: df.iloc[-1] for t, df in all_tickers_data.items() if not df.empty}
+        wiersze = list(ostatnie.values())
+
+        def wartosci(nazwa, domyslna):
+            return np.array([w.get(nazwa, domyslna) for w in wiersze], dtype=np.float64)
+
+        def percentyle(rozklad, biezace):
+            # Ile % wartości rozkładu <= bieżąca (NaN w rozkładzie tylko w mianowniku,
+            # sortowane na koniec; NaN bieżącej -> 0) - jak calculate_percentile_rank
+            if len(rozklad) == 0:
+                return np.full(len(biezace), 50.0)
+            posortowany = np.sort(rozklad)
+            ile = np.searchsorted(posortowany, biezace, side='right')
+            ile[np.isnan(biezace)] = 0
+            return np.clip(ile / len(rozklad) * 100, 0.0, 100.0)
+
+        rs = wartosci('RS_Ratio', 1.0)
+        mom3m = wartosci('Mom3M', 0)
+        mom6m = wartosci('Mom6M', 0)
+        slope = wartosci('SMA200_Slope', 0)
+
+        # Średnia momentum tykera porównywana z rozkładem Mom3M (jak w wersji skalarnej)
+        suma = mom3m + mom6m
+        sr_momentum = np.where(suma != 0, suma / 2, 0)
+
+        rs_pct = percentyle(rs[rs > 0], rs)
+        mom_pct = percentyle(mom3m, sr_momentum)
+        slope_pct = percentyle(slope, slope)
+
+        wyniki = {}
+        pozycje = {t: i for i, t in enumerate(ostatnie)}
+        for ticker, df in all_tickers_data.items():
+            result = {
+                'composite_score': 0.0,
+                'rs_percentile': 50.0,
+                'momentum_score': 50.0,
+                'slope_score': 50.0,
+                'alignment_score': 0.0,
+                'distance_penalty': 0.0,
+                'tier': 'C'
+            }
+            wyniki[ticker] = result
+            if df.empty or len(df) < 50:
+                continue
+
+            i = pozycje[ticker]
+            last_row = wiersze[i]
+            try:
+                last_row['close']
+                rs_percentile = float(rs_pct[i]) if 'RS_Ratio' in last_row else 50.0
+                result['rs_percentile'] = rs_percentile
+                result['momentum_score'] = float(mom_pct[i])
+                result['slope_score'] = float(slope_pct[i])
+                RankingEngine._zloz_composite(result, df, last_row, rs_percentile,
+                                              result['momentum_score'], result['slope_score'],
+                                              RankingEngine._tydzien_nad_sma200(df))
+            except Exception as e:
+                print(f"Error in calculate_composite_score for {ticker}: {e}")
+
+        return pd.DataFrame.from_dict(wyniki, orient='index', columns=kolumny)
+
+    @staticmethod
+    def _tydzien_nad_sma200(df: pd.DataFrame):
+        """
+        Tygodniowy warunek alignment (ostatni tydzień z close i SMA200: close > SMA200,
+        co najmniej 10 takich tygodni) bez resample całej ramki.
+
+        Tygodnie pon-ndz i wartość 'last' (ostatnia nie-NaN) jak WidokiInterwalow['W'].
+
+        Returns:
+            bool lub None, gdy ramka wymaga pełnego widoku (indeks nieposortowany / ze strefą)
+        """
+        if 'SMA200' not in df.columns or 'close' not in df.columns:
+            return False
+        if not isinstance(df.index, pd.DatetimeIndex) or df.index.tz is not None \
+                or not df.index.is_monotonic_increasing:
+            return None
+
+        dni = df.index.values.astype('datetime64[D]').astype(np.int64)
+        # 1970-01-01 to czwartek: (dni + 3) // 7 zmienia się w poniedziałki
+        tydzien = (dni + 3) // 7
+        close = df['close'].to_numpy(dtype=np.float64)
+        sma200 = df['SMA200'].to_numpy(dtype=np.float64)
+        jest_close, jest_sma = ~np.isnan(close), ~np.isnan(sma200)
+
+        wspolne = np.intersect1d(tydzien[jest_close], tydzien[jest_sma])
+        if len(wspolne) < 10:
+            return False
+        ostatni = tydzien == wspolne[-1]
+        return bool(close[ostatni & jest_close][-1] > sma200[ostatni & jest_sma][-1])
+
+    @staticmethod
+    def _zloz_composite(result: dict, df: pd.DataFrame, last_row: pd.Series,
+                        rs_percentile: float, momentum_score: float, slope_score: float,
+                        tydzien_ok: bool = None):
+        """
+        Komponenty lokalne (alignment, distance penalty), Composite Score i tier
+        calculate_composite_score - przy gotowych percentylach RS / momentum / slope.
+        Uzupełnia result w miejscu.
+
+        tydzien_ok: gotowy tygodniowy warunek alignment (_tydzien_nad_sma200);
+            None = z widoku tygodniowego WidokiInterwalow
+        """
+        close = last_row['close']
+        sma200 = last_row.get('SMA200', close)
+        sma200_slope = last_row.get('SMA200_Slope', 0)
+
+        # === 4. MULTI-TIMEFRAME ALIGNMENT (20%) ===
+        alignment_score = 0.0
+
+        # Daily: Trend OK (Close > 200MA AND slope > 0)
+        daily_ok = close > sma200 and sma200_slope > Konfiguracja.SLOPE_RISING_THRESHOLD
+        if daily_ok:
+            alignment_score += 1.0
+
+        # Check RS Alignment
+        rs_ratio = last_row.get('RS_Ratio', 1.0)
+        rs_sma50 = last_row.get('RS_SMA50', 0) if 'RS_SMA50' in df.columns else 0
+        rs_trend_ok = rs_ratio > rs_sma50 if rs_sma50 > 0 else rs_ratio > 1.0
+        if rs_trend_ok:
+            alignment_score += 1.0
+
+        # Weekly check (widok tygodniowy współdzielony z SlopeMetrics / SilnikRezimu)
+        if len(df) >= Konfiguracja.OKRES_NACHYLENIA and tydzien_ok is not None:
+            if tydzien_ok:
+                alignment_score += 1.0
+        elif len(df) >= Konfiguracja.OKRES_NACHYLENIA:
+            try:
+                df_weekly = WidokiInterwalow.dla(df).tygodniowy()[['close', 'SMA200']].dropna()
+                if len(df_weekly) >= 10:
+                    weekly_close = df_weekly.iloc[-1]['close']
+                    weekly_sma200 = df_weekly.iloc[-1]['SMA200']
+                    if weekly_close > weekly_sma200:
+                        alignment_score += 1.0
+            except Exception:
+                pass
+
+        # Max 3.0 alignment score
+        alignment_score = min(3.0, alignment_score)
+        # Konwertuj na percentyl (0-3 -> 0-100)
+        alignment_percentile = (alignment_score / 3.0) * 100
+        result['alignment_score'] = alignment_score
+
+        # === 5. DISTANCE PENALTY (10%) ===
+        # Penalty jeśli cena >30% od SMA200
+        distance_pct = ((close - sma200) / sma200) * 100 if sma200 > 0 else 0
+        distance_penalty = 0.0
+
+        if distance_pct > Konfiguracja.DISTANCE_PENALTY_THRESHOLD:
+            # Penalty: każdy 1% powyżej 30% to -1 punkt
+            excess_pct = distance_pct - Konfiguracja.DISTANCE_PENALTY_THRESHOLD
+            distance_penalty = min(100.0, excess_pct * 1.0)  # Cap na 100
+        elif distance_pct < -Konfiguracja.DISTANCE_PENALTY_THRESHOLD:
+            # Penalty jeśli pod 30%
+            excess_pct = abs(distance_pct) - Konfiguracja.DISTANCE_PENALTY_THRESHOLD
+            distance_penalty = min(100.0, excess_pct * 0.5)  # Mniejsza penaltzy dla cen pod SMA200
+
+        result['distance_penalty'] = distance_penalty
+        distance_score = max(0.0, 100.0 - distance_penalty)
+
+        # === COMPOSITE SCORE ===
+        weights = Konfiguracja.WAGI_RANKINGU
+        composite = (
+            rs_percentile * weights['rs_percentile'] +
+            momentum_score * weights['momentum'] +
+            slope_score * weights['sma200_slope'] +
+            alignment_percentile * weights['mtf_alignment'] +
+            distance_score * weights['distance_penalty']
+        )
+
+        composite = round(composite, 2)
+        result['composite_score'] = composite
+
+        # === TIER CLASSIFICATION ===
+        if composite > Konfiguracja.TIER_A_THRESHOLD:
+            result['tier'] = 'A'
+        elif composite >= Konfiguracja.TIER_B_THRESHOLD:
+            result['tier'] = 'B'
+        else:
+            result['tier'] = 'C'
 
     @staticmethod
-    def generuj_ranking(dane_tykerow: dict[str, pd.DataFrame], benchmark_df: pd.DataFrame) -> pd.DataFrame:
+    def generuj_ranking(dane_tykerow: dict[str, pd.DataFrame], benchmark_df: pd.DataFrame,
+                        cache=None, benchmarki: dict = None,
+                        wskazniki=None) -> pd.DataFrame:
         """
         Generuje ranking wszystkich tykerów z Composite Score i nowymi kolumnami.
         Trzyma backward compatibility ze starym SilnikRankingu.
@@ -381,44 +602,60 @@ class RankingEngine:
         Args:
             dane_tykerow: Dict {symbol: DataFrame}
             benchmark_df: DataFrame z danymi SPY
+            cache: Opcjonalny CacheWskaznikow - tykery z wpisem w cache liczone tylko dla nowych
+                świec; bez wpisu liczony jest sam ostatni wiersz (oblicz_ostatnie). Skan celowo
+                nie zakłada wpisów - pełne przeliczenie historii kosztuje wielokrotnie więcej niż
+                ostatni wiersz; wpis powstaje przy otwarciu wykresu tykera (CacheWskaznikow.oblicz)
+            benchmarki: Opcjonalny Dict {symbol: DataFrame} - dodatkowe kolumny RS_Ratio_<symbol>,
+                RS_SMA50_<symbol>, RS_Slope_<symbol> (MacierzRS) do przełączania benchmarku
+                bez przeliczania (przelacz_benchmark)
+            wskazniki: Opcjonalne nazwy kolumn, do których odwołują się filtry / wykresy - wskaźniki
+                RejestrWskaznikow wśród nich (np. 'RSI14', 'ADX14') dochodzą jako kolumny rankingu;
+                pozostałe wskaźniki rejestru nie są liczone
 
         Returns:
             pd.DataFrame: Ranking z kolumnami: Tyker, Status, CompositeScore, Tier, Cena, SMA200_Slope, RS_Slope, Distance_200%, ATR_pct, AlignmentScore
         """
         wyniki = []
+        dodatkowe = RejestrWskaznikow.wymagane(wskazniki or ())
 
-        for tyker, df in dane_tykerow.items():
-            if df.empty or len(df) < 50:
-                continue
+        dane_tykerow = {t: df for t, df in dane_tykerow.items() if not df.empty and len(df) >= 50}
+        macierz_rs = MacierzRS.oblicz(dane_tykerow, benchmarki) if benchmarki else None
 
-            # Oblicz wszystkie wskaźniki
-            df = SilnikWskaznikow.oblicz_wskazniki(df, benchmark_df)
-            ostatni = df.iloc[-1]
-
-            # Status (gating layer) - FIRST
-            status = SilnikStatusu.okresl_status(ostatni)
-
-            # ChecklistScore (NOVI SISTEM v2.1) - DRUGI
-            # Samo za TRADEABLE spółki będą rankowane
-            score_dict = RankingEngine.calculate_checklist_score(tyker, df, benchmark_df)
+        for tyker, df in dane_tykerow.items():
+            # Wskaźniki: cache daje pełne kolumny, bez wpisu liczony jest tylko ostatni wiersz
+            if cache is not None and cache.ma_wpis(tyker):
+                # Tylko istniejące wpisy - skan nie zakłada nowych (patrz docstring: cache)
+                # Ramka wskaźników obok danych - df wywołującego (skaner, dashboard) zostaje bez zmian
+                kolumny = cache.oblicz(tyker, df, benchmark_df, w_miejscu=False)
+                ostatni = pd.concat([SilnikWskaznikow.normalizuj_kolumny(df).iloc[-1], kolumny.iloc[-1]])
+            else:
+                ostatni = SilnikWskaznikow.oblicz_ostatnie(df, benchmark_df)
 
-            # Przygotuj wiersz wynika
+            # Przygotuj wiersz wynika (Status / ChecklistScore / Tier - wsadowo po pętli)
             wynik = {
                 'Tyker': tyker,
-                'Status': status,
-                'ChecklistScore': score_dict['checklist_score'],  # 0-10
-                'Tier': score_dict['tier'],  # A/B/C/D
                 'Zamkniecie': ostatni['close'],
                 'SMA200': ostatni.get('SMA200', 0),
+                'SMA50': ostatni.get('SMA50', 0),
                 'SMA200_Slope': ostatni.get('SMA200_Slope', 0),
                 'SMA50_Slope': ostatni.get('SMA50_Slope', 0),
                 'RS_Ratio': ostatni.get('RS_Ratio', 0),
+                'RS_SMA50': ostatni.get('RS_SMA50', 0),
                 'RS_Slope': ostatni.get('RS_Slope', 0),
                 'Distance_200': ostatni.get('Dist_SMA200', 0),
                 'ATR_Pct': ostatni.get('ATR_Pct', 0),
                 'Momentum_3M': ostatni.get('Mom3M', 0),
                 'Momentum_6M': ostatni.get('Mom6M', 0),
+                'RVol': ostatni.get('RVol', np.nan),
+                'Vol_SMA50': ostatni.get('Vol_SMA50', np.nan),
+                'DollarVol20': ostatni.get('DollarVol20', np.nan),
             }
+            if dodatkowe:
+                wynik.update(RejestrWskaznikow.ostatnie(df, dodatkowe).to_dict())
+            if macierz_rs is not None:
+                for (kolumna, benchmark), wartosc in macierz_rs.loc[tyker].items():
+                    wynik[f'{kolumna}_{benchmark}'] = wartosc
 
             wyniki.append(wynik)
 
@@ -426,7 +663,21 @@ class RankingEngine:
             return pd.DataFrame()
 
         df_wynik = pd.DataFrame(wyniki)
+        # Status (gating layer) i ChecklistScore (v2.1) dla wszystkich tykerów naraz
+        status, checklista = RankingEngine._ocen_wiersze(df_wynik)
+        df_wynik.insert(1, 'Status', status)
+        df_wynik.insert(2, 'ChecklistScore', checklista['checklist_score'].to_numpy())  # 0-10
+        df_wynik.insert(3, 'Tier', checklista['tier'].to_numpy())  # A/B/C/D
+        return RankingEngine._sortuj(df_wynik)
+
+    @staticmethod
+    def _ocen_wiersze(df_wynik: pd.DataFrame):
+        """Status i checklista z kolumn rankingu (MAPA_KOLUMN_RANKINGU -> nazwy wskaźników)."""
+        wiersze = df_wynik.rename(columns=RankingEngine.MAPA_KOLUMN_RANKINGU)
+        return SilnikStatusu.okresl_status_wsadowo(wiersze), RankingEngine.checklist_wsadowo(wiersze)
 
+    @staticmethod
+    def _sortuj(df_wynik: pd.DataFrame) -> pd.DataFrame:
         # ===== SORTOWANIE (NOVE) =====
         # Logika:
         # 1. Status: TRADEABLE -> SETUP -> OUT
@@ -447,8 +698,51 @@ class RankingEngine:
         # Usuń kolumny pomocnicze
         df_wynik = df_wynik.drop(columns=['Status_Order', 'Tier_Order'], errors='ignore')
 
+        # Zwarte typy (po sortowaniu - kategorie nie wpływają na kolejność)
+        if TypyKompaktowe.wlaczony():
+            df_wynik = TypyKompaktowe.kompaktuj_ranking(df_wynik)
+
         return df_wynik
 
+    # Kolumny rankingu -> nazwy kolumn wskaźników (dla Status / ChecklistScore z wiersza rankingu)
+    MAPA_KOLUMN_RANKINGU = {
+        'Zamkniecie': 'close',
+        'Distance_200': 'Dist_SMA200',
+        'Momentum_3M': 'Mom3M',
+        'Momentum_6M': 'Mom6M',
+    }
+
+    @staticmethod
+    def przelacz_benchmark(ranking_df: pd.DataFrame, benchmark: str) -> pd.DataFrame:
+        """
+        Ranking z RS wobec innego benchmarku - bez przeliczania wskaźników.
+
+        Kolumny RS_Ratio / RS_SMA50 / RS_Slope są podmieniane wartościami z kolumn
+        <kolumna>_<benchmark> (generuj_ranking(..., benchmarki=...)), a Status,
+        ChecklistScore i Tier liczone ponownie z wierszy rankingu.
+
+        Args:
+            ranking_df: Wynik generuj_ranking z kolumnami wielu benchmarków
+            benchmark: Symbol benchmarku (np. 'QQQ')
+
+        Returns:
+            pd.DataFrame: Nowy, ponownie posortowany ranking
+        """
+        zrodla = [f'{kolumna}_{benchmark}' for kolumna in MacierzRS.KOLUMNY]
+        if ranking_df.empty or any(z not in ranking_df.columns for z in zrodla):
+            print(f"Brak kolumn RS dla benchmarku {benchmark} w rankingu")
+            return ranking_df
+
+        df = ranking_df.copy()
+        for kolumna, zrodlo in zip(MacierzRS.KOLUMNY, zrodla):
+            df[kolumna] = df[zrodlo]
+
+        status, checklista = RankingEngine._ocen_wiersze(df)
+        df['Status'] = status
+        df['ChecklistScore'] = checklista['checklist_score'].to_numpy()
+        df['Tier'] = checklista['tier'].to_numpy()
+        return RankingEngine._sortuj(df.reset_index(drop=True))
+
 
 # Backward compatibility - alias
 SilnikRankingu = RankingEngine
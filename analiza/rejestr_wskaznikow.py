@@ -0,0 +1,250 @@
+"""
+RejestrWskaznikow - rozszerzalny rejestr wskaźników liczonych tylko na żądanie.
+
+Każdy wskaźnik deklaruje kolumny wejściowe OHLCV, rozbieg (liczbę świec do pierwszej
+wiarygodnej wartości) i wektorowy kernel, który pobiera wielkości pośrednie z
+GrafWskaznikow. Silnik liczy wyłącznie wskaźniki, o które prosi ranking, filtr
+skanera lub wykres - w jednym przebiegu po wspólnym grafie ramki (np. MACD i
+linia sygnału korzystają z tych samych EMA, ADX z tego samego TR co ATR14):
+
+    nazwy = RejestrWskaznikow.wymagane(kolumny_filtrow)     # np. ['RSI14', 'ADX14']
+    kolumny = RejestrWskaznikow.oblicz(df, nazwy)            # ramka obok df, df bez zmian
+
+Nowy wskaźnik nie wymaga zmian w SilnikWskaznikow.oblicz_wskazniki, więc nie
+spowalnia skanów, które z niego nie korzystają:
+
+    @RejestrWskaznikow.zarejestruj('Stoch14', wejscia=('high', 'low', 'close'), rozbieg=14)
+    def _stochastic(graf, df):
+        return (df['close'] - graf['LOW_MIN_14']) / (graf['HIGH_MAX_14'] - graf['LOW_MIN_14']) * 100
+
+Nazwa może zawierać pola Konfiguracja ('RSI{OKRES_RSI}'), a rozbieg może być funkcją -
+oba są odczytywane przy każdym użyciu, tak jak okresy w kernelach, więc zmiana
+konfiguracji w trakcie działania zmienia nazwy kolumn i rozbieg razem z wartościami.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from konfiguracja import Konfiguracja
+from .graf_wskaznikow import GrafWskaznikow
+from .wskazniki import SilnikWskaznikow
+
+
+class _PolaKonfiguracji(dict):
+    """Mapowanie dla str.format_map - pola nazwy czytane z Konfiguracja w chwili użycia."""
+
+    def __missing__(self, pole):
+        return getattr(Konfiguracja, pole)
+
+
+@dataclass(frozen=True)
+class DefinicjaWskaznika:
+    """Deklaracja wskaźnika w rejestrze."""
+    szablon: str                # nazwa kolumny; {POLE} -> bieżąca wartość Konfiguracja.POLE
+    wejscia: Tuple[str, ...]    # wymagane kolumny OHLCV (angielskie nazwy)
+    okres_rozbiegu: Union[int, Callable[[], int]]
+    kernel: Callable            # kernel(graf, df) -> wartości dla wszystkich świec
+    opis: str = ''
+
+    @property
+    def nazwa(self) -> str:
+        return self.szablon.format_map(_PolaKonfiguracji())
+
+    @property
+    def rozbieg(self) -> int:
+        """Świece do pierwszej wiarygodnej wartości (dla bieżącej konfiguracji)."""
+        okres = self.okres_rozbiegu
+        return int(okres() if callable(okres) else okres)
+
+
+class RejestrWskaznikow:
+    """
+    Rejestr wskaźników (nazwa kolumny -> DefinicjaWskaznika) i silnik liczący wybrane.
+    """
+
+    # Zarejestrowane wskaźniki (szablon nazwy -> definicja) w kolejności rejestracji
+    _definicje: Dict[str, DefinicjaWskaznika] = {}
+
+    @classmethod
+    def zarejestruj(cls, nazwa: str, wejscia: Tuple[str, ...] = ('close',),
+                    rozbieg: Union[int, Callable[[], int]] = 1,
+                    opis: str = '', zastap: bool = False) -> Callable:
+        """
+        Dekorator rejestrujący kernel wskaźnika.
+
+        Args:
+            nazwa: Nazwa kolumny wyniku (np. 'RSI14'), może zawierać pola Konfiguracja ('RSI{OKRES_RSI}')
+            wejscia: Kolumny OHLCV, których kernel potrzebuje
+            rozbieg: Liczba świec do pierwszej wiarygodnej wartości (wcześniejsze -> NaN)
+                albo funkcja bez argumentów licząca ją z bieżącej konfiguracji
+            opis: Krótki opis (podpowiedzi w interfejsie)
+            zastap: True = nadpisz istniejący wskaźnik o tej nazwie
+
+        Raises:
+            ValueError: nazwa zajęta przez wskaźnik rejestru lub kolumnę oblicz_wskazniki
+        """
+        definicja = DefinicjaWskaznika(nazwa, tuple(wejscia), rozbieg, None, opis)
+        if not zastap and (nazwa in cls._definicje or definicja.nazwa in cls._biezace()
+                           or definicja.nazwa in SilnikWskaznikow.KOLUMNY_WSKAZNIKOW):
+            raise ValueError(f"Wskaźnik {definicja.nazwa} jest już zdefiniowany")
+        if not callable(rozbieg) and rozbieg < 1:
+            raise ValueError(f"Rozbieg wskaźnika {definicja.nazwa} musi wynosić co najmniej 1 świecę")
+
+        def dekorator(kernel: Callable) -> Callable:
+            cls._definicje[nazwa] = DefinicjaWskaznika(nazwa, tuple(wejscia), rozbieg, kernel, opis)
+            return kernel
+
+        return dekorator
+
+    @classmethod
+    def wyrejestruj(cls, nazwa: str):
+        """Usuń wskaźnik (szablon albo bieżąca nazwa kolumny)."""
+        definicja = cls._biezace().get(nazwa)
+        cls._definicje.pop(definicja.szablon if definicja else nazwa, None)
+
+    @classmethod
+    def _biezace(cls) -> Dict[str, DefinicjaWskaznika]:
+        """Bieżąca nazwa kolumny -> definicja (nazwy z szablonów i aktualnej Konfiguracja)."""
+        return {d.nazwa: d for d in cls._definicje.values()}
+
+    @classmethod
+    def definicja(cls, nazwa: str) -> DefinicjaWskaznika:
+        try:
+            return cls._biezace()[nazwa]
+        except KeyError:
+            raise KeyError(f"Nieznany wskaźnik rejestru: {nazwa}") from None
+
+    @classmethod
+    def nazwy(cls) -> Tuple[str, ...]:
+        """Bieżące nazwy kolumn wszystkich wskaźników (np. do panelu szczegółów skanera)."""
+        return tuple(cls._biezace())
+
+    @classmethod
+    def wymagane(cls, referencje: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Wskaźniki rejestru, do których odwołują się kolumny rankingu / filtry / wykresy.
+
+        Nazwy spoza rejestru (kolumny OHLCV, oblicz_wskazniki, rankingu) są pomijane.
+
+        Returns:
+            Tuple: nazwy w kolejności pierwszego odwołania, bez powtórzeń
+        """
+        biezace = cls._biezace()
+        return tuple(dict.fromkeys(n for n in referencje if n in biezace))
+
+    @classmethod
+    def rozbieg(cls, nazwy: Iterable[str]) -> int:
+        """Najdłuższy rozbieg wybranych wskaźników (minimalna historia dla wszystkich wartości)."""
+        return max((cls.definicja(n).rozbieg for n in nazwy), default=0)
+
+    @classmethod
+    def oblicz(cls, df: pd.DataFrame, nazwy: Iterable[str],
+               graf: Optional[GrafWskaznikow] = None) -> pd.DataFrame:
+        """
+        Wybrane wskaźniki rejestru jako ramka obok df (df nie jest modyfikowany).
+
+        Wszystkie kernele korzystają z jednego grafu ramki, więc wspólne wielkości
+        pośrednie liczone są raz; wyniki trafiają do jednego prealokowanego bloku.
+        Brak kolumny wejściowej -> NaN (jak kolumny wolumenu w oblicz_wskazniki).
+
+        Args:
+            df: DataFrame OHLCV (polskie lub angielskie nazwy kolumn)
+            nazwy: Nazwy wskaźników (KeyError dla nieznanych)
+            graf: Graf wielkości pośrednich (domyślnie GrafWskaznikow.dla(df))
+
+        Returns:
+            pd.DataFrame: kolumny w kolejności nazw, indeks df
+        """
+        definicje = [cls.definicja(n) for n in dict.fromkeys(nazwy)]
+        kolumny = [d.nazwa for d in definicje]
+        blok = np.full((len(df), len(definicje)), np.nan)
+        if df.empty or not definicje:
+            return pd.DataFrame(blok, index=df.index, columns=kolumny, copy=False)
+
+        df = SilnikWskaznikow.normalizuj_kolumny(df)
+        if graf is None:
+            graf = GrafWskaznikow.dla(df)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for j, definicja in enumerate(definicje):
+                if not all(k in df.columns for k in definicja.wejscia):
+                    continue
+                blok[:, j] = definicja.kernel(graf, df)
+                # Wartości z okresu rozbiegu nie są wiarygodne
+                blok[:definicja.rozbieg - 1, j] = np.nan
+
+        return pd.DataFrame(blok, index=df.index, columns=kolumny, copy=False)
+
+    @classmethod
+    def dolacz(cls, df: pd.DataFrame, nazwy: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Nowa ramka: df z dołączonymi kolumnami wskaźników rejestru (wykres / panel szczegółów).
+
+        Args:
+            df: DataFrame OHLCV, np. wynik CacheWskaznikow.oblicz
+            nazwy: Nazwy wskaźników (domyślnie wszystkie z rejestru)
+        """
+        kolumny = cls.oblicz(df, cls.nazwy() if nazwy is None else nazwy)
+        return pd.concat([df.drop(columns=kolumny.columns, errors='ignore'), kolumny], axis=1)
+
+    @classmethod
+    def ostatnie(cls, df: pd.DataFrame, nazwy: Iterable[str]) -> pd.Series:
+        """Ostatni wiersz oblicz(df, nazwy) (ranking, skaner)."""
+        kolumny = cls.oblicz(df, nazwy)
+        if kolumny.empty:
+            return pd.Series(np.nan, index=kolumny.columns, dtype=np.float64)
+        return kolumny.iloc[-1]
+
+
+# ── Wskaźniki wbudowane ─────────────────
+# Nazwy i rozbieg z bieżącej Konfiguracja (jak okresy czytane w kernelach)
+
+
+@RejestrWskaznikow.zarejestruj('RSI{OKRES_RSI}', rozbieg=lambda: Konfiguracja.OKRES_RSI + 1,
+                               opis='RSI Wildera (0-100)')
+def _rsi(graf, df):
+    return graf[f'RSI_{Konfiguracja.OKRES_RSI}']
+
+
+@RejestrWskaznikow.zarejestruj('MACD', rozbieg=lambda: Konfiguracja.MACD_WOLNA, opis='EMA szybka - EMA wolna')
+def _macd(graf, df):
+    return graf[f'MACD_{Konfiguracja.MACD_SZYBKA}_{Konfiguracja.MACD_WOLNA}']
+
+
+@RejestrWskaznikow.zarejestruj('MACD_Signal', rozbieg=lambda: Konfiguracja.MACD_WOLNA + Konfiguracja.MACD_SYGNAL - 1,
+                               opis='Linia sygnału MACD')
+def _macd_sygnal(graf, df):
+    return graf[f'MACD_SIG_{Konfiguracja.MACD_SZYBKA}_{Konfiguracja.MACD_WOLNA}_{Konfiguracja.MACD_SYGNAL}']
+
+
+@RejestrWskaznikow.zarejestruj('MACD_Hist', rozbieg=lambda: Konfiguracja.MACD_WOLNA + Konfiguracja.MACD_SYGNAL - 1,
+                               opis='Histogram MACD (MACD - sygnał)')
+def _macd_histogram(graf, df):
+    return _macd(graf, df) - _macd_sygnal(graf, df)
+
+
+@RejestrWskaznikow.zarejestruj('BB_Width', rozbieg=lambda: Konfiguracja.OKRES_BOLLINGER,
+                               opis='Szerokość wstęg Bollingera w % SMA')
+def _bb_width(graf, df):
+    return graf[f'BB_WIDTH_{Konfiguracja.OKRES_BOLLINGER}_{Konfiguracja.BOLLINGER_ODCHYLENIE}']
+
+
+@RejestrWskaznikow.zarejestruj('DI_Plus{OKRES_ADX}', wejscia=('high', 'low', 'close'),
+                               rozbieg=lambda: Konfiguracja.OKRES_ADX, opis='+DI Wildera')
+def _di_plus(graf, df):
+    return graf[f'DI_PLUS_{Konfiguracja.OKRES_ADX}']
+
+
+@RejestrWskaznikow.zarejestruj('DI_Minus{OKRES_ADX}', wejscia=('high', 'low', 'close'),
+                               rozbieg=lambda: Konfiguracja.OKRES_ADX, opis='-DI Wildera')
+def _di_minus(graf, df):
+    return graf[f'DI_MINUS_{Konfiguracja.OKRES_ADX}']
+
+
+@RejestrWskaznikow.zarejestruj('ADX{OKRES_ADX}', wejscia=('high', 'low', 'close'),
+                               rozbieg=lambda: 2 * Konfiguracja.OKRES_ADX - 1, opis='ADX Wildera (siła trendu, 0-100)')
+def _adx(graf, df):
+    return graf[f'ADX_{Konfiguracja.OKRES_ADX}']
@@ -1,6 +1,7 @@
 import pandas as pd
 from enum import Enum
 from .wskazniki import SilnikWskaznikow
+from .widoki_interwalow import WidokiInterwalow
 from konfiguracja import Konfiguracja
 
 
@@ -109,7 +110,8 @@ class SilnikRezimu:
 
         # Upewnij się że mamy potrzebne wskaźniki
         if 'SMA200_Slope' not in benchmark_df.columns:
-            benchmark_df = SilnikWskaznikow.oblicz_wskazniki(benchmark_df)
+            # Płytka kopia - ramka benchmarku wywołującego (także do RS) zostaje bez zmian
+            benchmark_df = SilnikWskaznikow.oblicz_wskazniki(benchmark_df.copy(deep=False))
 
         # Daily data
         ostatni = benchmark_df.iloc[-1]
@@ -117,26 +119,20 @@ class SilnikRezimu:
         daily_sma200 = ostatni['SMA200']
         daily_slope = ostatni.get('SMA200_Slope', 0)
 
-        # Weekly data - resample
+        # Weekly data - widok tygodniowy ze wspólnego cache (resample raz na ramkę)
         try:
-            df_weekly = benchmark_df.resample('W').agg({
-                'close': 'last',
-                'SMA200': 'last'
-            }).dropna()
+            widoki = WidokiInterwalow.dla(benchmark_df)
+            df_weekly = widoki.tygodniowy()[['close', 'SMA200']].dropna()
 
             if len(df_weekly) >= 20:
                 weekly_last = df_weekly.iloc[-1]
                 weekly_close = weekly_last['close']
                 weekly_sma200 = weekly_last['SMA200']
-                # Weekly slope (простой скатегор)
+                # Weekly slope
                 if len(df_weekly) >= Konfiguracja.OKRES_NACHYLENIA:
-                    from .slope import SlopeMetrics
-                    weekly_slopes = SlopeMetrics.calculate_sma_slope(
-                        df_weekly.reset_index()[['SMA200']],
-                        'SMA200',
-                        window=min(Konfiguracja.OKRES_NACHYLENIA, len(df_weekly) - 1)
+                    weekly_slope = widoki.nachylenie(
+                        'W', 'SMA200', min(Konfiguracja.OKRES_NACHYLENIA, len(df_weekly) - 1)
                     )
-                    weekly_slope = weekly_slopes.iloc[-1] if not weekly_slopes.empty else 0.0
                 else:
                     weekly_slope = 0.0
             else:
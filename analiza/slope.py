@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from enum import Enum
 from konfiguracja import Konfiguracja
+from .kernele import linear_slope, rolling_slope
+from .widoki_interwalow import WidokiInterwalow
 
 
 class SlopeStatus(Enum):
@@ -39,25 +41,8 @@ class SlopeMetrics:
         if len(series) < 2:
             return 0.0
 
-        y = series
-        x = np.arange(len(y))
-
-        try:
-            # Regresja liniowa: y = mx + c, gdzie m to slope
-            coeffs = np.polyfit(x, y, 1)
-            m = coeffs[0]
-
-            # Normalizacja: % zmiany na dzień w stosunku do średniej wartości
-            avg_value = np.mean(y)
-            if avg_value == 0:
-                return 0.0
-
-            # Slope znormalizowany do % (zmiana procentowa na dzień)
-            normalized_slope = (m / avg_value) * 100
-            return normalized_slope
-        except Exception as e:
-            print(f"Error calculating slope: {e}")
-            return 0.0
+        # Regresja liniowa y = mx + c, m znormalizowane do % średniej wartości
+        return linear_slope(series)
 
     @staticmethod
     def calculate_sma_slope(df: pd.DataFrame, sma_column: str,
@@ -79,11 +64,7 @@ class SlopeMetrics:
         if sma_column not in df.columns:
             return pd.Series(0.0, index=df.index)
 
-        def calc_slope(series):
-            return SlopeMetrics._calculate_linear_slope(series.values)
-
-        slopes = df[sma_column].rolling(window=window).apply(calc_slope, raw=False)
-        return slopes
+        return pd.Series(rolling_slope(df[sma_column], window), index=df.index, name=sma_column)
 
     @staticmethod
     def calculate_rs_slope(rs_series: pd.Series, window: int = None) -> pd.Series:
@@ -100,11 +81,7 @@ class SlopeMetrics:
         if window is None:
             window = Konfiguracja.OKRES_NACHYLENIA
 
-        def calc_slope(series):
-            return SlopeMetrics._calculate_linear_slope(series.values)
-
-        slopes = rs_series.rolling(window=window).apply(calc_slope, raw=False)
-        return slopes
+        return pd.Series(rolling_slope(rs_series, window), index=rs_series.index, name=rs_series.name)
 
     @staticmethod
     def calculate_multi_slope(df: pd.DataFrame, benchmark_df: pd.DataFrame = None) -> dict:
@@ -153,17 +130,11 @@ class SlopeMetrics:
                 result['rs_slope'] = rs_slopes.iloc[-1] if not pd.isna(rs_slopes.iloc[-1]) else 0.0
 
         # Weekly SMA200 slope (jeśli da się obliczyć z daily data)
-        # Uproszczona wersja: resample do weekly i oblicz slope
+        # Widok tygodniowy ze wspólnego cache (WidokiInterwalow) - resample raz na ramkę
         if len(df) >= Konfiguracja.OKRES_NACHYLENIA:
             try:
-                df_weekly = df.resample('W').agg({'SMA200': 'last'}).dropna()
-                if len(df_weekly) >= Konfiguracja.OKRES_NACHYLENIA:
-                    weekly_slopes = SlopeMetrics.calculate_sma_slope(
-                        df_weekly, 'SMA200',
-                        window=Konfiguracja.OKRES_NACHYLENIA
-                    )
-                    if not weekly_slopes.empty:
-                        result['sma200_slope_weekly'] = weekly_slopes.iloc[-1] if not pd.isna(weekly_slopes.iloc[-1]) else 0.0
+                weekly_slope = WidokiInterwalow.dla(df).nachylenie('W', 'SMA200', Konfiguracja.OKRES_NACHYLENIA)
+                result['sma200_slope_weekly'] = weekly_slope if not pd.isna(weekly_slope) else 0.0
             except Exception as e:
                 print(f"Error calculating weekly slope: {e}")
                 result['sma200_slope_weekly'] = 0.0
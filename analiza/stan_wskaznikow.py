@@ -0,0 +1,262 @@
+"""
+StanWskaznikow - przyrostowy (O(1) na świecę) stan wskaźników SilnikWskaznikow.
+
+Trzyma tylko okna potrzebne do policzenia ostatniego wiersza:
+  - sumy kroczące SMA50 / SMA200 / ATR14 / RS_SMA50
+  - sumy regresji (Σy, Σxy) dla SMA50_Slope / SMA200_Slope / RS_Slope
+  - zamknięcia wstecz dla Mom3M / Mom6M i poprzednie zamknięcie dla True Range
+  - sumy kroczące wolumenu, obrotu w $ i wolumenu świec wzrostowych / spadkowych
+
+dodaj_swiece() liczy wszystkie kolumny oblicz_wskazniki dla jednej dopisanej
+świecy w czasie niezależnym od długości historii. Co PRZELICZ_CO aktualizacji
+sumy są liczone od nowa z okien (math.fsum), co ogranicza dryf zmiennoprzecinkowy.
+Stan jest serializowany (pickle) przez CacheWskaznikow do tabeli stan_wskaznikow.
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from konfiguracja import Konfiguracja
+
+
+class _OknoSumy:
+    """Okno o stałej długości z sumą kroczącą."""
+
+    __slots__ = ('okno', 'suma')
+
+    def __init__(self, dlugosc: int, wartosci=()):
+        self.okno = deque(wartosci, maxlen=dlugosc)
+        self.suma = math.fsum(self.okno)
+
+    def dodaj(self, y: float):
+        if len(self.okno) == self.okno.maxlen:
+            self.suma -= self.okno[0]
+        self.okno.append(y)
+        self.suma += y
+        if math.isnan(self.suma) and not math.isnan(y):
+            self.przelicz()
+
+    def przelicz(self):
+        self.suma = math.fsum(self.okno)
+
+    def srednia(self) -> float:
+        if len(self.okno) < self.okno.maxlen:
+            return np.nan
+        return self.suma / len(self.okno)
+
+
+class _OknoRegresji(_OknoSumy):
+    """
+    Okno regresji liniowej przy stałym x = 0..w-1.
+
+    Przesunięcie okna o jedną wartość:
+      Σxy' = Σxy - (Σy - y0) + (w - 1) * y_nowe
+      Σy'  = Σy - y0 + y_nowe
+    """
+
+    __slots__ = ('suma_xy',)
+
+    def __init__(self, dlugosc: int, wartosci=()):
+        super().__init__(dlugosc, wartosci)
+        self.suma_xy = math.fsum(x * y for x, y in enumerate(self.okno))
+
+    def dodaj(self, y: float):
+        w = self.okno.maxlen
+        if len(self.okno) < w:
+            self.suma_xy += len(self.okno) * y
+            self.okno.append(y)
+            self.suma += y
+        else:
+            y0 = self.okno[0]
+            self.suma_xy += -(self.suma - y0) + (w - 1) * y
+            self.suma += y - y0
+            self.okno.append(y)
+        if math.isnan(self.suma) and not math.isnan(y):
+            self.przelicz()
+
+    def przelicz(self):
+        super().przelicz()
+        self.suma_xy = math.fsum(x * y for x, y in enumerate(self.okno))
+
+    def nachylenie(self) -> float:
+        """Jak kernele.rolling_slope dla ostatniego okna."""
+        w = self.okno.maxlen
+        if len(self.okno) < w or math.isnan(self.suma):
+            return np.nan
+        srodek = (w - 1) / 2.0
+        sxx = w * (w * w - 1) / 12.0
+        srednia = self.suma / w
+        if srednia == 0 or not math.isfinite(srednia):
+            return 0.0
+        wynik = (self.suma_xy - srodek * self.suma) / sxx / srednia * 100
+        return wynik if math.isfinite(wynik) else 0.0
+
+
+class StanWskaznikow:
+    """
+    Stan kroczący wskaźników jednego tykera.
+    """
+
+    # Co ile dopisanych świec liczyć sumy od nowa
+    PRZELICZ_CO = 256
+
+    def __init__(self):
+        self.liczba_swiec = 0
+        self.ostatnia_data = None
+        self.rs_aktywny = False
+        self.aktualizacje = 0
+
+    # ── Budowa ze świeżo policzonej ramki ───
+
+    @staticmethod
+    def minimalna_historia() -> int:
+        """Od tej długości kolumny slope są liczone (krótsze -> 0.0 w całej kolumnie)."""
+        return Konfiguracja.OKRES_NACHYLENIA + Konfiguracja.SMA_WOLNA + 1
+
+    @classmethod
+    def z_ramki(cls, df: pd.DataFrame, rs_aktywny: bool) -> Optional['StanWskaznikow']:
+        """
+        Odtwórz stan z ramki po SilnikWskaznikow.oblicz_wskazniki (używa tylko ogona).
+
+        Args:
+            df: Ramka z kolumnami OHLCV i wskaźników
+            rs_aktywny: Czy RS był liczony z benchmarku (wspólne daty istniały)
+
+        Returns:
+            StanWskaznikow lub None, gdy historia jest za krótka
+        """
+        if len(df) < cls.minimalna_historia():
+            return None
+
+        okres = Konfiguracja.OKRES_NACHYLENIA
+        close = df['close'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+
+        stan = cls()
+        stan.liczba_swiec = len(df)
+        stan.ostatnia_data = df.index[-1]
+        stan.rs_aktywny = rs_aktywny
+
+        dl_zamkniec = max(Konfiguracja.SMA_WOLNA, Konfiguracja.MOMENTUM_DLUGIE + 1)
+        stan.zamkniecia = deque(close[-dl_zamkniec:].tolist(), maxlen=dl_zamkniec)
+        stan.sma_szybka = _OknoSumy(Konfiguracja.SMA_SZYBKA, close[-Konfiguracja.SMA_SZYBKA:].tolist())
+        stan.sma_wolna = _OknoSumy(Konfiguracja.SMA_WOLNA, close[-Konfiguracja.SMA_WOLNA:].tolist())
+
+        # True Range ostatnich OKRES_ATR świec (pierwsza świeca historii: high - low)
+        n_tr = Konfiguracja.OKRES_ATR
+        h, l = high[-n_tr:], low[-n_tr:]
+        pc = close[-n_tr - 1:-1]
+        tr = np.nanmax(np.vstack([h - l, np.abs(h - pc), np.abs(l - pc)]), axis=0)
+        stan.atr = _OknoSumy(n_tr, tr.tolist())
+
+        stan.nachylenie_szybkiej = _OknoRegresji(okres, df['SMA50'].to_numpy(dtype=np.float64)[-okres:].tolist())
+        stan.nachylenie_wolnej = _OknoRegresji(okres, df['SMA200'].to_numpy(dtype=np.float64)[-okres:].tolist())
+
+        rs = df['RS_Ratio'].to_numpy(dtype=np.float64)
+        stan.rs_sma = _OknoSumy(50, rs[-50:].tolist())
+        stan.rs_nachylenie = _OknoRegresji(okres, rs[-okres:].tolist())
+
+        # Wolumen (NaN, gdy ramka go nie ma - jak w oblicz_wskazniki)
+        krotki, dlugi = Konfiguracja.OKRES_WOLUMENU, Konfiguracja.OKRES_WOLUMENU_DLUGI
+        vol = df['volume'].to_numpy(dtype=np.float64) if 'volume' in df.columns else np.full(len(df), np.nan)
+        zmiana = np.diff(close, prepend=np.nan)
+        stan.vol_krotki = _OknoSumy(krotki, vol[-krotki:].tolist())
+        stan.vol_dlugi = _OknoSumy(dlugi, vol[-dlugi:].tolist())
+        stan.obrot = _OknoSumy(krotki, (close * vol)[-krotki:].tolist())
+        stan.vol_wzrostow = _OknoSumy(dlugi, np.where(zmiana > 0, vol, 0.0)[-dlugi:].tolist())
+        stan.vol_spadkow = _OknoSumy(dlugi, np.where(zmiana < 0, vol, 0.0)[-dlugi:].tolist())
+        return stan
+
+    # ── Aktualizacja ────────────────────────
+
+    def _okna(self):
+        return (self.sma_szybka, self.sma_wolna, self.atr, self.nachylenie_szybkiej,
+                self.nachylenie_wolnej, self.rs_sma, self.rs_nachylenie, self.vol_krotki,
+                self.vol_dlugi, self.obrot, self.vol_wzrostow, self.vol_spadkow)
+
+    def dodaj_swiece(self, data, high: float, low: float, close: float,
+                     close_benchmarku: Optional[float] = None, wolumen: float = np.nan) -> dict:
+        """
+        Dopisz jedną świecę i zwróć wiersz wskaźników (kolumny jak oblicz_wskazniki).
+
+        Args:
+            data: Data świecy
+            high, low, close: Ceny świecy
+            close_benchmarku: Zamknięcie benchmarku z tej daty (None = brak daty w benchmarku)
+            wolumen: Wolumen świecy (NaN = brak)
+
+        Returns:
+            dict {kolumna: wartość}
+        """
+        high, low, close = np.float64(high), np.float64(low), np.float64(close)
+        poprzednie = self.zamkniecia[-1]
+        tr = max(high - low, abs(high - poprzednie), abs(low - poprzednie))
+
+        self.zamkniecia.append(float(close))
+        self.sma_szybka.dodaj(close)
+        self.sma_wolna.dodaj(close)
+        self.atr.dodaj(tr)
+
+        sma50 = self.sma_szybka.srednia()
+        sma200 = self.sma_wolna.srednia()
+        self.nachylenie_szybkiej.dodaj(sma50)
+        self.nachylenie_wolnej.dodaj(sma200)
+
+        atr = self.atr.srednia()
+
+        def momentum(okres):
+            if len(self.zamkniecia) <= okres:
+                return np.nan
+            return close / self.zamkniecia[-1 - okres] - 1
+
+        wiersz = {
+            'SMA50': sma50,
+            'SMA200': sma200,
+            'Dist_SMA50': (close - sma50) / sma50 * 100,
+            'Dist_SMA200': (close - sma200) / sma200 * 100,
+            'SMA50_Slope': self.nachylenie_szybkiej.nachylenie(),
+            'SMA200_Slope': self.nachylenie_wolnej.nachylenie(),
+            'ATR14': atr,
+            'ATR_Pct': atr / close * 100,
+            'Mom3M': momentum(Konfiguracja.MOMENTUM_KROTKIE),
+            'Mom6M': momentum(Konfiguracja.MOMENTUM_DLUGIE),
+        }
+
+        if self.rs_aktywny:
+            rs = 1.0 if close_benchmarku is None else close / close_benchmarku
+            self.rs_sma.dodaj(rs)
+            self.rs_nachylenie.dodaj(rs)
+            wiersz.update(RS_Ratio=rs, RS_SMA50=self.rs_sma.srednia(),
+                          RS_Slope=self.rs_nachylenie.nachylenie())
+        else:
+            wiersz.update(RS_Ratio=1.0, RS_SMA50=1.0, RS_Slope=0.0)
+
+        wolumen = np.float64(wolumen)
+        self.vol_krotki.dodaj(wolumen)
+        self.vol_dlugi.dodaj(wolumen)
+        self.obrot.dodaj(close * wolumen)
+        self.vol_wzrostow.dodaj(wolumen if close > poprzednie else 0.0)
+        self.vol_spadkow.dodaj(wolumen if close < poprzednie else 0.0)
+        vol_sma = self.vol_krotki.srednia()
+        spadki = self.vol_spadkow.srednia()
+        wiersz.update(
+            Vol_SMA20=vol_sma,
+            Vol_SMA50=self.vol_dlugi.srednia(),
+            RVol=wolumen / vol_sma,
+            UpDown_Vol=self.vol_wzrostow.srednia() / spadki if spadki > 0 else np.nan,
+            DollarVol20=self.obrot.srednia(),
+        )
+
+        self.liczba_swiec += 1
+        self.ostatnia_data = data
+        self.aktualizacje += 1
+        if self.aktualizacje % self.PRZELICZ_CO == 0:
+            for okno in self._okna():
+                okno.przelicz()
+
+        return wiersz
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from .wskazniki import SilnikWskaznikow
 
@@ -74,3 +75,44 @@ class SilnikStatusu:
         # ===== OUT (DEFAULT) =====
         # Wszystko inne (bear market, brak trendu, itd.)
         return "OUT"
+
+    @staticmethod
+    def kolumna_metryki(metryki: pd.DataFrame, nazwa: str, domyslna) -> np.ndarray:
+        """
+        Kolumna macierzy metryk jako float64 - brak kolumny -> wartość domyślna
+        (jak wiersz.get(nazwa, domyslna); NaN zostaje NaN).
+        """
+        if nazwa in metryki.columns:
+            return metryki[nazwa].to_numpy(dtype=np.float64)
+        return np.full(len(metryki), domyslna, dtype=np.float64)
+
+    @staticmethod
+    def okresl_status_wsadowo(metryki: pd.DataFrame) -> np.ndarray:
+        """
+        okresl_status dla całego uniwersum naraz.
+
+        Args:
+            metryki: DataFrame (tykery x metryki) - ostatnie wartości wskaźników,
+                kolumny jak w wierszu oblicz_wskazniki (close, SMA200, SMA50, ...)
+
+        Returns:
+            np.ndarray: statusy (TRADEABLE / SETUP / OUT) w kolejności wierszy
+        """
+        kolumna = SilnikStatusu.kolumna_metryki
+        cena = metryki['close'].to_numpy(dtype=np.float64)
+        sma200 = kolumna(metryki, 'SMA200', 0)
+        sma50 = kolumna(metryki, 'SMA50', 0)
+        slope200 = kolumna(metryki, 'SMA200_Slope', 0)
+        rs_slope = kolumna(metryki, 'RS_Slope', 0)
+        rs_ratio = kolumna(metryki, 'RS_Ratio', 0)
+        rs_ma = kolumna(metryki, 'RS_SMA50', 0)
+
+        # Gating: Close > SMA200 ORAZ SMA200_slope > 0, inaczej OUT
+        trend = (cena > sma200) & (slope200 > 0)
+
+        rs_ratio_strong = np.where(rs_ma > 0, rs_ratio > rs_ma, rs_ratio > 1.0)
+        rs_silne = (rs_slope > 0) | rs_ratio_strong
+        jest_tradeable = trend & (cena > sma50) & rs_silne
+
+        # SETUP: trend jest (slope > 0 zawiera slope >= 0), ale brakuje Close > SMA50 lub siły RS
+        return np.where(jest_tradeable, "TRADEABLE", np.where(trend, "SETUP", "OUT")).astype(object)
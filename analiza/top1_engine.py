@@ -1,7 +1,8 @@
 import pandas as pd
 from .entry_engine import SilnikWejscia
 from .penalty_engine import SilnikKar
-from .wskazniki import SilnikWskaznikow
+from .panel_wskaznikow import PanelWskaznikow
+from .kernele import last_max
 from konfiguracja import Konfiguracja
 
 class SilnikDecyzyjny:
@@ -43,13 +44,16 @@ class SilnikDecyzyjny:
             }
 
         kandydaci = []
+
+        # Wskaźniki pełnej historii dla tykerów bez kolumn - całe uniwersum naraz (nowe ramki)
+        bez_wskaznikow = {t: df for t, df in dane_tykerow.items()
+                          if len(df) >= 200 and 'SMA200_Slope' not in df.columns}
+        if bez_wskaznikow:
+            dane_tykerow = {**dane_tykerow, **PanelWskaznikow.oblicz(bez_wskaznikow, market_df)}
         
         for tyker, df in dane_tykerow.items():
             if df.empty or len(df) < 200: continue
             
-            # Wskaźniki
-            if 'SMA200_Slope' not in df.columns:
-                 df = SilnikWskaznikow.oblicz_wskazniki(df, market_df)
             ostatni = df.iloc[-1]
             
             # 2. Trend Gate (Per Ticker)
@@ -67,7 +71,7 @@ class SilnikDecyzyjny:
             if not rs_ok: continue
             
             # - 6M Drawdown < 35%
-            max_6m = df['high'].rolling(126).max().iloc[-1]
+            max_6m = last_max(df['high'], 126)
             dd = (max_6m - ostatni['close']) / max_6m * 100
             if dd > 35: continue
 
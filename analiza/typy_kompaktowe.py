@@ -0,0 +1,75 @@
+"""
+TypyKompaktowe - zwarte typy danych dla ramek wskaźników i wyników rankingu.
+
+Włączane przez Konfiguracja.TRYB_KOMPAKTOWY:
+  - kolumny wskaźników      float64 -> float32
+  - Status / Tier / Tyker    str     -> category
+  - ChecklistScore           int64   -> int8
+
+Wskaźniki są zawsze liczone w float64, a do float32 rzutowany jest dopiero wynik.
+Tolerancja względem float64: błąd względny pojedynczej wartości <= 2**-24 (~6e-8,
+TOLERANCJA_FLOAT32). Porównania z progami (np. SLOPE_RISING_THRESHOLD) mogą dać inny
+wynik tylko dla wartości leżących w tej odległości od progu. OHLCV zostają bez zmian.
+"""
+
+import numpy as np
+import pandas as pd
+
+from konfiguracja import Konfiguracja
+
+
+class TypyKompaktowe:
+    """
+    Rzutowanie ramek na zwarte typy (połowa pamięci kolumn liczbowych).
+    """
+
+    TOLERANCJA_FLOAT32 = float(np.finfo(np.float32).eps) / 2
+
+    # Kolejność kategorii = kolejność sortowania rankingu
+    KATEGORIE_STATUSU = ('TRADEABLE', 'SETUP', 'OUT')
+    KATEGORIE_TIERU = ('A', 'B', 'C', 'D')
+
+    KOLUMNY_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+    @staticmethod
+    def wlaczony() -> bool:
+        return bool(getattr(Konfiguracja, 'TRYB_KOMPAKTOWY', False))
+
+    @staticmethod
+    def kompaktuj_wskazniki(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Kolumny wskaźników float64 -> float32 (w miejscu, jak oblicz_wskazniki).
+
+        Args:
+            df: Ramka z kolumnami OHLCV i wskaźników
+
+        Returns:
+            pd.DataFrame: ta sama ramka
+        """
+        for kolumna in df.columns:
+            if kolumna not in TypyKompaktowe.KOLUMNY_OHLCV and df[kolumna].dtype == np.float64:
+                df[kolumna] = df[kolumna].astype(np.float32)
+        return df
+
+    @staticmethod
+    def kompaktuj_ranking(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wynik generuj_ranking w zwartych typach (Tyker/Status/Tier - category,
+        ChecklistScore - int8, pozostałe liczby - float32).
+        """
+        if df.empty:
+            return df
+
+        df = df.copy()
+        for kolumna in df.columns:
+            if kolumna == 'Status':
+                df[kolumna] = pd.Categorical(df[kolumna], categories=TypyKompaktowe.KATEGORIE_STATUSU)
+            elif kolumna == 'Tier':
+                df[kolumna] = pd.Categorical(df[kolumna], categories=TypyKompaktowe.KATEGORIE_TIERU)
+            elif kolumna == 'Tyker':
+                df[kolumna] = df[kolumna].astype('category')
+            elif kolumna == 'ChecklistScore':
+                df[kolumna] = df[kolumna].astype(np.int8)
+            elif pd.api.types.is_float_dtype(df[kolumna]):
+                df[kolumna] = df[kolumna].astype(np.float32)
+        return df
@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from enum import Enum
 from konfiguracja import Konfiguracja
+from .graf_wskaznikow import GrafWskaznikow
+from .kernele import rolling_percentile_rank
 
 
 class VolatilityRegime(Enum):
@@ -39,18 +41,8 @@ class VolatilityMetrics:
         if df.empty or 'high' not in df.columns or 'low' not in df.columns:
             return pd.Series(0.0, index=df.index)
 
-        # Obliczanie True Range
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-
-        # ATR = EMA(True Range) - Exponential Moving Average
-        atr = true_range.ewm(span=period, adjust=False).mean()
-
-        return atr
+        # ATR = EMA(True Range) - TR współdzielony z SilnikWskaznikow przez graf ramki
+        return GrafWskaznikow.dla(df)[f'ATR{period}_ewm']
 
     @staticmethod
     def calculate_atr_percentile(df: pd.DataFrame, atr_column: str = 'ATR14',
@@ -73,18 +65,10 @@ class VolatilityMetrics:
         if atr_column not in df.columns or df.empty:
             return pd.Series(0.0, index=df.index)
 
-        # Obliczanie percentile na rolling oknie
-        def percentile_rank(x):
-            """Zwraca percentyl wartości ostatniej w oknie"""
-            if len(x) == 0:
-                return 0.0
-            last_val = x.iloc[-1]
-            # Percentyl: ile % wartości w oknie jest <= last_val
-            percentile = (x <= last_val).sum() / len(x) * 100
-            return percentile
-
-        atr_percentile = df[atr_column].rolling(window=lookback).apply(
-            percentile_rank, raw=False
+        # Percentyl: ile % wartości w oknie jest <= ostatniej wartości okna
+        atr_percentile = pd.Series(
+            rolling_percentile_rank(df[atr_column], lookback),
+            index=df.index, name=atr_column
         )
 
         return atr_percentile
@@ -187,11 +171,10 @@ class VolatilityMetrics:
                 atr_pct = (latest_atr / df['close'].iloc[-1]) * 100 if df['close'].iloc[-1] != 0 else 0.0
                 result['atr_pct'] = atr_pct
 
-                # ATR percentile (1 rok = 252 dni)
-                df['ATR14'] = atr
-                atr_pct_series = VolatilityMetrics.calculate_atr_as_percent(df, 'ATR14')
+                # ATR percentile (1 rok = 252 dni) - na osobnej ramce, df wywołującego
+                # (w tym ATR14 z SilnikWskaznikow) zostaje bez zmian
                 atr_percentile = VolatilityMetrics.calculate_atr_percentile(
-                    df[['ATR14']].assign(ATR14_pct=atr_pct_series),
+                    atr.to_frame('ATR14'),
                     'ATR14',
                     lookback=252
                 )
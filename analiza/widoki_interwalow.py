@@ -0,0 +1,142 @@
+"""
+WidokiInterwalow - wspólny cache widoków tygodniowych i miesięcznych jednej ramki.
+
+Konsument prosi o widok interwału, np.:
+    widoki = WidokiInterwalow.dla(df)
+    tydzien = widoki['W']                        # OHLCV + kolumny wskaźników (ostatnia wartość)
+    nachylenie = widoki.nachylenie('W', 'SMA200', 20)
+
+Resample robiony jest raz na ramkę, a SlopeMetrics.calculate_multi_slope,
+RankingEngine.calculate_composite_score i SilnikRezimu.detect_regime korzystają
+z tego samego wyniku. Gdy zmieniła się tylko ostatnia świeca (dopisana lub
+poprawiona w miejscu), przeliczany jest wyłącznie ostatni okres widoku.
+
+Agregacja: open - first, high - max, low - min, close - last, volume - sum,
+pozostałe kolumny (wskaźniki) - last. Okresy bez świec są pomijane.
+"""
+
+import weakref
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .kernele import rolling_slope
+
+
+class WidokiInterwalow:
+    """
+    Widoki interwałów jednej ramki z pamięcią wyników.
+    """
+
+    # Nazwa interwału -> reguła resample (zakotwiczone, przedziały domknięte z prawej)
+    INTERWALY = {
+        'W': 'W',
+        'M': pd.offsets.MonthEnd(),
+    }
+
+    AGREGACJA_OHLCV = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+    # Zapamiętane widoki: id(ramki) -> WidokiInterwalow (wpis usuwany, gdy ramka znika z pamięci)
+    _widoki: Dict[int, 'WidokiInterwalow'] = {}
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = weakref.ref(df)
+        self._wyniki: Dict[str, pd.DataFrame] = {}
+        self._nachylenia: Dict[tuple, float] = {}
+        self._zapamietaj(df)
+
+    def _zapamietaj(self, df: pd.DataFrame):
+        self._dlugosc = len(df)
+        self._kolumny = tuple(df.columns)
+        self._ostatnia_data = df.index[-1] if len(df) else None
+        self._ostatni_wiersz = df.iloc[-1].copy() if len(df) else None
+
+    @classmethod
+    def dla(cls, df: pd.DataFrame) -> 'WidokiInterwalow':
+        """Widoki przypisane do ramki (aktualizowane, gdy zmieniła się jej końcówka)."""
+        klucz = id(df)
+        widoki = cls._widoki.get(klucz)
+        if widoki is not None and widoki._df() is df:
+            widoki._odswiez(df)
+            return widoki
+
+        weakref.finalize(df, cls._widoki.pop, klucz, None)
+        widoki = cls(df)
+        cls._widoki[klucz] = widoki
+        return widoki
+
+    # ── Dostęp ──────────────────────────────
+
+    def __getitem__(self, interwal: str) -> pd.DataFrame:
+        wynik = self._wyniki.get(interwal)
+        if wynik is None:
+            df = self._ramka()
+            wynik = self._resample(df, interwal)
+            self._wyniki[interwal] = wynik
+        return wynik
+
+    def tygodniowy(self) -> pd.DataFrame:
+        return self['W']
+
+    def miesieczny(self) -> pd.DataFrame:
+        return self['M']
+
+    def nachylenie(self, interwal: str, kolumna: str, okno: int) -> float:
+        """
+        Ostatnie nachylenie (kernele.rolling_slope) kolumny widoku bez wierszy NaN.
+
+        Returns:
+            float: nachylenie lub NaN, gdy widok jest krótszy niż okno
+        """
+        klucz = (interwal, kolumna, okno)
+        wynik = self._nachylenia.get(klucz)
+        if wynik is None:
+            seria = self[interwal][kolumna].dropna()
+            wynik = float(rolling_slope(seria, okno)[-1]) if len(seria) >= okno else np.nan
+            self._nachylenia[klucz] = wynik
+        return wynik
+
+    def _ramka(self) -> pd.DataFrame:
+        df = self._df()
+        if df is None:
+            raise ReferenceError("Ramka widoków interwałów nie istnieje")
+        return df
+
+    # ── Obliczenia ──────────────────────────
+
+    def _resample(self, df: pd.DataFrame, interwal: str) -> pd.DataFrame:
+        if interwal not in self.INTERWALY:
+            raise KeyError(f"Nieznany interwał: {interwal}")
+        agregacja = {k: self.AGREGACJA_OHLCV.get(k, 'last') for k in df.columns}
+        wynik = df.resample(self.INTERWALY[interwal]).agg(agregacja)
+        # Okresy bez świec (święta, luki w notowaniach)
+        liczba = df.index.to_series().resample(self.INTERWALY[interwal]).count()
+        return wynik[liczba.to_numpy() > 0]
+
+    def _odswiez(self, df: pd.DataFrame):
+        """Aktualizacja po zmianie końcówki ramki: przeliczany jest tylko ostatni okres."""
+        if len(df) == self._dlugosc and (not len(df) or (
+                df.index[-1] == self._ostatnia_data and df.iloc[-1].equals(self._ostatni_wiersz))):
+            if tuple(df.columns) == self._kolumny:
+                return
+
+        tylko_koniec = (
+            tuple(df.columns) == self._kolumny
+            and self._dlugosc > 0
+            and len(df) >= self._dlugosc
+            and df.index[self._dlugosc - 1] == self._ostatnia_data
+        )
+        wyniki = {}
+        if tylko_koniec:
+            for interwal, widok in self._wyniki.items():
+                if len(widok) < 2:
+                    continue
+                # Świece po przedostatnim okresie -> ostatni okres widoku i ewentualne nowe
+                granica = widok.index[-2]
+                ogon = df.loc[df.index > granica]
+                wyniki[interwal] = pd.concat([widok.iloc[:-1], self._resample(ogon, interwal)])
+
+        self._wyniki = wyniki
+        self._nachylenia = {}
+        self._zapamietaj(df)
@@ -1,26 +1,45 @@
 import pandas as pd
 import numpy as np
 from konfiguracja import Konfiguracja
+from .graf_wskaznikow import GrafWskaznikow
+from .kalendarz_benchmarku import KalendarzBenchmarku
+from .kernele import linear_slope, rolling_slope
 
 class SilnikWskaznikow:
+    # Polskie nazwy kolumn OHLCV -> angielskie (używane wewnątrz pandas)
+    MAPA_KOLUMN = {
+        'zamkniecie': 'close',
+        'otwarcie': 'open',
+        'najwyzszy': 'high',
+        'najnizszy': 'low',
+        'wolumen': 'volume'
+    }
+    KOLUMNY_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+    # Analityka wolumenu (okna Konfiguracja.OKRES_WOLUMENU / OKRES_WOLUMENU_DLUGI)
+    KOLUMNY_WOLUMENU = ('Vol_SMA20', 'Vol_SMA50', 'RVol', 'UpDown_Vol', 'DollarVol20')
+    # Kolumny wskaźników w kolejności oblicz_wskazniki
+    KOLUMNY_WSKAZNIKOW = (
+        'SMA50', 'SMA200', 'Dist_SMA50', 'Dist_SMA200', 'SMA50_Slope', 'SMA200_Slope',
+        'ATR14', 'ATR_Pct', 'Mom3M', 'Mom6M', 'RS_Ratio', 'RS_SMA50', 'RS_Slope',
+    ) + KOLUMNY_WOLUMENU
+
+    @staticmethod
+    def normalizuj_kolumny(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Zwraca DataFrame z angielskimi nazwami kolumn OHLCV.
+
+        Przy polskich nazwach rename tworzy nową ramkę, ale przy copy-on-write
+        (pandas >= 3, requirements.txt) kolumny współdzielą pamięć z df.
+        """
+        if 'zamkniecie' in df.columns:
+            return df.rename(columns=SilnikWskaznikow.MAPA_KOLUMN)
+        return df
+
     @staticmethod
     def oblicz_nachylenie(czesc_serii):
         """Oblicza nachylenie (slope) regresji liniowej znormalizowane do ceny."""
-        y = czesc_serii.values
-        x = np.arange(len(y))
-        
-        # Prosta regresja liniowa: y = mx + c
-        # m = slope
-        try:
-            m, c = np.polyfit(x, y, 1)
-            # Normalizacja: % zmiany na dzień w okresie regresji
-            # Aby to było porównywalne, dzielimy przez średnią cenę z okresu
-            srednia_cena = np.mean(y)
-            if srednia_cena == 0: return 0
-            scaled_slope = (m / srednia_cena) * 100
-            return scaled_slope
-        except:
-            return 0.0
+        # Normalizacja: % zmiany na dzień w okresie regresji (m / średnia cena * 100)
+        return linear_slope(czesc_serii)
 
     @staticmethod
     def oblicz_wskazniki(df: pd.DataFrame, benchmark_df: pd.DataFrame = None) -> pd.DataFrame:
@@ -28,93 +47,256 @@ class SilnikWskaznikow:
         Oblicza SMA, ATR, Momentum, RS oraz metryki Slope.
         Wymaga DataFrame z indeksem DateTime i kolumnami 'close', 'high', 'low'.
         Używamy angielskich nazw kolumn wewnątrz pandas dla kompatybilności.
+
+        Kontrakt mutacji: kolumny wskaźników są dopisywane do df W MIEJSCU (widoki bloku
+        z oblicz_kolumny, bez kopiowania). Dla polskich nazw kolumn zwracana jest ramka
+        z angielskimi nazwami współdzieląca dane OHLCV z wejściem - wejście się nie zmienia.
+        Kto nie chce modyfikować ramki, używa oblicz_kolumny.
         """
         if df.empty:
             return df
-        
+
         # Dostosowanie nazw jeśli przyszły polskie
-        if 'zamkniecie' in df.columns:
-            df = df.rename(columns={
-                'zamkniecie': 'close', 
-                'otwarcie': 'open', 
-                'najwyzszy': 'high', 
-                'najnizszy': 'low', 
-                'wolumen': 'volume'
-            })
-
-        # SMA
-        df['SMA50'] = df['close'].rolling(window=Konfiguracja.SMA_SZYBKA).mean()
-        df['SMA200'] = df['close'].rolling(window=Konfiguracja.SMA_WOLNA).mean()
-        
-        # Distance Metrics (%)
-        df['Dist_SMA50'] = ((df['close'] - df['SMA50']) / df['SMA50']) * 100
-        df['Dist_SMA200'] = ((df['close'] - df['SMA200']) / df['SMA200']) * 100
-        
-        # SMA Slopes (Regresja)
-        # To jest kosztowne obliczeniowo, więc robimy to efektywnie używając rolling_apply
-        # lub uproszczoną metodę (różnica), ale prompt prosił o regresję.
-        # Dla wydajności w pandasie użyjemy sztuczki z wektorami lub rolling apply.
-        
-        okres_nachylenia = Konfiguracja.OKRES_NACHYLENIA
-        
-        def calc_slope(x):
-            return SilnikWskaznikow.oblicz_nachylenie(x)
-
-        # Używamy rolling().apply() dla SMA200 (ale to może być wolne na dużych danych)
-        # Optymalizacja: Slope SMA200 to trend samej średniej.
-        # Jeśli Prompt chce slope ceny, czy slope średniej? "SMA200 slope" sugeruje nachylenie Linii Średniej.
-        # Więc liczymy regresję na wartościach SMA200.
-        
-        # Aby przyspieszyć, policzmy na ostatnich 252 dniach tylko, jeśli to live view. 
-        # Ale tu robimy backfill. Rolling apply jest ok dla kilku tysięcy wierszy.
-        
-        if len(df) > okres_nachylenia + 200:
-            df['SMA50_Slope'] = df['SMA50'].rolling(window=okres_nachylenia).apply(calc_slope, raw=False)
-            df['SMA200_Slope'] = df['SMA200'].rolling(window=okres_nachylenia).apply(calc_slope, raw=False)
-        else:
-            df['SMA50_Slope'] = 0.0
-            df['SMA200_Slope'] = 0.0
-
-        # ATR
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        df['ATR14'] = true_range.rolling(window=Konfiguracja.OKRES_ATR).mean()
-        df['ATR_Pct'] = (df['ATR14'] / df['close']) * 100
-
-        # Momentum
-        df['Mom3M'] = df['close'].pct_change(periods=Konfiguracja.MOMENTUM_KROTKIE)
-        df['Mom6M'] = df['close'].pct_change(periods=Konfiguracja.MOMENTUM_DLUGIE)
-
-        # Initialize RS columns with defaults (before benchmark calculation)
-        # This ensures columns ALWAYS exist even if benchmark fails to load
-        df['RS_Ratio'] = 1.0        # Neutral performance vs benchmark
-        df['RS_SMA50'] = 1.0         # Neutral SMA
-        df['RS_Slope'] = 0.0         # No trend
-
-        # Relative Strength vs Benchmark (will overwrite defaults if benchmark available)
-        if benchmark_df is not None and not benchmark_df.empty:
-            # Upewnij się co do nazw kolumn benchmarku
-            if 'zamkniecie' in benchmark_df.columns:
-                benchmark_df = benchmark_df.rename(columns={'zamkniecie': 'close'})
-
-            wspolny_indeks = df.index.intersection(benchmark_df.index)
-            if not wspolny_indeks.empty:
-                ceny = df.loc[wspolny_indeks, 'close']
-                ceny_bench = benchmark_df.loc[wspolny_indeks, 'close']
-                
-                rs_ratio = ceny / ceny_bench
-                
-                df.loc[wspolny_indeks, 'RS_Ratio'] = rs_ratio
-                df['RS_SMA50'] = df['RS_Ratio'].rolling(window=50).mean()
-                
-                # RS Slope (20 sesji)
-                df['RS_Slope'] = df['RS_Ratio'].rolling(window=okres_nachylenia).apply(calc_slope, raw=False)
-        
+        df = SilnikWskaznikow.normalizuj_kolumny(df)
+        kolumny = SilnikWskaznikow.oblicz_kolumny(df, benchmark_df)
+        df[list(kolumny.columns)] = kolumny
         return df
 
+    @staticmethod
+    def oblicz_kolumny(df: pd.DataFrame, benchmark_df: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Kolumny wskaźników oblicz_wskazniki w osobnej ramce (sidecar) - df nie jest modyfikowany.
+
+        Wyniki trafiają do jednego prealokowanego bloku float64 (świece x KOLUMNY_WSKAZNIKOW),
+        który jest opakowywany w DataFrame bez kopii. Ramka ma indeks df i nie zawiera OHLCV.
+        """
+        nazwy = SilnikWskaznikow.KOLUMNY_WSKAZNIKOW
+        blok = np.empty((len(df), len(nazwy)))
+        if df.empty:
+            return pd.DataFrame(blok, index=df.index, columns=list(nazwy), copy=False)
+        pozycja = {nazwa: j for j, nazwa in enumerate(nazwy)}
+
+        def zapisz(nazwa, wartosci):
+            blok[:, pozycja[nazwa]] = wartosci
+
+        def kolumna(nazwa):
+            return blok[:, pozycja[nazwa]]
+
+        # Dostosowanie nazw jeśli przyszły polskie (bez kopii danych)
+        df = SilnikWskaznikow.normalizuj_kolumny(df)
+        close = df['close'].to_numpy(dtype=np.float64)
+
+        # Wielkości pośrednie (TR, SMA, ...) z grafu ramki, jeśli inny moduł już go zbudował;
+        # inaczej graf żyje tylko w tym wywołaniu - wyniki i tak trafiają do bloku
+        graf = GrafWskaznikow.zapamietany(df) or GrafWskaznikow(df)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # SMA
+            zapisz('SMA50', graf[f'SMA_{Konfiguracja.SMA_SZYBKA}'])
+            zapisz('SMA200', graf[f'SMA_{Konfiguracja.SMA_WOLNA}'])
+
+            # Distance Metrics (%)
+            zapisz('Dist_SMA50', (close - kolumna('SMA50')) / kolumna('SMA50') * 100)
+            zapisz('Dist_SMA200', (close - kolumna('SMA200')) / kolumna('SMA200') * 100)
+
+            # SMA Slopes (Regresja)
+            # Nachylenie linii średniej (nie ceny) - regresja na wartościach SMA,
+            # liczona kernelem rolling_slope dla wszystkich okien naraz.
+            okres_nachylenia = Konfiguracja.OKRES_NACHYLENIA
+
+            if len(df) > okres_nachylenia + Konfiguracja.SMA_WOLNA:
+                zapisz('SMA50_Slope', rolling_slope(kolumna('SMA50'), okres_nachylenia))
+                zapisz('SMA200_Slope', rolling_slope(kolumna('SMA200'), okres_nachylenia))
+            else:
+                zapisz('SMA50_Slope', 0.0)
+                zapisz('SMA200_Slope', 0.0)
+
+            # ATR (średnia krocząca True Range)
+            zapisz('ATR14', graf[f'ATR{Konfiguracja.OKRES_ATR}_sma'])
+            zapisz('ATR_Pct', kolumna('ATR14') / close * 100)
+
+            # Momentum
+            zapisz('Mom3M', df['close'].pct_change(periods=Konfiguracja.MOMENTUM_KROTKIE))
+            zapisz('Mom6M', df['close'].pct_change(periods=Konfiguracja.MOMENTUM_DLUGIE))
+
+            # Initialize RS columns with defaults (before benchmark calculation)
+            # This ensures columns ALWAYS exist even if benchmark fails to load
+            zapisz('RS_Ratio', 1.0)        # Neutral performance vs benchmark
+            zapisz('RS_SMA50', 1.0)         # Neutral SMA
+            zapisz('RS_Slope', 0.0)         # No trend
+
+            # Relative Strength vs Benchmark (will overwrite defaults if benchmark available)
+            rs_ratio = None
+            kalendarz = KalendarzBenchmarku.dla(benchmark_df) if KalendarzBenchmarku.obslugiwany(df.index) else None
+            if kalendarz is not None:
+                # Wyrównanie po pozycji w kalendarzu benchmarku (przygotowanym raz na skan)
+                pozycje, obecne = kalendarz.pozycje(df.index)
+                if obecne.any():
+                    rs_ratio = np.ones(len(df))
+                    rs_ratio[obecne] = close[obecne] / kalendarz.close[pozycje[obecne]]
+            elif benchmark_df is not None and not benchmark_df.empty:
+                # Upewnij się co do nazw kolumn benchmarku
+                if 'zamkniecie' in benchmark_df.columns:
+                    benchmark_df = benchmark_df.rename(columns={'zamkniecie': 'close'})
+
+                wspolny_indeks = df.index.intersection(benchmark_df.index)
+                if not wspolny_indeks.empty:
+                    ceny = df.loc[wspolny_indeks, 'close']
+                    ceny_bench = benchmark_df.loc[wspolny_indeks, 'close']
+
+                    rs = pd.Series(1.0, index=df.index)
+                    rs.loc[wspolny_indeks] = ceny / ceny_bench
+                    rs_ratio = rs.to_numpy()
+
+            if rs_ratio is not None:
+                zapisz('RS_Ratio', rs_ratio)
+                zapisz('RS_SMA50', pd.Series(rs_ratio).rolling(window=50).mean())
+
+                # RS Slope (20 sesji)
+                zapisz('RS_Slope', rolling_slope(rs_ratio, okres_nachylenia))
+
+            # Wolumen (płynność, siła wybicia) - NaN, gdy ramka nie ma kolumny volume
+            SilnikWskaznikow._wolumen(df, graf, zapisz)
+
+        return pd.DataFrame(blok, index=df.index, columns=list(nazwy), copy=False)
+
+    @staticmethod
+    def _wolumen(df: pd.DataFrame, graf: GrafWskaznikow, zapisz):
+        """Średni wolumen, RVol, wolumen wzrostów / spadków i średni obrót w $."""
+        if 'volume' not in df.columns:
+            for kolumna in SilnikWskaznikow.KOLUMNY_WOLUMENU:
+                zapisz(kolumna, np.nan)
+            return
+        krotki, dlugi = Konfiguracja.OKRES_WOLUMENU, Konfiguracja.OKRES_WOLUMENU_DLUGI
+        vol_sma = graf[f'VOL_SMA_{krotki}']
+        zapisz('Vol_SMA20', vol_sma)
+        zapisz('Vol_SMA50', graf[f'VOL_SMA_{dlugi}'])
+        zapisz('RVol', df['volume'] / vol_sma)
+        zapisz('UpDown_Vol', graf[f'UPDOWN_VOL_{dlugi}'])
+        zapisz('DollarVol20', graf[f'DOLLAR_VOL_{krotki}'])
+
+    @staticmethod
+    def minimalny_ogon() -> int:
+        """Świece potrzebne do policzenia ostatniego wiersza (SMA200 z 20 wartości do nachylenia + 1)."""
+        okres = Konfiguracja.OKRES_NACHYLENIA
+        return max(
+            Konfiguracja.SMA_WOLNA + okres + 1,
+            Konfiguracja.MOMENTUM_DLUGIE + 1,
+            50 + okres,
+            Konfiguracja.OKRES_ATR + 1,
+            Konfiguracja.OKRES_WOLUMENU_DLUGI + 1,
+        )
+
+    @staticmethod
+    def oblicz_ostatnie(df: pd.DataFrame, benchmark_df: pd.DataFrame = None) -> pd.Series:
+        """
+        Tylko ostatni wiersz oblicz_wskazniki (status, checklista, skaner).
+
+        Liczone są wyłącznie końcowe wartości każdego wskaźnika z minimalnego ogona
+        historii - koszt nie zależy od długości historii. Wynik odpowiada
+        oblicz_wskazniki(df, benchmark_df).iloc[-1]; pełna historia kolumn jest
+        potrzebna tylko do wykresów i backtestów.
+
+        Returns:
+            pd.Series: OHLCV + kolumny wskaźników ostatniej świecy (pusta dla pustego df)
+        """
+        if df.empty:
+            return pd.Series(dtype=np.float64)
+
+        df = SilnikWskaznikow.normalizuj_kolumny(df)
+        n = len(df)
+        ogon = df.iloc[-SilnikWskaznikow.minimalny_ogon():]
+        close = ogon['close'].to_numpy(dtype=np.float64)
+        high = ogon['high'].to_numpy(dtype=np.float64)
+        low = ogon['low'].to_numpy(dtype=np.float64)
+        okres = Konfiguracja.OKRES_NACHYLENIA
+        c = close[-1]
+
+        def srednia(wartosci, okno):
+            return wartosci[-okno:].mean() if len(wartosci) >= okno else np.nan
+
+        def nachylenie(wartosci):
+            return rolling_slope(wartosci[-okres:], okres)[-1] if len(wartosci) >= okres else np.nan
+
+        def sma_ostatnie(okno):
+            """Ostatnie `okres` wartości SMA (do nachylenia)."""
+            if len(close) < okno:
+                return np.full(okres, np.nan)
+            return np.lib.stride_tricks.sliding_window_view(close, okno)[-okres:].mean(axis=1)
+
+        wiersz = df.iloc[-1].copy()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sma50 = srednia(close, Konfiguracja.SMA_SZYBKA)
+            sma200 = srednia(close, Konfiguracja.SMA_WOLNA)
+            wiersz['SMA50'] = sma50
+            wiersz['SMA200'] = sma200
+            wiersz['Dist_SMA50'] = (c - sma50) / sma50 * 100
+            wiersz['Dist_SMA200'] = (c - sma200) / sma200 * 100
+
+            if n > okres + Konfiguracja.SMA_WOLNA:
+                wiersz['SMA50_Slope'] = nachylenie(sma_ostatnie(Konfiguracja.SMA_SZYBKA))
+                wiersz['SMA200_Slope'] = nachylenie(sma_ostatnie(Konfiguracja.SMA_WOLNA))
+            else:
+                wiersz['SMA50_Slope'] = 0.0
+                wiersz['SMA200_Slope'] = 0.0
+
+            # ATR - TR ostatnich OKRES_ATR świec (pierwsza świeca historii bez poprzedniego zamknięcia)
+            n_atr = Konfiguracja.OKRES_ATR
+            h, l = high[-n_atr:], low[-n_atr:]
+            pc = np.concatenate(([np.nan], close[:-1]))[-n_atr:]
+            tr = np.nanmax(np.vstack([h - l, np.abs(h - pc), np.abs(l - pc)]), axis=0)
+            atr = tr.mean() if len(tr) >= n_atr else np.nan
+            wiersz['ATR14'] = atr
+            wiersz['ATR_Pct'] = atr / c * 100
+
+            for kolumna, p in (('Mom3M', Konfiguracja.MOMENTUM_KROTKIE), ('Mom6M', Konfiguracja.MOMENTUM_DLUGIE)):
+                wiersz[kolumna] = c / close[-1 - p] - 1 if len(close) > p else np.nan
+
+            wiersz['RS_Ratio'] = 1.0
+            wiersz['RS_SMA50'] = 1.0
+            wiersz['RS_Slope'] = 0.0
+            rs = None
+            kalendarz = KalendarzBenchmarku.dla(benchmark_df) if KalendarzBenchmarku.obslugiwany(df.index) else None
+            if kalendarz is not None:
+                pozycje, wspolne = kalendarz.pozycje(ogon.index)
+                # RS liczony, gdy w CAŁEJ historii są wspólne daty (jak w oblicz_wskazniki)
+                if wspolne.any() or kalendarz.ma_wspolne(df.index):
+                    rs = np.ones(len(ogon))
+                    rs[wspolne] = close[wspolne] / kalendarz.close[pozycje[wspolne]]
+            elif benchmark_df is not None and not benchmark_df.empty:
+                if 'zamkniecie' in benchmark_df.columns:
+                    benchmark_df = benchmark_df.rename(columns={'zamkniecie': 'close'})
+                bench = benchmark_df['close']
+                wspolne = ogon.index.isin(bench.index)
+                if wspolne.any() or df.index.isin(bench.index).any():
+                    rs = np.ones(len(ogon))
+                    rs[wspolne] = close[wspolne] / bench.loc[ogon.index[wspolne]].to_numpy(dtype=np.float64)
+
+            if rs is not None:
+                wiersz['RS_Ratio'] = rs[-1]
+                wiersz['RS_SMA50'] = srednia(rs, 50)
+                wiersz['RS_Slope'] = nachylenie(rs)
+
+            if 'volume' in ogon.columns:
+                krotki, dlugi = Konfiguracja.OKRES_WOLUMENU, Konfiguracja.OKRES_WOLUMENU_DLUGI
+                vol = ogon['volume'].to_numpy(dtype=np.float64)
+                zmiana = np.diff(close, prepend=np.nan)
+                wzrosty = np.where(zmiana > 0, vol, 0.0)
+                spadki = np.where(zmiana < 0, vol, 0.0)
+                suma_spadkow = spadki[-dlugi:].sum() if len(vol) >= dlugi else np.nan
+
+                wiersz['Vol_SMA20'] = srednia(vol, krotki)
+                wiersz['Vol_SMA50'] = srednia(vol, dlugi)
+                wiersz['RVol'] = vol[-1] / wiersz['Vol_SMA20']
+                wiersz['UpDown_Vol'] = wzrosty[-dlugi:].sum() / suma_spadkow if suma_spadkow > 0 else np.nan
+                wiersz['DollarVol20'] = srednia(close * vol, krotki)
+            else:
+                for kolumna in SilnikWskaznikow.KOLUMNY_WOLUMENU:
+                    wiersz[kolumna] = np.nan
+
+        return wiersz
+
     @staticmethod
     def filtruj_stan_nachylenia(wartosc_nachylenia):
         if wartosc_nachylenia > 0.05: return "ROSNĄCY" # Rising
@@ -13,6 +13,7 @@ import numpy as np
 import itertools
 from typing import Optional, Dict, Any, List
 
+from analiza.kernele import sma_bank
 from .strategie import StrategiaTrendMomentum, StrategiaSmaCrossover
 
 # Rejestr dostępnych strategii — klucz = nazwa wyświetlana w UI
@@ -213,6 +214,8 @@ class SilnikBacktestingu:
             siatka_parametrow: {param: [v1, v2, ...]} np. {'sma_fast': [20,50], 'sma_slow': [100,200]}
             callback: Wywoływany po każdej kombinacji dla raportowania postępu.
 
+        Okresy SMA z siatki liczone są raz (_bank_sma).
+
         Returns:
             pd.DataFrame posortowany po sharpe_ratio malejąco.
         """
@@ -221,6 +224,7 @@ class SilnikBacktestingu:
         kombinacje = list(itertools.product(*wartosci))
         total      = len(kombinacje)
         wyniki     = []
+        bank       = SilnikBacktestingu._bank_sma(df_ticker, siatka_parametrow)
 
         for i, combo in enumerate(kombinacje):
             params = dict(zip(klucze, combo))
@@ -230,7 +234,7 @@ class SilnikBacktestingu:
             result = SilnikBacktestingu.uruchom(
                 df_ticker=df_ticker,
                 nazwa_strategii=nazwa_strategii,
-                parametry=params,
+                parametry=dict(params, sma_bank=bank) if bank else params,
                 kapital_poczatkowy=kapital_poczatkowy,
                 df_spy=df_spy,
             )
@@ -247,3 +251,17 @@ class SilnikBacktestingu:
         df_out = df_out.sort_values('sharpe_ratio', ascending=False)
         df_out = df_out.reset_index(drop=True)
         return df_out
+
+    @staticmethod
+    def _bank_sma(df_ticker: pd.DataFrame, siatka_parametrow: Dict[str, List]) -> Optional[Dict[int, np.ndarray]]:
+        """
+        Wszystkie okresy sma_fast / sma_slow z siatki liczone raz (kernele.sma_bank).
+
+        Returns:
+            {okres: np.ndarray} lub None, gdy siatka nie zawiera okresów SMA
+        """
+        okresy = sorted({int(v) for k in ('sma_fast', 'sma_slow') for v in siatka_parametrow.get(k, [])})
+        if not okresy or df_ticker is None or df_ticker.empty:
+            return None
+        kolumny = sma_bank(df_ticker['close'], okresy)
+        return {okres: kolumny[:, j] for j, okres in enumerate(okresy)}
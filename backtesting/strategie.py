@@ -8,6 +8,41 @@ import backtrader as bt
 import backtrader.indicators as btind
 
 
+class SmaZBanku(bt.Indicator):
+    """
+    SMA odczytywana z gotowej tablicy (kernele.sma_bank) zamiast liczona przez backtrader.
+
+    Optymalizacja siatki sma_fast x sma_slow liczy wszystkie okresy raz, z jednej
+    sumy skumulowanej, a każda kombinacja tylko odczytuje swoje kolumny.
+    """
+
+    lines = ('sma',)
+    params = (
+        ('wartosci', None),  # np.ndarray o długości feedu (wyrównana z data0)
+        ('period',   1),
+    )
+
+    def __init__(self):
+        self.addminperiod(self.p.period)
+
+    def next(self):
+        self.lines.sma[0] = float(self.p.wartosci[len(self.data) - 1])
+
+    def once(self, start, end):
+        dst = self.lines.sma.array
+        wartosci = self.p.wartosci
+        for i in range(start, end):
+            dst[i] = float(wartosci[i])
+
+
+def _sma(strategia, period):
+    """SMA close - z banku przekazanego w parametrze sma_bank (jeśli ma ten okres) lub btind.SMA."""
+    bank = strategia.p.sma_bank
+    if bank is not None and period in bank:
+        return SmaZBanku(strategia.data.close, wartosci=bank[period], period=period)
+    return btind.SMA(strategia.data.close, period=period)
+
+
 class StrategiaTrendMomentum(bt.Strategy):
     """
     Strategia Trend-Following Momentum — odwzorowanie logiki skanera.
@@ -37,6 +72,7 @@ class StrategiaTrendMomentum(bt.Strategy):
         ('risk_pct',        0.02),   # Ryzyko 2% kapitału na transakcję
         ('use_rs_filter',   True),   # Wymagaj RS > RS_SMA50 do wejścia
         ('rs_sma_period',   50),     # Okres MA na RS ratio
+        ('sma_bank',        None),   # {okres: np.ndarray} z kernele.sma_bank (optymalizacja)
         ('printlog',        False),
     )
 
@@ -45,8 +81,8 @@ class StrategiaTrendMomentum(bt.Strategy):
         self.data_close = self.data.close
 
         # Wskaźniki SMA
-        self.sma_fast = btind.SMA(self.data.close, period=self.p.sma_fast)
-        self.sma_slow = btind.SMA(self.data.close, period=self.p.sma_slow)
+        self.sma_fast = _sma(self, self.p.sma_fast)
+        self.sma_slow = _sma(self, self.p.sma_slow)
 
         # ATR — do pozycjonowania i trailing stop
         self.atr = btind.ATR(self.data, period=self.p.atr_period)
@@ -176,12 +212,13 @@ class StrategiaSmaCrossover(bt.Strategy):
         ('sma_fast',  50),
         ('sma_slow',  200),
         ('risk_pct',  0.95),    # 95% kapitału (pełna pozycja)
+        ('sma_bank',  None),    # {okres: np.ndarray} z kernele.sma_bank (optymalizacja)
         ('printlog',  False),
     )
 
     def __init__(self):
-        self.sma_fast  = btind.SMA(self.data.close, period=self.p.sma_fast)
-        self.sma_slow  = btind.SMA(self.data.close, period=self.p.sma_slow)
+        self.sma_fast  = _sma(self, self.p.sma_fast)
+        self.sma_slow  = _sma(self, self.p.sma_slow)
         self.cross     = btind.CrossOver(self.sma_fast, self.sma_slow)
         self.order     = None
         self.trade_log = []
@@ -0,0 +1,347 @@
+"""
+AgregatorSwiec - strumieniowa agregacja transakcji / świec minutowych do świec dziennych.
+
+Surowe pliki dostawcy (transakcje: czas, cena, wolumen albo świece minutowe OHLCV)
+czytane są porcjami (pd.read_csv(chunksize=...)). Każda porcja jest agregowana
+wektorowo (np.maximum.reduceat / np.minimum.reduceat / np.add.reduceat po granicach
+przedziałów), a ostatni - jeszcze otwarty - przedział przechodzi do następnej porcji.
+Pamięć: jedna porcja + jedna otwarta świeca na tyker + bufor zapisu.
+
+    agregator = AgregatorSwiec('AAPL')
+    for porcja in porcje:
+        zamkniete = agregator.dodaj_transakcje(porcja['czas'], porcja['cena'], porcja['wolumen'])
+    ostatnia = agregator.zakoncz()
+
+    # Cały plik (także wiele tykerów - kolumna symbol) prosto do bazy:
+    importuj_strumieniowo('trades.csv', repo)
+
+Przedział: wielokrotność doby (baza przechowuje świece dzienne), liczony od
+poniedziałku 1970-01-05 - '7D' to tygodnie od poniedziałku. Czas transakcji
+w czasie lokalnym giełdy (bez strefy).
+
+Format czasu jest zgadywany raz na plik z pierwszej wartości (albo podany jako
+format_czasu) - parsowanie ze stałym formatem jest ok. 2-3x szybsze niż 'mixed',
+do którego agregator wraca, gdy plik ma daty w różnych formatach.
+"""
+
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from .modele import CandleBatch
+
+# Nazwy kolumn plików dostawcy (małe litery) -> rola
+KOLUMNY_CZASU = ('timestamp', 'datetime', 'time', 'date', 'czas', 'data')
+KOLUMNY_TYKERA = ('symbol', 'ticker', 'tyker')
+KOLUMNY_CENY = ('price', 'cena')
+KOLUMNY_WOLUMENU = ('size', 'qty', 'quantity', 'volume', 'wolumen')
+KOLUMNY_OHLC = {
+    'otwarcie': ('open', 'otwarcie'),
+    'najwyzszy': ('high', 'najwyzszy'),
+    'najnizszy': ('low', 'najnizszy'),
+    'zamkniecie': ('close', 'zamkniecie'),
+}
+
+DZIEN = pd.Timedelta('1D')
+
+
+def zgadnij_format_czasu(czas) -> str:
+    """Format strftime z pierwszej niepustej wartości ('mixed', gdy nie da się go zgadnąć)."""
+    for wartosc in czas:
+        if isinstance(wartosc, str):
+            return guess_datetime_format(str(wartosc)) or 'mixed'
+        if not pd.isna(wartosc):
+            return 'mixed'
+    return 'mixed'
+
+
+def parsuj_czas(czas, format_czasu: str = None):
+    """
+    Napisy dat -> DatetimeIndex / Series datetime64.
+
+    Args:
+        czas: Napisy dat (tablica / pd.Series)
+        format_czasu: Spodziewany format (np. zgadnięty dla poprzedniej porcji);
+            None = zgadnięty z pierwszej wartości. Przy niezgodnej wartości - 'mixed'.
+
+    Returns:
+        (daty, użyty format)
+    """
+    if format_czasu is None:
+        format_czasu = zgadnij_format_czasu(czas)
+    try:
+        return pd.to_datetime(czas, format=format_czasu), format_czasu
+    except (ValueError, TypeError):
+        return pd.to_datetime(czas, format='mixed'), 'mixed'
+
+
+class AgregatorSwiec:
+    """
+    Agregator jednego tykera - zamknięte świece wychodzą po każdej porcji.
+    """
+
+    def __init__(self, tyker: str, interwal='1D', poczatek='1970-01-05'):
+        szerokosc = pd.Timedelta(interwal)
+        if szerokosc < DZIEN or szerokosc % DZIEN:
+            raise ValueError(f"AgregatorSwiec({tyker}): interwał musi być wielokrotnością doby, podano {interwal}")
+        self.tyker = tyker
+        self._szerokosc = szerokosc.value
+        self._poczatek = pd.Timestamp(poczatek).value
+        # Otwarta świeca: (przedział, o, h, l, c, v) lub None
+        self._otwarta: Optional[tuple] = None
+        self.liczba_wpisow = 0
+        self.odrzucone = 0
+
+    @property
+    def otwarta(self) -> Optional[tuple]:
+        return self._otwarta
+
+    def dodaj_transakcje(self, czas, cena, wolumen) -> CandleBatch:
+        """Dodaj porcję transakcji (posortowanych po czasie); zwraca świece zamknięte przez tę porcję."""
+        cena = np.asarray(cena, dtype=np.float64)
+        return self.dodaj_swiece(czas, cena, cena, cena, cena, wolumen)
+
+    def dodaj_swiece(self, czas, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen) -> CandleBatch:
+        """
+        Dodaj porcję świec drobniejszego interwału (np. minutowych).
+
+        Wpisy dla świec już zamkniętych (spóźnione względem poprzednich porcji)
+        są pomijane i liczone w self.odrzucone.
+
+        Returns:
+            CandleBatch: świece zamknięte przez tę porcję (ostatnia zostaje otwarta)
+        """
+        czas = self._ns(czas)
+        kolumny = [np.asarray(k, dtype=np.float64) for k in (otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen)]
+        self.liczba_wpisow += len(czas)
+
+        przedzialy = (czas - self._poczatek) // self._szerokosc
+        if len(przedzialy) > 1 and (przedzialy[1:] < przedzialy[:-1]).any():
+            kolejnosc = np.argsort(czas, kind='stable')
+            przedzialy = przedzialy[kolejnosc]
+            kolumny = [k[kolejnosc] for k in kolumny]
+
+        if self._otwarta is not None and len(przedzialy) and przedzialy[0] < self._otwarta[0]:
+            aktualne = przedzialy >= self._otwarta[0]
+            self.odrzucone += int(len(aktualne) - aktualne.sum())
+            przedzialy = przedzialy[aktualne]
+            kolumny = [k[aktualne] for k in kolumny]
+
+        if not len(przedzialy):
+            return CandleBatch.pusty(self.tyker)
+
+        o, h, l, c, v = kolumny
+        starty = np.flatnonzero(np.diff(przedzialy)) + 1
+        konce = np.append(starty, len(przedzialy)) - 1
+        starty = np.concatenate(([0], starty))
+
+        p = przedzialy[starty]
+        o, c = o[starty], c[konce]
+        h = np.maximum.reduceat(h, starty)
+        l = np.minimum.reduceat(l, starty)
+        v = np.add.reduceat(v, starty)
+
+        if self._otwarta is not None:
+            p0, o0, h0, l0, _, v0 = self._otwarta
+            if p[0] == p0:
+                # Ciąg dalszy otwartej świecy z poprzedniej porcji
+                o[0], h[0], l[0], v[0] = o0, max(h0, h[0]), min(l0, l[0]), v0 + v[0]
+            else:
+                p, o, h, l, c, v = (np.concatenate(([a], b)) for a, b in zip(self._otwarta, (p, o, h, l, c, v)))
+
+        self._otwarta = (p[-1], o[-1], h[-1], l[-1], c[-1], v[-1])
+        return self._batch(p[:-1], o[:-1], h[:-1], l[:-1], c[:-1], v[:-1])
+
+    def zakoncz(self) -> CandleBatch:
+        """Zamknij otwartą świecę (koniec strumienia)."""
+        if self._otwarta is None:
+            return CandleBatch.pusty(self.tyker)
+        swieca = self._batch(*(np.array([x]) for x in self._otwarta))
+        self._otwarta = None
+        return swieca
+
+    def _ns(self, czas) -> np.ndarray:
+        """Czas jako int64 ns (datetime64, napisy lub pd.Series)."""
+        czas = np.asarray(czas)
+        if czas.dtype.kind != 'M':
+            czas = np.asarray(parsuj_czas(czas)[0])
+        return czas.astype('datetime64[ns]').view(np.int64)
+
+    def _batch(self, p, o, h, l, c, v) -> CandleBatch:
+        daty = (np.asarray(p, dtype=np.int64) * self._szerokosc + self._poczatek).view('datetime64[ns]')
+        return CandleBatch(self.tyker, daty, o, h, l, c, np.rint(v).astype(np.int64))
+
+
+def polacz_batche(batche: List[CandleBatch]) -> CandleBatch:
+    """Sklej kolejne CandleBatch jednego tykera."""
+    return CandleBatch(
+        batche[0].tyker,
+        *(np.concatenate([getattr(b, nazwa) for b in batche])
+          for nazwa in ('daty', 'otwarcie', 'najwyzszy', 'najnizszy', 'zamkniecie', 'wolumen')),
+    )
+
+
+def _znajdz(kolumny, nazwy) -> Optional[str]:
+    return next((k for k in nazwy if k in kolumny), None)
+
+
+def strumien_swiec(sciezka: str, tyker: str = None, interwal='1D', rozmiar_porcji: int = 1_000_000,
+                   statystyki: dict = None, format_czasu: str = None) -> Iterator[CandleBatch]:
+    """
+    Czytaj plik transakcji / świec minutowych porcjami i zwracaj zamknięte świece.
+
+    Args:
+        sciezka: Plik CSV (czas + cena/wolumen albo OHLCV; opcjonalnie kolumna symbol)
+        tyker: Symbol dla plików bez kolumny symbolu
+        interwal: Interwał świec wynikowych (wielokrotność doby)
+        rozmiar_porcji: Liczba wierszy czytanych naraz
+        statystyki: Opcjonalny dict uzupełniany o 'wpisy' i 'odrzucone'
+        format_czasu: Format kolumny czasu (np. '%Y-%m-%d %H:%M:%S'); None = zgadnięty
+            z pierwszej porcji i używany dla całego pliku
+
+    Yields:
+        CandleBatch: zamknięte świece jednego tykera (na końcu - ostatnie otwarte)
+    """
+    agregatory: Dict[str, AgregatorSwiec] = {}
+    format_pliku = None
+
+    def agregator(symbol):
+        if symbol not in agregatory:
+            agregatory[symbol] = AgregatorSwiec(symbol, interwal)
+        return agregatory[symbol]
+
+    for porcja in pd.read_csv(sciezka, chunksize=rozmiar_porcji):
+        porcja.columns = [str(k).strip().lower() for k in porcja.columns]
+        k_czasu = _znajdz(porcja.columns, KOLUMNY_CZASU)
+        k_tykera = _znajdz(porcja.columns, KOLUMNY_TYKERA)
+        k_ceny = _znajdz(porcja.columns, KOLUMNY_CENY)
+        k_wolumenu = _znajdz(porcja.columns, KOLUMNY_WOLUMENU)
+        k_ohlc = {rola: _znajdz(porcja.columns, nazwy) for rola, nazwy in KOLUMNY_OHLC.items()}
+        if k_czasu is None or (k_ceny is None and None in k_ohlc.values()):
+            raise ValueError(f"{sciezka}: brak kolumny czasu lub ceny / OHLC (kolumny: {list(porcja.columns)})")
+        if k_tykera is None and tyker is None:
+            raise ValueError(f"{sciezka}: plik bez kolumny symbolu - podaj tyker")
+
+        porcja = porcja[porcja[k_czasu].notna()]
+        if format_czasu is not None:
+            czas = pd.to_datetime(porcja[k_czasu], format=format_czasu)
+        else:
+            # Format zgadnięty z pierwszej porcji - kolejne porcje bez zgadywania
+            czas, format_pliku = parsuj_czas(porcja[k_czasu], format_pliku)
+        czas = czas.to_numpy(dtype='datetime64[ns]')
+        wolumen = porcja[k_wolumenu].fillna(0).to_numpy(dtype=np.float64) if k_wolumenu else np.zeros(len(porcja))
+        if k_ceny is not None:
+            ceny = [porcja[k_ceny].to_numpy(dtype=np.float64)] * 4
+        else:
+            ceny = [porcja[k_ohlc[rola]].to_numpy(dtype=np.float64) for rola in KOLUMNY_OHLC]
+
+        if k_tykera is None:
+            grupy = [(tyker, slice(None))]
+        else:
+            # Stabilne sortowanie po symbolu - w obrębie tykera kolejność pliku zostaje
+            kody, symbole = pd.factorize(porcja[k_tykera])
+            kolejnosc = np.argsort(kody, kind='stable')
+            granice = np.searchsorted(kody[kolejnosc], np.arange(len(symbole) + 1))
+            grupy = [(str(s), kolejnosc[granice[i]:granice[i + 1]]) for i, s in enumerate(symbole)]
+
+        for symbol, wiersze in grupy:
+            zamkniete = agregator(symbol).dodaj_swiece(czas[wiersze], *(c[wiersze] for c in ceny), wolumen[wiersze])
+            if len(zamkniete):
+                yield zamkniete
+
+    for a in agregatory.values():
+        ostatnia = a.zakoncz()
+        if len(ostatnia):
+            yield ostatnia
+
+    if statystyki is not None:
+        statystyki['wpisy'] = sum(a.liczba_wpisow for a in agregatory.values())
+        statystyki['odrzucone'] = sum(a.odrzucone for a in agregatory.values())
+
+
+def importuj_strumieniowo(sciezka: str, repozytorium, tyker: str = None, interwal='1D',
+                          rozmiar_porcji: int = 1_000_000, rozmiar_zapisu: int = 50_000,
+                          format_czasu: str = None) -> dict:
+    """
+    Zagreguj plik transakcji / świec minutowych i zapisz świece do bazy (RepozytoriumDanych.zapisz_swiece).
+
+    Zamknięte świece są buforowane per tyker i zapisywane jednym CandleBatch na tyker,
+    gdy w buforze jest rozmiar_zapisu świec (i na końcu pliku). format_czasu - jak w strumien_swiec.
+
+    Returns:
+        dict {'wpisy', 'odrzucone', 'swiece', 'tykery', 'czas_s', 'wpisy_na_s'}
+    """
+    start = time.perf_counter()
+    statystyki = {}
+    bufor: Dict[str, List[CandleBatch]] = {}
+    w_buforze = 0
+    zapisane = 0
+    tykery = set()
+
+    def oproznij():
+        nonlocal w_buforze, zapisane
+        for batche in bufor.values():
+            batch = polacz_batche(batche)
+            repozytorium.zapisz_swiece(batch)
+            zapisane += len(batch)
+        bufor.clear()
+        w_buforze = 0
+
+    for batch in strumien_swiec(sciezka, tyker, interwal, rozmiar_porcji, statystyki, format_czasu):
+        bufor.setdefault(batch.tyker, []).append(batch)
+        tykery.add(batch.tyker)
+        w_buforze += len(batch)
+        if w_buforze >= rozmiar_zapisu:
+            oproznij()
+    oproznij()
+
+    czas_s = time.perf_counter() - start
+    statystyki.update(swiece=zapisane, tykery=len(tykery), czas_s=czas_s,
+                      wpisy_na_s=statystyki.get('wpisy', 0) / czas_s if czas_s > 0 else 0.0)
+    if statystyki.get('odrzucone'):
+        print(f"Agregacja {sciezka}: pominięto {statystyki['odrzucone']} spóźnionych wpisów")
+    print(f"Agregacja {sciezka}: {statystyki.get('wpisy', 0)} wpisów -> {zapisane} świec "
+          f"({statystyki['wpisy_na_s'] / 1e6:.2f} mln wpisów/s)")
+    return statystyki
+
+
+# Pomiar przepustowości: sama agregacja, potem cały import pliku CSV do bazy w pamięci
+if __name__ == "__main__":
+    # python -m dane.agregator_swiec
+    import os
+    import sqlite3
+    import tempfile
+
+    from .baza import BazaDanych
+    from .repozytorium import RepozytoriumDanych
+
+    n, porcja = 20_000_000, 1_000_000
+    rng = np.random.default_rng(0)
+    czas = np.datetime64('2020-01-01T09:30', 'ns') + np.cumsum(rng.integers(1, 10_000_000_000, n)).astype('timedelta64[ns]')
+    cena = 100 + np.cumsum(rng.normal(0, 0.01, n))
+    wolumen = rng.integers(1, 500, n)
+
+    agregator = AgregatorSwiec('TEST')
+    start = time.perf_counter()
+    swiece = sum(len(agregator.dodaj_transakcje(czas[i:i + porcja], cena[i:i + porcja], wolumen[i:i + porcja]))
+                 for i in range(0, n, porcja))
+    swiece += len(agregator.zakoncz())
+    czas_s = time.perf_counter() - start
+    print(f"{n} transakcji -> {swiece} świec dziennych: {n / czas_s / 1e6:.1f} mln transakcji/s")
+
+    # Import end-to-end (read_csv + parsowanie dat + agregacja + zapis)
+    n_pliku = 2_000_000
+    baza = BazaDanych()
+    baza.polaczenie = sqlite3.connect(':memory:')
+    baza.utworz_tabele()
+    with tempfile.TemporaryDirectory() as katalog:
+        sciezka = os.path.join(katalog, 'trades.csv')
+        pd.DataFrame({
+            'timestamp': czas[:n_pliku].astype('datetime64[s]'), 'price': cena[:n_pliku], 'size': wolumen[:n_pliku],
+        }).to_csv(sciezka, index=False)
+        for format_czasu in ('mixed', None):
+            wynik = importuj_strumieniowo(sciezka, RepozytoriumDanych(), tyker='TEST', format_czasu=format_czasu)
+            print(f"  format_czasu={format_czasu!r}: {wynik['czas_s']:.2f} s")
@@ -1,6 +1,7 @@
 import sqlite3
 import os
 from konfiguracja import Konfiguracja
+from .shardy import SQL_TABELA_SWIEC, numer_sharda, otworz_shard, sciezka_sharda
 
 class BazaDanych:
     _instancja = None
@@ -9,6 +10,7 @@ class BazaDanych:
         if cls._instancja is None:
             cls._instancja = super(BazaDanych, cls).__new__(cls)
             cls._instancja.polaczenie = None
+            cls._instancja.shardy = {}
         return cls._instancja
 
     def inicjalizuj(self):
@@ -22,23 +24,38 @@ class BazaDanych:
             self.inicjalizuj()
         return self.polaczenie
 
+    # ── Świece (opcjonalnie w shardach, patrz dane/shardy.py) ──
+
+    def pobierz_polaczenie_swiec(self, tyker: str):
+        """Połączenie z plikiem przechowującym świece danego tykera."""
+        liczba = Konfiguracja.LICZBA_SHARDOW
+        if liczba <= 0:
+            return self.pobierz_polaczenie()
+        return self._polaczenie_sharda(numer_sharda(tyker, liczba), liczba)
+
+    def polaczenia_swiec(self) -> list:
+        """Wszystkie połączenia zawierające świece (główna baza lub każdy shard)."""
+        liczba = Konfiguracja.LICZBA_SHARDOW
+        if liczba <= 0:
+            return [self.pobierz_polaczenie()]
+        return [self._polaczenie_sharda(i, liczba) for i in range(liczba)]
+
+    def _polaczenie_sharda(self, numer: int, liczba: int):
+        klucz = (numer, liczba)
+        if klucz not in self.shardy:
+            self.shardy[klucz] = otworz_shard(sciezka_sharda(numer, liczba), check_same_thread=False)
+        return self.shardy[klucz]
+
+    def zamknij_shardy(self):
+        for conn in self.shardy.values():
+            conn.close()
+        self.shardy = {}
+
     def utworz_tabele(self):
         kursor = self.polaczenie.cursor()
         
         # Tabela świec
-        kursor.execute('''
-        CREATE TABLE IF NOT EXISTS swiece (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tyker TEXT NOT NULL,
-            data TEXT NOT NULL,
-            otwarcie REAL,
-            najwyzszy REAL,
-            najnizszy REAL,
-            zamkniecie REAL,
-            wolumen INTEGER,
-            UNIQUE(tyker, data)
-        )
-        ''')
+        kursor.execute(SQL_TABELA_SWIEC)
 
         # Tabela notatek skanera (uwagi / priorytety per tyker)
         kursor.execute('''
@@ -49,6 +66,43 @@ class BazaDanych:
         )
         ''')
 
+        # Cache wskaźników (analiza.cache_wskaznikow) - kolumny wskaźników per tyker
+        kursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_wskaznikow (
+            tyker TEXT PRIMARY KEY,
+            ostatnia_data TEXT NOT NULL,
+            liczba_swiec INTEGER NOT NULL,
+            hash_konfiguracji TEXT NOT NULL,
+            benchmark_data TEXT,
+            suma_kontrolna TEXT NOT NULL,
+            dane BLOB NOT NULL
+        )
+        ''')
+
+        # Wiersze dopisane przyrostowo do cache_wskaznikow (kawałki float64 od pozycji 'od');
+        # klucz ostatniego kawałka zastępuje klucz wpisu, więc blob wpisu nie jest przepisywany
+        kursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_wskaznikow_przyrost (
+            tyker TEXT NOT NULL,
+            od INTEGER NOT NULL,
+            ostatnia_data TEXT NOT NULL,
+            benchmark_data TEXT,
+            suma_kontrolna TEXT NOT NULL,
+            dane BLOB NOT NULL,
+            PRIMARY KEY (tyker, od)
+        )
+        ''')
+
+        # Stan przyrostowy wskaźników (analiza.stan_wskaznikow) - okna i sumy kroczące per tyker
+        kursor.execute('''
+        CREATE TABLE IF NOT EXISTS stan_wskaznikow (
+            tyker TEXT PRIMARY KEY,
+            hash_konfiguracji TEXT NOT NULL,
+            liczba_swiec INTEGER NOT NULL,
+            dane BLOB NOT NULL
+        )
+        ''')
+
         # Tabela transakcji
         kursor.execute('''
         CREATE TABLE IF NOT EXISTS transakcje (
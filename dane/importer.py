@@ -1,13 +1,13 @@
+import numpy as np
 import pandas as pd
 import yfinance as yf
-from typing import List
-from .modele import Swieca
-from datetime import datetime
+from .agregator_swiec import importuj_strumieniowo
+from .modele import CandleBatch
 
 class ImporterDanych:
     @staticmethod
-    def importuj_z_pliku(sciezka_pliku: str, tyker: str) -> List[Swieca]:
-        """Importuje dane z CSV."""
+    def importuj_z_pliku(sciezka_pliku: str, tyker: str) -> CandleBatch:
+        """Importuje dane z CSV (wektorowo, bez obiektu na każdą świecę)."""
         df = pd.read_csv(sciezka_pliku)
         df.columns = [c.lower() for c in df.columns]
 
@@ -15,57 +15,127 @@ class ImporterDanych:
         mapa = {'date': 'data', 'open': 'otwarcie', 'high': 'najwyzszy', 'low': 'najnizszy', 'close': 'zamkniecie', 'volume': 'wolumen'}
         df = df.rename(columns=mapa)
 
-        swiece = []
-        for _, row in df.iterrows():
-            # Pobierz datę z kolumny 'data' lub 'date'
-            data_str = None
-            if 'data' in row.index and pd.notna(row['data']):
-                data_str = row['data']
-            elif 'date' in row.index and pd.notna(row['date']):
-                data_str = row['date']
-
-            if data_str is None:
-                continue  # Pomiń wiersze bez daty
-
-            swiece.append(Swieca(
-                tyker=tyker,
-                data=pd.to_datetime(data_str).strftime('%Y-%m-%d'),
-                otwarcie=float(row.get('otwarcie', row.get('open', 0))),
-                najwyzszy=float(row.get('najwyzszy', row.get('high', 0))),
-                najnizszy=float(row.get('najnizszy', row.get('low', 0))),
-                zamkniecie=float(row.get('zamkniecie', row.get('close', 0))),
-                wolumen=int(row.get('wolumen', row.get('volume', 0)))
-            ))
-        return swiece
+        if 'data' not in df.columns:
+            return CandleBatch.pusty(tyker)
+
+        # Pomiń wiersze bez daty
+        df = df[df['data'].notna()]
+
+        def kolumna(nazwa, dtype):
+            if nazwa not in df.columns:
+                return np.zeros(len(df), dtype=dtype)
+            return df[nazwa].fillna(0).to_numpy(dtype=dtype)
+
+        daty = pd.to_datetime(df['data'], format='mixed').to_numpy(dtype='datetime64[D]')
+        return CandleBatch(
+            tyker,
+            daty,
+            kolumna('otwarcie', np.float64),
+            kolumna('najwyzszy', np.float64),
+            kolumna('najnizszy', np.float64),
+            kolumna('zamkniecie', np.float64),
+            kolumna('wolumen', np.int64),
+        )
+
+    @staticmethod
+    def importuj_transakcje_z_pliku(sciezka_pliku: str, repo, tyker: str = None, interwal='1D',
+                                    format_czasu: str = None) -> dict:
+        """Agreguje plik transakcji / świec minutowych do świec dziennych i zapisuje je porcjami (AgregatorSwiec)."""
+        return importuj_strumieniowo(sciezka_pliku, repo, tyker=tyker, interwal=interwal, format_czasu=format_czasu)
 
     @staticmethod
-    def pobierz_yfinance(tyker: str, okres="2y", interwal="1d") -> List[Swieca]:
-        """Pobiera dane z Yahoo Finance."""
+    def pobierz_yfinance(tyker: str, okres="2y", interwal="1d", start: str = None) -> CandleBatch:
+        """Pobiera dane z Yahoo Finance (od daty start zamiast okresu, jeśli podana)."""
         try:
-            df = yf.download(tyker, period=okres, interval=interwal, progress=False, auto_adjust=True)
+            if start:
+                df = yf.download(tyker, start=start, interval=interwal, progress=False, auto_adjust=True)
+            else:
+                df = yf.download(tyker, period=okres, interval=interwal, progress=False, auto_adjust=True)
             if df.empty:
-                return []
-            
-            swiece = []
-            for index, row in df.iterrows():
-                # YFinance zwraca MultiIndex kolumn w nowych wersjach, trzeba uważać
-                # .iloc lub .xs może być potrzebne, ale auto_adjust=True upraszcza
-                open_val = row['Open'].iloc[0] if isinstance(row['Open'], pd.Series) else row['Open']
-                high_val = row['High'].iloc[0] if isinstance(row['High'], pd.Series) else row['High']
-                low_val = row['Low'].iloc[0] if isinstance(row['Low'], pd.Series) else row['Low']
-                close_val = row['Close'].iloc[0] if isinstance(row['Close'], pd.Series) else row['Close']
-                vol_val = row['Volume'].iloc[0] if isinstance(row['Volume'], pd.Series) else row['Volume']
-                
-                swiece.append(Swieca(
-                    tyker=tyker,
-                    data=index.strftime('%Y-%m-%d'),
-                    otwarcie=float(open_val),
-                    najwyzszy=float(high_val),
-                    najnizszy=float(low_val),
-                    zamkniecie=float(close_val),
-                    wolumen=int(vol_val)
-                ))
-            return swiece
+                return CandleBatch.pusty(tyker)
+
+            # YFinance zwraca MultiIndex kolumn w nowych wersjach (kolumna per tyker) -
+            # bierzemy pierwszą kolumnę każdego pola
+            def pole(nazwa):
+                kol = df[nazwa]
+                if isinstance(kol, pd.DataFrame):
+                    kol = kol.iloc[:, 0]
+                return kol.to_numpy()
+
+            return CandleBatch(
+                tyker,
+                df.index.to_numpy(dtype='datetime64[D]'),
+                pole('Open'),
+                pole('High'),
+                pole('Low'),
+                pole('Close'),
+                np.nan_to_num(pole('Volume').astype(np.float64)).astype(np.int64),
+            )
         except Exception as e:
             print(f"Błąd pobierania {tyker}: {e}")
-            return []
+            return CandleBatch.pusty(tyker)
+
+    @staticmethod
+    def wykryj_korekte(zapisane: CandleBatch, nowe: CandleBatch, tolerancja: float = 1e-4) -> bool:
+        """
+        Czy ceny wspólnych świec różnią się o więcej niż tolerancja (względnie)?
+
+        Przy auto_adjust=True split lub dywidenda przeskalowuje całą historię,
+        więc wystarczy porównać kilka ostatnich zapisanych świec z nowym pobraniem.
+        """
+        wspolne, i_zap, i_nowe = np.intersect1d(zapisane.daty, nowe.daty, return_indices=True)
+        if len(wspolne) == 0:
+            return False
+        for nazwa in ('najwyzszy', 'najnizszy', 'zamkniecie'):
+            stare = getattr(zapisane, nazwa)[i_zap]
+            swieze = getattr(nowe, nazwa)[i_nowe]
+            if not np.allclose(swieze, stare, rtol=tolerancja, atol=0.0, equal_nan=True):
+                return True
+        return False
+
+    @staticmethod
+    def aktualizuj_tykera(tyker: str, repo, nakladka: int = 5, tolerancja: float = 1e-4) -> dict:
+        """
+        Przyrostowa aktualizacja tykera z Yahoo Finance.
+
+        Pobiera świece od nakladka-tej ostatniej zapisanej świecy. Najnowsza zapisana
+        świeca mogła być pobrana w trakcie sesji, więc jest tylko nadpisywana wersją
+        od dostawcy. Jeśli starsze wspólne świece się nie zgadzają (split / dywidenda),
+        pobiera ponownie całą przechowywaną historię i nadpisuje ją w jednej transakcji.
+
+        Args:
+            tyker: Symbol tykera
+            repo: RepozytoriumDanych
+            nakladka: Liczba pobieranych zapisanych świec (z nowym pobraniem porównywane
+                są wszystkie poza najnowszą)
+            tolerancja: Względna tolerancja porównania cen
+
+        Returns:
+            dict {'tryb': 'pelny' | 'przyrost' | 'korekta' | 'brak', 'liczba_swiec': int}
+        """
+        zapisane = repo.pobierz_ostatnie_swiece(tyker, nakladka)
+        if not zapisane:
+            swiece = ImporterDanych.pobierz_yfinance(tyker)
+            repo.zapisz_swiece(swiece)
+            return {'tryb': 'pelny' if swiece else 'brak', 'liczba_swiec': len(swiece)}
+
+        nowe = ImporterDanych.pobierz_yfinance(tyker, start=str(zapisane.daty[0]))
+        if not nowe:
+            return {'tryb': 'brak', 'liczba_swiec': 0}
+
+        # Najnowsza zapisana świeca nie decyduje o korekcie - dostawca mógł ją dokończyć
+        starsze = CandleBatch(tyker, *(getattr(zapisane, k)[:-1] for k in (
+            'daty', 'otwarcie', 'najwyzszy', 'najnizszy', 'zamkniecie', 'wolumen')))
+        if ImporterDanych.wykryj_korekte(starsze, nowe, tolerancja):
+            historia = ImporterDanych.pobierz_yfinance(tyker, start=repo.pobierz_pierwsza_data(tyker))
+            if historia:
+                repo.nadpisz_historie_tykera(historia)
+                return {'tryb': 'korekta', 'liczba_swiec': len(historia)}
+            return {'tryb': 'brak', 'liczba_swiec': 0}
+
+        # Starsze świece nakładki zostają bez zmian (różnice w tolerancji nie unieważniają cache),
+        # najnowsza zapisana jest nadpisywana, nowe dopisywane
+        od_ostatniej = nowe.daty >= zapisane.daty[-1]
+        repo.zapisz_swiece(CandleBatch(tyker, *(getattr(nowe, k)[od_ostatniej] for k in (
+            'daty', 'otwarcie', 'najwyzszy', 'najnizszy', 'zamkniecie', 'wolumen'))), nadpisz=True)
+        return {'tryb': 'przyrost', 'liczba_swiec': int((nowe.daty > zapisane.daty[-1]).sum())}
@@ -1,20 +1,30 @@
 """
 Index Manager - Multi-index support for Market Screener
+
+Parsed ticker lists and validation metadata are cached in a JSON file
+(`.index_cache.json` in the data directory), keyed by the CSV's mtime and size,
+so switching indices in the UI does not re-read the CSV files.
 """
 
+import datetime
+import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Optional
 import pandas as pd
 
 
+INDEX_CACHE_FILENAME = '.index_cache.json'
+
+
 @dataclass
 class IndexDefinition:
     """Definition of a stock market index"""
     id: str
     name: str
     csv_filename: str
-    stock_count: int
+    stock_count: int                  # Estimate only - real count comes from get_stock_count()
     estimated_time_min: int  # Estimated scan time in minutes
     description: str
     requires_download: bool = False   # True = CSV musi być pobrany z internetu
@@ -78,10 +88,90 @@ class IndexManager:
         ),
     }
 
-    def __init__(self, data_dir: Path = None):
+    def __init__(self, data_dir: Path = None, cache_path: Path = None):
         if data_dir is None:
             data_dir = Path(__file__).parent
-        self.data_dir = data_dir
+        self.data_dir = Path(data_dir)
+        self.cache_path = Path(cache_path) if cache_path else self.data_dir / INDEX_CACHE_FILENAME
+        self._cache = self._load_cache()
+
+    # ── Metadata cache ──────────────────────
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Load persisted cache (empty dict if missing or corrupted)"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        """Persist cache atomically (tmp file + replace); failures are non-fatal"""
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Index cache not saved: {e}")
+
+    def _get_file_entry(self, index_def: IndexDefinition) -> Optional[Dict]:
+        """
+        Return cached metadata for the index CSV, re-parsing it only when
+        its mtime or size changed.
+
+        Returns:
+            None if the CSV doesn't exist, otherwise dict with keys:
+            valid, error, tickers, ticker_count, last_updated, mtime_ns, size
+        """
+        csv_path = self.data_dir / index_def.csv_filename
+        try:
+            st = os.stat(csv_path)
+        except OSError:
+            return None
+
+        entry = self._cache.get(index_def.csv_filename)
+        if entry and entry.get('mtime_ns') == st.st_mtime_ns and entry.get('size') == st.st_size:
+            return entry
+
+        entry = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'last_updated': datetime.datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d %H:%M'),
+            'valid': False,
+            'error': None,
+            'tickers': [],
+            'ticker_count': 0,
+        }
+        try:
+            df = pd.read_csv(csv_path, comment='#')
+            if 'Ticker' not in df.columns:
+                entry['error'] = "Missing 'Ticker' column"
+            else:
+                tickers = df['Ticker'].dropna().astype(str).str.strip().tolist()
+                entry['valid'] = True
+                entry['tickers'] = tickers
+                entry['ticker_count'] = len(tickers)
+        except Exception as e:
+            entry['error'] = str(e)
+
+        self._cache[index_def.csv_filename] = entry
+        self._save_cache()
+        return entry
+
+    def get_stock_count(self, index_id: str) -> int:
+        """
+        Real number of tickers in the index CSV (from cache).
+        Falls back to the estimated stock_count if the CSV is missing or invalid.
+        """
+        index_def = self.get_index(index_id)
+        if not index_def:
+            return 0
+        entry = self._get_file_entry(index_def)
+        if entry and entry['valid']:
+            return entry['ticker_count']
+        return index_def.stock_count
 
     def get_index(self, index_id: str) -> Optional[IndexDefinition]:
         """Get index definition by ID"""
@@ -102,6 +192,7 @@ class IndexManager:
     def load_tickers(self, index_id: str) -> List[str]:
         """
         Load ticker symbols from index CSV.
+        The CSV is parsed once; later calls are served from the metadata cache.
 
         For indices with requires_download=True:
           - If CSV exists: load from file
@@ -134,65 +225,59 @@ class IndexManager:
                     f"Please ensure {index_def.csv_filename} exists in {self.data_dir}"
                 )
 
-        try:
-            df = pd.read_csv(csv_path, comment='#')
-            tickers = df['Ticker'].dropna().str.strip().tolist()
-            return tickers
-        except Exception as e:
-            raise IOError(f"Error loading {index_def.name}: {e}")
+        entry = self._get_file_entry(index_def)
+        if entry is None:
+            raise FileNotFoundError(f"Index file not found: {csv_path}")
+        if not entry['valid']:
+            raise IOError(f"Error loading {index_def.name}: {entry['error']}")
+        return list(entry['tickers'])
+
+    def validate_index(self, index_id: str) -> Dict:
+        """
+        Check whether a single index CSV exists and is valid (cached)
+
+        Returns:
+            Validation status dict (see validate_index_files)
+        """
+        index_def = self.get_index(index_id)
+        if not index_def:
+            return {'exists': False, 'valid': False, 'error': f"Unknown index: {index_id}"}
+
+        csv_path = self.data_dir / index_def.csv_filename
+        entry = self._get_file_entry(index_def)
+
+        if entry is None:
+            return {
+                'exists': False,
+                'valid': False,
+                'path': str(csv_path),
+                'requires_download': index_def.requires_download,
+            }
+        if not entry['valid']:
+            return {
+                'exists': True,
+                'valid': False,
+                'error': entry['error'],
+                'path': str(csv_path),
+                'requires_download': index_def.requires_download,
+            }
+        return {
+            'exists': True,
+            'valid': True,
+            'ticker_count': entry['ticker_count'],
+            'path': str(csv_path),
+            'requires_download': index_def.requires_download,
+            'last_updated': entry['last_updated'],
+        }
 
     def validate_index_files(self) -> Dict[str, Dict]:
         """
         Check which index CSV files exist and are valid
 
+        Uses the mtime/size-keyed cache - CSV files are only re-read
+        when they changed on disk.
+
         Returns:
             Dictionary mapping index_id to validation status
         """
-        validation = {}
-
-        for index_id, index_def in self.INDICES.items():
-            csv_path = self.data_dir / index_def.csv_filename
-
-            if not csv_path.exists():
-                validation[index_id] = {
-                    'exists': False,
-                    'valid': False,
-                    'path': str(csv_path),
-                    'requires_download': index_def.requires_download,
-                }
-            else:
-                try:
-                    df = pd.read_csv(csv_path, comment='#')
-                    if 'Ticker' not in df.columns:
-                        validation[index_id] = {
-                            'exists': True,
-                            'valid': False,
-                            'error': "Missing 'Ticker' column",
-                            'path': str(csv_path),
-                            'requires_download': index_def.requires_download,
-                        }
-                    else:
-                        ticker_count = len(df)
-                        # Check file modification time for freshness info
-                        import os
-                        import datetime
-                        mtime = os.path.getmtime(csv_path)
-                        modified = datetime.datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
-                        validation[index_id] = {
-                            'exists': True,
-                            'valid': True,
-                            'ticker_count': ticker_count,
-                            'path': str(csv_path),
-                            'requires_download': index_def.requires_download,
-                            'last_updated': modified,
-                        }
-                except Exception as e:
-                    validation[index_id] = {
-                        'exists': True,
-                        'valid': False,
-                        'error': str(e),
-                        'path': str(csv_path),
-                        'requires_download': index_def.requires_download,
-                    }
-
-        return validation
+        return {index_id: self.validate_index(index_id) for index_id in self.INDICES}
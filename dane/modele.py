@@ -1,7 +1,10 @@
 from dataclasses import dataclass
-from typing import Optional
+from itertools import repeat
+from typing import Iterator, List, Optional
+import numpy as np
+import pandas as pd
 
-@dataclass
+@dataclass(slots=True)
 class Swieca:
     tyker: str
     data: str  # ISO Format YYYY-MM-DD
@@ -11,7 +14,180 @@ class Swieca:
     zamkniecie: float
     wolumen: int
 
-@dataclass
+
+class CandleView:
+    """
+    Lekki widok jednego wiersza CandleBatch z interfejsem Swieca
+    (tyker, data, otwarcie, ...). Nie kopiuje danych.
+    """
+    __slots__ = ('_batch', '_i')
+
+    def __init__(self, batch: 'CandleBatch', i: int):
+        self._batch = batch
+        self._i = i
+
+    @property
+    def tyker(self) -> str:
+        return self._batch.tyker
+
+    @property
+    def data(self) -> str:
+        return str(self._batch.daty[self._i])
+
+    @property
+    def otwarcie(self) -> float:
+        return float(self._batch.otwarcie[self._i])
+
+    @property
+    def najwyzszy(self) -> float:
+        return float(self._batch.najwyzszy[self._i])
+
+    @property
+    def najnizszy(self) -> float:
+        return float(self._batch.najnizszy[self._i])
+
+    @property
+    def zamkniecie(self) -> float:
+        return float(self._batch.zamkniecie[self._i])
+
+    @property
+    def wolumen(self) -> int:
+        return int(self._batch.wolumen[self._i])
+
+    def jako_swieca(self) -> Swieca:
+        return Swieca(self.tyker, self.data, self.otwarcie, self.najwyzszy,
+                      self.najnizszy, self.zamkniecie, self.wolumen)
+
+    def __eq__(self, other):
+        if isinstance(other, (CandleView, Swieca)):
+            return (self.tyker, self.data, self.otwarcie, self.najwyzszy, self.najnizszy,
+                    self.zamkniecie, self.wolumen) == \
+                   (other.tyker, other.data, other.otwarcie, other.najwyzszy, other.najnizszy,
+                    other.zamkniecie, other.wolumen)
+        return NotImplemented
+
+    def __repr__(self):
+        return (f"CandleView(tyker={self.tyker!r}, data={self.data!r}, otwarcie={self.otwarcie}, "
+                f"najwyzszy={self.najwyzszy}, najnizszy={self.najnizszy}, "
+                f"zamkniecie={self.zamkniecie}, wolumen={self.wolumen})")
+
+
+class CandleBatch:
+    """
+    Kolumnowy (struct-of-arrays) zestaw świec jednego tykera.
+
+    Zamiast listy obiektów Swieca trzyma tablice NumPy:
+      daty       - datetime64[D]
+      otwarcie, najwyzszy, najnizszy, zamkniecie - float64
+      wolumen    - int64
+
+    Iteracja / indeksowanie zwraca CandleView (kompatybilny ze Swieca).
+    """
+    __slots__ = ('tyker', 'daty', 'otwarcie', 'najwyzszy', 'najnizszy', 'zamkniecie', 'wolumen')
+
+    def __init__(self, tyker: str, daty, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen):
+        self.tyker = tyker
+        self.daty = np.asarray(daty, dtype='datetime64[D]')
+        self.otwarcie = np.asarray(otwarcie, dtype=np.float64)
+        self.najwyzszy = np.asarray(najwyzszy, dtype=np.float64)
+        self.najnizszy = np.asarray(najnizszy, dtype=np.float64)
+        self.zamkniecie = np.asarray(zamkniecie, dtype=np.float64)
+        self.wolumen = np.asarray(wolumen, dtype=np.int64)
+
+        n = len(self.daty)
+        for nazwa in ('otwarcie', 'najwyzszy', 'najnizszy', 'zamkniecie', 'wolumen'):
+            if len(getattr(self, nazwa)) != n:
+                raise ValueError(f"CandleBatch({tyker}): kolumna '{nazwa}' ma inną długość niż daty")
+
+    # ── Konstruktory ────────────────────────
+
+    @classmethod
+    def pusty(cls, tyker: str) -> 'CandleBatch':
+        return cls(tyker, [], [], [], [], [], [])
+
+    @classmethod
+    def z_swiec(cls, swiece: List[Swieca]) -> 'CandleBatch':
+        """Konwersja z listy Swieca (wszystkie muszą mieć ten sam tyker)."""
+        if not swiece:
+            raise ValueError("Pusta lista świec - użyj CandleBatch.pusty(tyker)")
+        return cls(
+            swiece[0].tyker,
+            [s.data for s in swiece],
+            [s.otwarcie for s in swiece],
+            [s.najwyzszy for s in swiece],
+            [s.najnizszy for s in swiece],
+            [s.zamkniecie for s in swiece],
+            [s.wolumen for s in swiece],
+        )
+
+    @classmethod
+    def z_dataframe(cls, tyker: str, df: pd.DataFrame) -> 'CandleBatch':
+        """
+        Konwersja z DataFrame o indeksie DateTime i kolumnach
+        open/high/low/close/volume (format pobierz_swiece_df).
+        """
+        if df.empty:
+            return cls.pusty(tyker)
+        return cls(
+            tyker,
+            pd.DatetimeIndex(df.index).values.astype('datetime64[D]'),
+            df['open'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            df['volume'].fillna(0).to_numpy(dtype=np.int64),
+        )
+
+    # ── Dostęp ──────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.daty)
+
+    def __getitem__(self, i: int) -> CandleView:
+        n = len(self.daty)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("CandleBatch index out of range")
+        return CandleView(self, i)
+
+    def __iter__(self) -> Iterator[CandleView]:
+        for i in range(len(self.daty)):
+            yield CandleView(self, i)
+
+    def __repr__(self):
+        return f"CandleBatch(tyker={self.tyker!r}, n={len(self)})"
+
+    def wiersze_sql(self) -> Iterator[tuple]:
+        """
+        Generator krotek (tyker, data, o, h, l, c, v) dla executemany.
+        Krotki powstają leniwie - bez pośredniej listy krotek ani obiektów Swieca.
+        """
+        return zip(
+            repeat(self.tyker, len(self.daty)),
+            np.datetime_as_string(self.daty, unit='D').tolist(),
+            self.otwarcie.tolist(),
+            self.najwyzszy.tolist(),
+            self.najnizszy.tolist(),
+            self.zamkniecie.tolist(),
+            self.wolumen.tolist(),
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame w formacie pobierz_swiece_df (indeks 'data', kolumny angielskie)."""
+        return pd.DataFrame(
+            {
+                'open': self.otwarcie,
+                'high': self.najwyzszy,
+                'low': self.najnizszy,
+                'close': self.zamkniecie,
+                'volume': self.wolumen,
+            },
+            index=pd.DatetimeIndex(self.daty.astype('datetime64[ns]'), name='data'),
+        )
+
+
+@dataclass(slots=True)
 class Transakcja:
     id: Optional[int]
     tyker: str
@@ -25,7 +201,7 @@ class Transakcja:
     prowizje: float
     notatki: str
     tag_setupu: str
-    
+
     @property
     def jest_zamknieta(self):
         return self.cena_wyjscia is not None and self.data_wyjscia is not None
@@ -36,7 +212,7 @@ class Transakcja:
         if not self.jest_zamknieta:
             return 0.0
         return (self.cena_wyjscia - self.cena_wejscia) * self.wielkosc - self.prowizje
-    
+
     @property
     def r_multiple(self):
         if not self.jest_zamknieta:
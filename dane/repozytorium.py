@@ -1,43 +1,80 @@
+import numpy as np
 import pandas as pd
 from .baza import BazaDanych
-from .modele import Swieca, Transakcja
-from typing import List
+from .modele import CandleBatch, Swieca, Transakcja
+from .shardy import SQL_INSERT_SWIEC, SQL_UPSERT_SWIEC
+from typing import List, Union
 
 class RepozytoriumDanych:
     def __init__(self):
         self.db = BazaDanych()
 
-    def zapisz_swiece(self, swiece: List[Swieca]):
-        conn = self.db.pobierz_polaczenie()
-        
-        dane = [(s.tyker, s.data, s.otwarcie, s.najwyzszy, s.najnizszy, s.zamkniecie, s.wolumen) for s in swiece]
-        
-        c = conn.cursor()
-        c.executemany('''
-        INSERT OR IGNORE INTO swiece (tyker, data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', dane)
-        conn.commit()
+    def zapisz_swiece(self, swiece: Union[CandleBatch, List[Swieca]], nadpisz: bool = False):
+        """Zapisz świece; istniejące daty są pomijane, a przy nadpisz=True - aktualizowane."""
+        if isinstance(swiece, CandleBatch):
+            if not len(swiece):
+                return
+            # Krotki generowane leniwie prosto z tablic NumPy
+            grupy = {swiece.tyker: swiece.wiersze_sql()}
+        else:
+            grupy = {}
+            for s in swiece:
+                grupy.setdefault(s.tyker, []).append(
+                    (s.tyker, s.data, s.otwarcie, s.najwyzszy, s.najnizszy, s.zamkniecie, s.wolumen)
+                )
+
+        for tyker, dane in grupy.items():
+            conn = self.db.pobierz_polaczenie_swiec(tyker)
+            conn.executemany(SQL_UPSERT_SWIEC if nadpisz else SQL_INSERT_SWIEC, dane)
+            conn.commit()
+
+    # Wiersz świecy dekodowany przez np.fromiter prosto do tablicy strukturalnej.
+    # Data 'YYYY-MM-DD' (dłuższe wpisy z czasem są obcinane do 10 znaków), NULL -> NaN
+    _DTYPE_SWIECY = np.dtype([('data', 'S10'), ('otwarcie', 'f8'), ('najwyzszy', 'f8'),
+                              ('najnizszy', 'f8'), ('zamkniecie', 'f8'), ('wolumen', 'f8')])
+
+    @staticmethod
+    def _dekoduj_swiece(tyker: str, wiersze) -> CandleBatch:
+        """Wiersze (data, o, h, l, c, v) z kursora -> CandleBatch bez obiektów pośrednich."""
+        tablica = np.fromiter(wiersze, dtype=RepozytoriumDanych._DTYPE_SWIECY)
+        if not len(tablica):
+            return CandleBatch.pusty(tyker)
+        wolumen = tablica['wolumen']
+        return CandleBatch(
+            tyker,
+            tablica['data'].astype('datetime64[D]'),
+            tablica['otwarcie'],
+            tablica['najwyzszy'],
+            tablica['najnizszy'],
+            tablica['zamkniecie'],
+            np.where(np.isnan(wolumen), 0, wolumen),
+        )
+
+    def pobierz_swiece_np(self, tyker: str) -> CandleBatch:
+        """
+        Pełna historia tykera jako tablice NumPy (rosnąco po dacie) - bez pandas.
+
+        Daty datetime64[D] (int64 dni), ceny float64 (NULL -> NaN), wolumen int64 (NULL -> 0).
+        Ścieżka dla silników wektorowych; DataFrame buduje dopiero pobierz_swiece_df.
+        """
+        conn = self.db.pobierz_polaczenie_swiec(tyker)
+        kursor = conn.execute(
+            "SELECT data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen FROM swiece "
+            "WHERE tyker = ? ORDER BY data ASC", (tyker,)
+        )
+        return self._dekoduj_swiece(tyker, kursor)
 
     def pobierz_swiece_df(self, tyker: str) -> pd.DataFrame:
-        conn = self.db.pobierz_polaczenie()
-        query = "SELECT data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen FROM swiece WHERE tyker = ? ORDER BY data ASC"
-        df = pd.read_sql_query(query, conn, params=(tyker,))
-        if not df.empty:
-            df['data'] = pd.to_datetime(df['data'])
-            df.set_index('data', inplace=True)
-            # Zmiana nazw kolumn na angielskie dla pandasa (ułatwia obliczenia wskaźników, które często polegają na 'close', 'high' itp.)
-            # Lub możemy używać polskich nazw, ale trzeba konsekwentnie.
-            # Decyzja: Użyjemy angielskich nazw kolumn w DataFrame dla zgodności ze standardami (biblioteki ta-lib, pandas-ta itp.), 
-            # ale interfejs repozytorium przyjmuje polskie obiekty.
-            df.columns = ['open', 'high', 'low', 'close', 'volume']
-        return df
-    
+        # Kolumny angielskie (open/high/low/close/volume) - zgodnie ze standardami bibliotek
+        # (ta-lib, pandas-ta itp.), interfejs repozytorium przyjmuje polskie obiekty.
+        # DataFrame powstaje z tablic pobierz_swiece_np (CandleBatch.to_dataframe).
+        return self.pobierz_swiece_np(tyker).to_dataframe()
+
     def pobierz_wszystkie_tykery(self) -> List[str]:
-        conn = self.db.pobierz_polaczenie()
-        c = conn.cursor()
-        c.execute("SELECT DISTINCT tyker FROM swiece ORDER BY tyker")
-        return [row[0] for row in c.fetchall()]
+        tykery = set()
+        for conn in self.db.polaczenia_swiec():
+            tykery.update(row[0] for row in conn.execute("SELECT DISTINCT tyker FROM swiece"))
+        return sorted(tykery)
 
     def pobierz_ostatnia_data(self, tyker: str) -> str:
         """Get the most recent date for a ticker in the database
@@ -48,12 +85,52 @@ class RepozytoriumDanych:
         Returns:
             Latest date as string (YYYY-MM-DD format) or None if ticker not found
         """
-        conn = self.db.pobierz_polaczenie()
+        conn = self.db.pobierz_polaczenie_swiec(tyker)
         c = conn.cursor()
         c.execute("SELECT MAX(data) FROM swiece WHERE tyker = ?", (tyker,))
         result = c.fetchone()
         return result[0] if result and result[0] else None
 
+    def pobierz_ostatnie_swiece(self, tyker: str, n: int) -> CandleBatch:
+        """Ostatnie n świec tykera (rosnąco po dacie) - do porównania z nowym pobraniem."""
+        conn = self.db.pobierz_polaczenie_swiec(tyker)
+        kursor = conn.execute(
+            "SELECT data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen FROM swiece "
+            "WHERE tyker = ? ORDER BY data DESC LIMIT ?", (tyker, n)
+        )
+        swiece = self._dekoduj_swiece(tyker, kursor)
+        # Odwrócenie do kolejności rosnącej (widoki tablic, bez kopii)
+        return CandleBatch(tyker, swiece.daty[::-1], swiece.otwarcie[::-1], swiece.najwyzszy[::-1],
+                           swiece.najnizszy[::-1], swiece.zamkniecie[::-1], swiece.wolumen[::-1])
+
+    def pobierz_pierwsza_data(self, tyker: str) -> str:
+        """Najstarsza data tykera w bazie (YYYY-MM-DD) lub None."""
+        conn = self.db.pobierz_polaczenie_swiec(tyker)
+        result = conn.execute("SELECT MIN(data) FROM swiece WHERE tyker = ?", (tyker,)).fetchone()
+        return result[0][:10] if result and result[0] else None
+
+    def nadpisz_historie_tykera(self, swiece: CandleBatch) -> int:
+        """
+        Zastąp całą historię tykera nowymi świecami (np. po splicie / korekcie dywidendowej).
+
+        Usunięcie i zapis idą w jednej transakcji - przy błędzie stara historia zostaje.
+        Unieważnia też wpisy tykera w cache_wskaznikow (z przyrostami) i stan_wskaznikow.
+
+        Returns:
+            int: Liczba zapisanych świec
+        """
+        conn = self.db.pobierz_polaczenie_swiec(swiece.tyker)
+        with conn:
+            conn.execute("DELETE FROM swiece WHERE tyker = ?", (swiece.tyker,))
+            conn.executemany(SQL_INSERT_SWIEC, swiece.wiersze_sql())
+
+        glowne = self.db.pobierz_polaczenie()
+        glowne.execute("DELETE FROM cache_wskaznikow WHERE tyker = ?", (swiece.tyker,))
+        glowne.execute("DELETE FROM cache_wskaznikow_przyrost WHERE tyker = ?", (swiece.tyker,))
+        glowne.execute("DELETE FROM stan_wskaznikow WHERE tyker = ?", (swiece.tyker,))
+        glowne.commit()
+        return len(swiece)
+
     def czy_ticker_istnieje(self, tyker: str) -> bool:
         """Check if ticker exists in database
 
@@ -63,7 +140,7 @@ class RepozytoriumDanych:
         Returns:
             True if ticker has any data in database
         """
-        conn = self.db.pobierz_polaczenie()
+        conn = self.db.pobierz_polaczenie_swiec(tyker)
         c = conn.cursor()
         c.execute("SELECT COUNT(*) FROM swiece WHERE tyker = ?", (tyker,))
         count = c.fetchone()[0]
@@ -71,7 +148,7 @@ class RepozytoriumDanych:
 
     def usun_dane_tykera(self, tyker: str):
         """Delete all candle data for a specific ticker from database"""
-        conn = self.db.pobierz_polaczenie()
+        conn = self.db.pobierz_polaczenie_swiec(tyker)
         c = conn.cursor()
         c.execute("DELETE FROM swiece WHERE tyker = ?", (tyker,))
         conn.commit()
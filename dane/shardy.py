@@ -0,0 +1,259 @@
+"""
+Shardy - opcjonalny podział tabeli świec na wiele plików SQLite.
+
+Układ (Konfiguracja.LICZBA_SHARDOW):
+  0  -> wszystkie świece w głównej bazie (NAZWA_BAZY), jak dotychczas
+  N  -> tykery rozdzielone funkcją crc32(tyker) % N na pliki
+        <baza>.shard-<i>-of-<N>.db (transakcje, notatki i cache zostają w głównej bazie)
+
+Każdy shard to niezależny plik w trybie WAL:
+  - zapisy różnych shardów mogą iść równolegle z osobnych procesów (zapisz_rownolegle)
+  - odczyty ze skanujących workerów nie blokują się nawzajem (otworz_do_odczytu)
+
+Narzędzia: przeshardyj() - zmiana liczby shardów, scal_shardy() - powrót do jednego pliku.
+"""
+
+import os
+import sqlite3
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from konfiguracja import Konfiguracja
+
+SQL_TABELA_SWIEC = '''
+CREATE TABLE IF NOT EXISTS swiece (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tyker TEXT NOT NULL,
+    data TEXT NOT NULL,
+    otwarcie REAL,
+    najwyzszy REAL,
+    najnizszy REAL,
+    zamkniecie REAL,
+    wolumen INTEGER,
+    UNIQUE(tyker, data)
+)
+'''
+
+SQL_INSERT_SWIEC = '''
+INSERT OR IGNORE INTO swiece (tyker, data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Zapis z nadpisaniem istniejącej świecy (np. poprawiona świeca pobrana w trakcie sesji)
+SQL_UPSERT_SWIEC = '''
+INSERT INTO swiece (tyker, data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(tyker, data) DO UPDATE SET
+    otwarcie   = excluded.otwarcie,
+    najwyzszy  = excluded.najwyzszy,
+    najnizszy  = excluded.najnizszy,
+    zamkniecie = excluded.zamkniecie,
+    wolumen    = excluded.wolumen
+'''
+
+_KOLUMNY = "tyker, data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen"
+
+
+# ─────────────────────────────────────────────
+#   Ścieżki i przydział tykerów
+# ─────────────────────────────────────────────
+
+def numer_sharda(tyker: str, liczba_shardow: int) -> int:
+    """Stabilny (niezależny od PYTHONHASHSEED) numer sharda dla tykera."""
+    return zlib.crc32(tyker.encode('utf-8')) % liczba_shardow
+
+
+def sciezka_glowna(katalog: str = None) -> str:
+    return os.path.join(katalog or os.getcwd(), Konfiguracja.NAZWA_BAZY)
+
+
+def sciezka_sharda(numer: int, liczba_shardow: int, katalog: str = None) -> str:
+    baza, rozszerzenie = os.path.splitext(sciezka_glowna(katalog))
+    return f"{baza}.shard-{numer}-of-{liczba_shardow}{rozszerzenie}"
+
+
+def sciezki_swiec(liczba_shardow: int, katalog: str = None) -> List[str]:
+    """Pliki zawierające świece dla danego układu (0 = główna baza)."""
+    if liczba_shardow <= 0:
+        return [sciezka_glowna(katalog)]
+    return [sciezka_sharda(i, liczba_shardow, katalog) for i in range(liczba_shardow)]
+
+
+def sciezka_dla_tykera(tyker: str, liczba_shardow: int, katalog: str = None) -> str:
+    if liczba_shardow <= 0:
+        return sciezka_glowna(katalog)
+    return sciezka_sharda(numer_sharda(tyker, liczba_shardow), liczba_shardow, katalog)
+
+
+# ─────────────────────────────────────────────
+#   Połączenia
+# ─────────────────────────────────────────────
+
+def otworz_shard(sciezka: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Otwórz (i w razie potrzeby utwórz) plik świec w trybie WAL."""
+    conn = sqlite3.connect(sciezka, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(SQL_TABELA_SWIEC)
+    conn.commit()
+    return conn
+
+
+def otworz_do_odczytu(sciezka: str) -> sqlite3.Connection:
+    """Połączenie tylko do odczytu - dla workerów skanujących w osobnych procesach."""
+    return sqlite3.connect(f"file:{sciezka}?mode=ro", uri=True)
+
+
+# ─────────────────────────────────────────────
+#   Równoległy zapis
+# ─────────────────────────────────────────────
+
+def _zapisz_do_sharda(sciezka: str, batche: list) -> int:
+    """Worker: zapis wszystkich batchy jednego sharda w jednej transakcji."""
+    conn = otworz_shard(sciezka)
+    try:
+        with conn:
+            for batch in batche:
+                conn.executemany(SQL_INSERT_SWIEC, batch.wiersze_sql())
+        return sum(len(b) for b in batche)
+    finally:
+        conn.close()
+
+
+def zapisz_rownolegle(batche: list, liczba_shardow: int = None, procesy: int = None,
+                      katalog: str = None) -> int:
+    """
+    Zapisz wiele CandleBatch równolegle - jeden proces na shard.
+
+    Args:
+        batche: Lista CandleBatch (różne tykery)
+        liczba_shardow: Układ docelowy (domyślnie Konfiguracja.LICZBA_SHARDOW)
+        procesy: Maks. liczba procesów (domyślnie liczba niepustych shardów)
+        katalog: Katalog bazy (domyślnie bieżący)
+
+    Returns:
+        int: Liczba przekazanych świec
+    """
+    if liczba_shardow is None:
+        liczba_shardow = Konfiguracja.LICZBA_SHARDOW
+
+    grupy: Dict[str, list] = {}
+    for batch in batche:
+        if len(batch):
+            grupy.setdefault(sciezka_dla_tykera(batch.tyker, liczba_shardow, katalog), []).append(batch)
+
+    if len(grupy) <= 1 or procesy == 1:
+        return sum(_zapisz_do_sharda(s, b) for s, b in grupy.items())
+
+    with ProcessPoolExecutor(max_workers=procesy or len(grupy)) as pula:
+        futures = [pula.submit(_zapisz_do_sharda, s, b) for s, b in grupy.items()]
+        return sum(f.result() for f in futures)
+
+
+# ─────────────────────────────────────────────
+#   Re-sharding / scalanie
+# ─────────────────────────────────────────────
+
+def _kopiuj(cel: sqlite3.Connection, zrodlo: str, warunek: str = "", parametry: tuple = ()) -> int:
+    """INSERT OR IGNORE wszystkich świec z pliku zrodlo (ATTACH, bez przechodzenia przez Pythona)."""
+    cel.execute("ATTACH DATABASE ? AS zrodlo", (zrodlo,))
+    try:
+        kursor = cel.execute(
+            f"INSERT OR IGNORE INTO swiece ({_KOLUMNY}) SELECT {_KOLUMNY} FROM zrodlo.swiece {warunek}",
+            parametry
+        )
+        cel.commit()
+        return kursor.rowcount
+    finally:
+        cel.execute("DETACH DATABASE zrodlo")
+
+
+def _ma_tabele_swiec(sciezka: str) -> bool:
+    if not os.path.exists(sciezka):
+        return False
+    conn = sqlite3.connect(sciezka)
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='swiece'"
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def przeshardyj(nowa_liczba: int, stara_liczba: int = None, katalog: str = None,
+                usun_stare: bool = False) -> Dict[str, int]:
+    """
+    Rozłóż świece z obecnego układu na nowa_liczba shardów.
+
+    Po zakończeniu ustaw Konfiguracja.LICZBA_SHARDOW = nowa_liczba.
+
+    Returns:
+        dict {ścieżka_nowego_sharda: liczba_skopiowanych_świec}
+    """
+    if nowa_liczba <= 0:
+        raise ValueError("nowa_liczba musi być > 0 (do jednego pliku użyj scal_shardy)")
+    if stara_liczba is None:
+        stara_liczba = Konfiguracja.LICZBA_SHARDOW
+    if stara_liczba == nowa_liczba:
+        return {}
+
+    zrodla = [s for s in sciezki_swiec(stara_liczba, katalog) if _ma_tabele_swiec(s)]
+    wynik = {}
+    for numer, sciezka in enumerate(sciezki_swiec(nowa_liczba, katalog)):
+        conn = otworz_shard(sciezka)
+        conn.create_function("numer_sharda", 2, numer_sharda, deterministic=True)
+        try:
+            wynik[sciezka] = sum(
+                _kopiuj(conn, zrodlo, "WHERE numer_sharda(tyker, ?) = ?", (nowa_liczba, numer))
+                for zrodlo in zrodla
+            )
+        finally:
+            conn.close()
+
+    if usun_stare:
+        _usun_swiece(stara_liczba, katalog)
+    return wynik
+
+
+def scal_shardy(liczba_shardow: int = None, katalog: str = None, usun_shardy: bool = False) -> int:
+    """
+    Scal wszystkie shardy z powrotem do tabeli świec w głównej bazie.
+
+    Po zakończeniu ustaw Konfiguracja.LICZBA_SHARDOW = 0.
+
+    Returns:
+        int: Liczba skopiowanych świec
+    """
+    if liczba_shardow is None:
+        liczba_shardow = Konfiguracja.LICZBA_SHARDOW
+    if liczba_shardow <= 0:
+        return 0
+
+    conn = otworz_shard(sciezka_glowna(katalog))
+    try:
+        skopiowane = sum(
+            _kopiuj(conn, s) for s in sciezki_swiec(liczba_shardow, katalog) if _ma_tabele_swiec(s)
+        )
+    finally:
+        conn.close()
+
+    if usun_shardy:
+        _usun_swiece(liczba_shardow, katalog)
+    return skopiowane
+
+
+def _usun_swiece(liczba_shardow: int, katalog: Optional[str]):
+    """Usuń stary układ: pliki shardów lub tabelę świec głównej bazy."""
+    if liczba_shardow <= 0:
+        conn = sqlite3.connect(sciezka_glowna(katalog))
+        try:
+            conn.execute("DELETE FROM swiece")
+            conn.commit()
+        finally:
+            conn.close()
+        return
+    for sciezka in sciezki_swiec(liczba_shardow, katalog):
+        for plik in (sciezka, sciezka + "-wal", sciezka + "-shm"):
+            if os.path.exists(plik):
+                os.remove(plik)
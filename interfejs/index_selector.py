@@ -157,14 +157,14 @@ class IndexSelector(QWidget):
             v = validation.get(index_def.id, {})
             available = v.get('valid', False)
 
+            count = self.index_manager.get_stock_count(index_def.id)
+
             if index_def.requires_download:
                 if available:
-                    count = v.get('ticker_count', index_def.stock_count)
                     label = f"{index_def.name} ({count:,} spółek, ~{index_def.estimated_time_min}min) ✅"
                 else:
-                    label = f"{index_def.name} (~{index_def.stock_count:,} spółek) ⬇ wymaga pobrania"
+                    label = f"{index_def.name} (~{count:,} spółek) ⬇ wymaga pobrania"
             else:
-                count = v.get('ticker_count', index_def.stock_count) if available else index_def.stock_count
                 label = f"{index_def.name} ({count:,} spółek, ~{index_def.estimated_time_min}min)"
 
             self.index_combo.addItem(label, index_def.id)
@@ -191,8 +191,7 @@ class IndexSelector(QWidget):
             return
 
         # requires_download=True
-        validation = self.index_manager.validate_index_files()
-        v = validation.get(index_id, {})
+        v = self.index_manager.validate_index(index_id)
 
         if v.get('valid'):
             count = v.get('ticker_count', '?')
@@ -310,12 +309,14 @@ class IndexSelector(QWidget):
         if not index_def:
             return
 
-        validation = self.index_manager.validate_index_files()
-        status = validation.get(index_id, {})
+        status = self.index_manager.validate_index(index_id)
 
         info = f"Indeks: {index_def.name}\n"
         info += f"Opis: {index_def.description}\n"
-        info += f"Szacowana liczba spółek: ~{index_def.stock_count:,}\n"
+        if status.get('valid'):
+            info += f"Liczba spółek: {status.get('ticker_count', 0):,}\n"
+        else:
+            info += f"Szacowana liczba spółek: ~{index_def.stock_count:,}\n"
         info += f"Szacowany czas skanowania: ~{index_def.estimated_time_min} minut\n"
         info += f"Plik CSV: {index_def.csv_filename}\n"
 
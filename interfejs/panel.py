@@ -12,6 +12,7 @@ from konfiguracja import Konfiguracja
 from dane.repozytorium import RepozytoriumDanych
 from analiza.rezim import SilnikRezimu, MarketRegime
 from analiza.ranking import RankingEngine
+from analiza.cache_wskaznikow import CacheWskaznikow
 from analiza.top1_engine import SilnikDecyzyjny
 from dane.importer import ImporterDanych
 from ryzyko.position_sizing import PositionSizing
@@ -20,6 +21,7 @@ class PanelStartowy(QWidget):
     def __init__(self):
         super().__init__()
         self.repo = RepozytoriumDanych()
+        self.cache_wskaznikow = CacheWskaznikow()
         self.data_loaded = False  # Track if data has been loaded
         self.inicjalizuj_ui()
         # Lazy load - defer data loading to allow UI to render first
@@ -211,7 +213,7 @@ class PanelStartowy(QWidget):
 
             # ===== 3. GENERATE RANKING (v2.0 with Composite Score) =====
             self._show_progress(f"Obliczanie rankingu dla {len(dane_map)} spółek...")
-            ranking_df = RankingEngine.generuj_ranking(dane_map, df_bench)
+            ranking_df = RankingEngine.generuj_ranking(dane_map, df_bench, cache=self.cache_wskaznikow)
 
             # ===== 4. POPULATE TOP 5 TIER A =====
             self.wypelnij_top5(ranking_df)
@@ -312,12 +314,16 @@ class PanelStartowy(QWidget):
             tyker_clean = tyker.upper().strip()
             self._show_progress(f"Pobieranie danych dla {tyker_clean} z Yahoo Finance...")
             try:
-                swiece = ImporterDanych.pobierz_yfinance(tyker_clean)
-                if swiece:
-                    self._show_progress(f"Zapisywanie {len(swiece)} świec dla {tyker_clean}...")
-                    self.repo.zapisz_swiece(swiece)
+                # Przyrost od ostatnich zapisanych świec; przy splicie/dywidendzie historia jest nadpisywana
+                wynik = ImporterDanych.aktualizuj_tykera(tyker_clean, self.repo)
+                if wynik['tryb'] != 'brak':
                     self.odswiez_dane()
-                    QMessageBox.information(self, "Sukces", f"Pobrano {len(swiece)} świec dla {tyker_clean}. Panel został odświeżony.")
+                    opis = {
+                        'pelny': f"Pobrano {wynik['liczba_swiec']} świec",
+                        'przyrost': f"Dopisano {wynik['liczba_swiec']} nowych świec",
+                        'korekta': f"Wykryto korektę cen (split/dywidenda) - przepisano {wynik['liczba_swiec']} świec",
+                    }[wynik['tryb']]
+                    QMessageBox.information(self, "Sukces", f"{opis} dla {tyker_clean}. Panel został odświeżony.")
                 else:
                     QMessageBox.warning(self, "Brak Danych", f"Nie udało się pobrać danych dla {tyker_clean}. Sprawdź symbol tickera.")
             except Exception as e:
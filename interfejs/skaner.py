@@ -33,7 +33,8 @@ import matplotlib.dates as mdates
 from datetime import datetime
 from dane.repozytorium import RepozytoriumDanych
 from analiza.ranking import RankingEngine
-from analiza.wskazniki import SilnikWskaznikow
+from analiza.cache_wskaznikow import CacheWskaznikow
+from analiza.rejestr_wskaznikow import RejestrWskaznikow
 from konfiguracja import Konfiguracja
 
 class SkanerWidok(QWidget):
@@ -61,6 +62,7 @@ class SkanerWidok(QWidget):
     def __init__(self):
         super().__init__()
         self.repo = RepozytoriumDanych()
+        self.cache_wskaznikow = CacheWskaznikow()
         self.ranking_df = None
         self.full_ranking_df = None
 
@@ -123,6 +125,14 @@ class SkanerWidok(QWidget):
         self.combo_status.currentIndexChanged.connect(self.on_status_changed)
         uklad_btn.addWidget(self.combo_status)
 
+        # Benchmark RS - przełączany bez ponownego skanu (MacierzRS)
+        uklad_btn.addWidget(QLabel("RS vs:"))
+        self.combo_benchmark = QComboBox()
+        self.combo_benchmark.addItems(Konfiguracja.BENCHMARKI_RS)
+        self.combo_benchmark.setCurrentText(Konfiguracja.TYKER_BENCHMARK)
+        self.combo_benchmark.currentTextChanged.connect(self.on_benchmark_changed)
+        uklad_btn.addWidget(self.combo_benchmark)
+
         # NEW: Copy and Export buttons
         uklad_btn.addWidget(QLabel("|"))
         btn_copy = QPushButton("Copy")
@@ -431,6 +441,12 @@ class SkanerWidok(QWidget):
             print(f"⚠️ WARNING: Benchmark {benchmark} failed to load or is empty!")
             print("RS metrics will use default values (RS_Ratio=1.0, RS_Slope=0.0)")
 
+        benchmarki = {}
+        for symbol in Konfiguracja.BENCHMARKI_RS:
+            df_b = df_bench if symbol == benchmark else self.repo.pobierz_swiece_df(symbol)
+            if df_b is not None and not df_b.empty:
+                benchmarki[symbol] = df_b
+
         dane_map = {}
         for i, t in enumerate(tykery):
             self.progress_bar.setValue(i + 1)
@@ -446,7 +462,10 @@ class SkanerWidok(QWidget):
         QApplication.processEvents()
 
         # Use new RankingEngine v2.0
-        ranking_df = RankingEngine.generuj_ranking(dane_map, df_bench)
+        ranking_df = RankingEngine.generuj_ranking(dane_map, df_bench, cache=self.cache_wskaznikow,
+                                                   benchmarki=benchmarki)
+        if self.combo_benchmark.currentText() != benchmark:
+            ranking_df = RankingEngine.przelacz_benchmark(ranking_df, self.combo_benchmark.currentText())
 
         # Hide progress bar
         self.progress_bar.setValue(total + 1)
@@ -505,6 +524,7 @@ class SkanerWidok(QWidget):
             # Usuń też notatkę i wyczyść cache
             self.repo.usun_notatke_skanera(ticker)
             self._notatki.pop(ticker, None)
+            self.cache_wskaznikow.uniewaznij(ticker)
 
             # Show success message
             QMessageBox.information(
@@ -722,6 +742,13 @@ class SkanerWidok(QWidget):
         check_slope = "✅" if slope_ok else "❌"
         check_rs = "✅" if rs_ok else "❌"
 
+        # Wskaźniki rejestru (RSI, MACD, ADX, ...) - kolumny z RejestrWskaznikow.dolacz
+        wiersze_rejestru = "".join(
+            f"<tr><td style='padding: 3px;' title='{RejestrWskaznikow.definicja(nazwa).opis}'>{nazwa}:</td>"
+            f"<td style='padding: 3px; text-align: right;'><b>{ostatni[nazwa]:.2f}</b></td></tr>"
+            for nazwa in RejestrWskaznikow.nazwy() if nazwa in ostatni.index
+        )
+
         # Format metrics text
         tekst = f"""
         <div style='padding: 10px;'>
@@ -745,6 +772,7 @@ class SkanerWidok(QWidget):
             <tr><td style='padding: 3px;'>Momentum 6M:</td><td style='padding: 3px; text-align: right;'><b>{ostatni.get('Mom6M', 0):.2%}</b></td></tr>
             <tr><td style='padding: 3px;'>RS Ratio:</td><td style='padding: 3px; text-align: right;'><b>{ostatni.get('RS_Ratio', 0):.3f}</b></td></tr>
             <tr><td style='padding: 3px;'>RS Slope:</td><td style='padding: 3px; text-align: right;'><b>{ostatni.get('RS_Slope', 0):.2f}%</b></td></tr>
+            {wiersze_rejestru}
         </table>
         </div>
         """
@@ -778,8 +806,8 @@ class SkanerWidok(QWidget):
             self.plotno.draw()
             return
 
-        # Calculate indicators
-        df = SilnikWskaznikow.oblicz_wskazniki(df, bench_df)
+        # Calculate indicators (+ wskaźniki rejestru do panelu szczegółów)
+        df = RejestrWskaznikow.dolacz(self.cache_wskaznikow.oblicz(ticker, df, bench_df))
 
         self.progress_bar.setRange(0, 1)  # Back to determinate
         self.progress_bar.setValue(1)
@@ -952,6 +980,13 @@ class SkanerWidok(QWidget):
         self.ranking_df = filtered_df
         self.wypelnij_tabele(filtered_df)
 
+    def on_benchmark_changed(self, benchmark):
+        """Przelicz Status / ChecklistScore z RS wobec wybranego benchmarku (bez ponownego skanu)"""
+        if self.full_ranking_df is None or self.full_ranking_df.empty:
+            return
+        self.full_ranking_df = RankingEngine.przelacz_benchmark(self.full_ranking_df, benchmark)
+        self.on_status_changed(self.combo_status.currentIndex())
+
     def on_status_changed(self, index):
         """Handle status filter change - works with search filter"""
         if self.full_ranking_df is None or self.full_ranking_df.empty:
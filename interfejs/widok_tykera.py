@@ -6,7 +6,8 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.dates as mdates
 from dane.repozytorium import RepozytoriumDanych
-from analiza.wskazniki import SilnikWskaznikow
+from analiza.cache_wskaznikow import CacheWskaznikow
+from analiza.rejestr_wskaznikow import RejestrWskaznikow
 from konfiguracja import Konfiguracja
 import pandas as pd
 
@@ -14,6 +15,7 @@ class WidokTykera(QWidget):
     def __init__(self):
         super().__init__()
         self.repo = RepozytoriumDanych()
+        self.cache_wskaznikow = CacheWskaznikow()
         self.biezacy_tyker = None
         self.inicjalizuj_ui()
         
@@ -88,7 +90,7 @@ class WidokTykera(QWidget):
         # Obliczanie wskaźników
         self.lbl_loading.setText(f"Obliczanie wskaźników dla {tyker}...")
         QApplication.processEvents()
-        df = SilnikWskaznikow.oblicz_wskazniki(df, bench_df)
+        df = RejestrWskaznikow.dolacz(self.cache_wskaznikow.oblicz(tyker, df, bench_df))
 
         self.progress_bar.setVisible(False)
         self.lbl_loading.setVisible(False)
@@ -239,4 +241,9 @@ class WidokTykera(QWidget):
         <span style='color: {color_rs_ratio}; font-weight: bold;'>RS Ratio: {rs_ratio:.3f}</span> <span style='color: #666; font-size: 10px;'>({thresh_rs_ratio})</span><br>
         <span style='color: {color_rs_slope}; font-weight: bold;'>RS Slope: {rs_slope:.2f}%</span> <span style='color: #666; font-size: 10px;'>({thresh_rs_slope})</span><br>
         """
+        # Wskaźniki rejestru (RSI, MACD, ADX, ...) dołączone w zaladuj_tykera
+        for nazwa in RejestrWskaznikow.nazwy():
+            if nazwa in ostatni.index:
+                tekst += (f"<span style='font-weight: bold;'>{nazwa}: {ostatni[nazwa]:.2f}</span> "
+                          f"<span style='color: #666; font-size: 10px;'>({RejestrWskaznikow.definicja(nazwa).opis})</span><br>")
         self.lbl_detale.setText(tekst)
@@ -1,6 +1,7 @@
 class Konfiguracja:
     # Baza Danych
     NAZWA_BAZY = "dane_rynkowe_v2.db"
+    LICZBA_SHARDOW = 0  # 0 = świece w NAZWA_BAZY; N > 0 = świece w N plikach (dane/shardy.py)
 
     # Wskaźniki
     SMA_SZYBKA = 50
@@ -9,6 +10,17 @@ class Konfiguracja:
     MOMENTUM_KROTKIE = 63  # 3 miesiące
     MOMENTUM_DLUGIE = 126  # 6 miesięcy
     OKRES_NACHYLENIA = 20  # Dni do regresji liniowej
+    OKRES_WOLUMENU = 20  # Średni wolumen / RVol / średni obrót w $ (Vol_SMA20, RVol, DollarVol20)
+    OKRES_WOLUMENU_DLUGI = 50  # Średni wolumen i stosunek wolumenu wzrostów do spadków (Vol_SMA50, UpDown_Vol)
+    # Wskaźniki z RejestrWskaznikow (liczone tylko na żądanie)
+    OKRES_RSI = 14
+    MACD_SZYBKA = 12
+    MACD_WOLNA = 26
+    MACD_SYGNAL = 9
+    OKRES_BOLLINGER = 20
+    BOLLINGER_ODCHYLENIE = 2
+    OKRES_ADX = 14
+    TRYB_KOMPAKTOWY = False  # True = wskaźniki float32, Status/Tier/Tyker jako category (analiza/typy_kompaktowe.py)
 
     # Slope Metrics (nowe)
     SLOPE_WINDOW = 20  # Okno regresji do nachylenia
@@ -28,6 +40,7 @@ class Konfiguracja:
 
     # Reżim Rynkowy
     TYKER_BENCHMARK = "SPY"
+    BENCHMARKI_RS = ["SPY", "QQQ", "IWM"]  # RS liczony wobec wszystkich naraz (analiza/macierz_rs.py)
     BREADTH_STRONG_BULL_THRESHOLD = 0.75  # 75% spółek >200MA dla STRONG_BULL
     BREADTH_STRONG_BEAR_THRESHOLD = 0.25  # 25% spółek >200MA dla STRONG_BEAR
 
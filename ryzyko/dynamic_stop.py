@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 from enum import Enum
 from konfiguracja import Konfiguracja
+from analiza.kernele import last_min
 
 
 class StopMethod(Enum):
@@ -124,9 +125,8 @@ class DynamicStop:
         if df.empty or 'low' not in df.columns or len(df) < lookback:
             return 0.0
 
-        # Szukaj najniższego low'u w ostatnich lookback świecach
-        recent_lows = df['low'].iloc[-lookback:]
-        structure_low = recent_lows.min()
+        # Szukaj najniższego low'u w ostatnich lookback świecach (NaN pomijane)
+        structure_low = last_min(df['low'], lookback, skipna=True)
 
         if pd.isna(structure_low):
             return 0.0
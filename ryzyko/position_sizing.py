@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 from enum import Enum
 from konfiguracja import Konfiguracja
+from analiza.kernele import percentile_rank
 
 
 class PositionSizingMode(Enum):
@@ -73,7 +74,8 @@ class PositionSizing:
                                      atr_percentile: float = None,
                                      entry_price: float = None,
                                      stop_loss: float = None,
-                                     atr_value: float = None) -> dict:
+                                     atr_value: float = None,
+                                     atr_history: pd.Series = None) -> dict:
         """
         Oblicza position sizing dostosowany do zmienności.
         Wyższa zmienność = mniejsza pozycja, niższa zmienność = większa pozycja.
@@ -90,6 +92,8 @@ class PositionSizing:
             entry_price: Cena wejścia
             stop_loss: Cena stop loss'u
             atr_value: Wartość ATR (opcjonalne - alternatywa do percentile)
+            atr_history: Historia ATR - gdy brak atr_percentile, percentyl ostatniego ATR
+                liczony z ostatnich ATR_PERCENTILE_LOOKBACK wartości
 
         Returns:
             dict: {
@@ -100,6 +104,11 @@ class PositionSizing:
                 'adjusted_risk_percent': float
             }
         """
+        if atr_percentile is None and atr_history is not None and len(atr_history) > 0:
+            historia = np.asarray(atr_history, dtype=np.float64)[-Konfiguracja.ATR_PERCENTILE_LOOKBACK:]
+            if not np.isnan(historia[-1]):
+                atr_percentile = percentile_rank(historia, historia[-1])
+
         if atr_percentile is None:
             atr_percentile = 50.0
 
@@ -194,7 +203,8 @@ class PositionSizing:
                  entry_price: float = None, stop_loss: float = None,
                  atr_percentile: float = None,
                  win_rate: float = None, avg_win: float = None, avg_loss: float = None,
-                 atr_multiple: float = Konfiguracja.MULTIPLE_ATR_FOR_STOP) -> dict:
+                 atr_multiple: float = Konfiguracja.MULTIPLE_ATR_FOR_STOP,
+                 atr_history: pd.Series = None) -> dict:
         """
         Uniwersalna metoda do obliczania position sizing'u.
 
@@ -209,6 +219,7 @@ class PositionSizing:
             avg_win: Średnia wygrana (dla kelly_fraction)
             avg_loss: Średnia strata (dla kelly_fraction)
             atr_multiple: Mnożnik ATR (dla obliczania stop loss'u)
+            atr_history: Historia ATR (dla volatility_adjusted, gdy brak atr_percentile)
 
         Returns:
             dict: Wynik position sizing'u
@@ -225,7 +236,8 @@ class PositionSizing:
 
         elif mode == 'volatility_adjusted':
             return PositionSizing.calculate_volatility_adjusted(
-                account_size, risk_percent, atr_percentile, entry_price, stop_loss
+                account_size, risk_percent, atr_percentile, entry_price, stop_loss,
+                atr_history=atr_history
             )
 
         elif mode == 'kelly_fraction':
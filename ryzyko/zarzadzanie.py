@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from konfiguracja import Konfiguracja
 import pandas as pd
+from analiza.kernele import last_min
 
 @dataclass
 class WynikPozycji:
@@ -74,7 +75,7 @@ class ZarzadzanieRyzykiem:
             
         elif metoda == "LOWEST_LOW":
             # Najniższy dołek z ostatnich 10 dni
-            return df['low'].tail(10).min()
+            return last_min(df['low'], min(10, len(df)), skipna=True)
             
         return 0.0
 
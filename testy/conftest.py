@@ -0,0 +1,28 @@
+"""
+Wspólne pomocniki testów.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def ramka_ohlcv(n=300, seed=5, start='2019-01-01', dryf=0.0004, zmiennosc=0.012) -> pd.DataFrame:
+    """
+    Losowe świece OHLCV (błądzenie losowe cen, dni robocze od start).
+
+    Args:
+        n: Liczba świec
+        seed: Ziarno generatora (ta sama ramka dla tych samych argumentów)
+        start: Data pierwszej świecy
+        dryf: Średni dzienny log-zwrot
+        zmiennosc: Odchylenie standardowe dziennego log-zwrotu
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(dryf, zmiennosc, n)))
+    return pd.DataFrame({
+        'open': close * 0.999,
+        'high': close * (1 + rng.uniform(0, 0.02, n)),
+        'low': close * (1 - rng.uniform(0, 0.02, n)),
+        'close': close,
+        'volume': rng.integers(1000, 5000, n).astype(float),
+    }, index=pd.bdate_range(start, periods=n, name='data'))
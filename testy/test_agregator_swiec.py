@@ -0,0 +1,166 @@
+"""
+Testy dla strumieniowej agregacji transakcji do świec (dane/agregator_swiec.py).
+"""
+
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dane.agregator_swiec import (AgregatorSwiec, importuj_strumieniowo, parsuj_czas, polacz_batche,
+                                  strumien_swiec, zgadnij_format_czasu)
+from dane.baza import BazaDanych
+from dane.repozytorium import RepozytoriumDanych
+
+
+@pytest.fixture
+def repo():
+    """Repozytorium na bazie w pamięci (singleton BazaDanych przełączony na :memory:)"""
+    baza = BazaDanych()
+    baza.polaczenie = sqlite3.connect(':memory:')
+    baza.utworz_tabele()
+    yield RepozytoriumDanych()
+    baza.polaczenie.close()
+    baza.polaczenie = None
+
+
+def _transakcje(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    czas = pd.Timestamp('2024-01-02 09:30').to_datetime64() + np.cumsum(
+        rng.integers(1, 600, n)).astype('timedelta64[s]')
+    cena = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    wolumen = rng.integers(1, 100, n)
+    return pd.DataFrame({'czas': czas.astype('datetime64[ns]'), 'cena': cena, 'wolumen': wolumen})
+
+
+def _oczekiwane(df):
+    """Referencja: dzienny pandas resample całego pliku naraz"""
+    seria = df.set_index('czas')
+    wynik = seria['cena'].resample('D').ohlc()
+    wynik['volume'] = seria['wolumen'].resample('D').sum()
+    return wynik.dropna()
+
+
+def _agreguj_porcjami(df, rozmiary, interwal='1D'):
+    agregator = AgregatorSwiec('TEST', interwal)
+    batche, i = [], 0
+    for rozmiar in rozmiary:
+        p = df.iloc[i:i + rozmiar]
+        batche.append(agregator.dodaj_transakcje(p['czas'], p['cena'], p['wolumen']))
+        i += rozmiar
+    batche.append(agregator.zakoncz())
+    return polacz_batche(batche).to_dataframe()
+
+
+class TestAgregatorSwiec:
+    """Test suite dla AgregatorSwiec"""
+
+    @pytest.mark.parametrize('rozmiary', [[5000], [1] * 50 + [4950], [7, 333, 1000, 2500, 1160], [2500, 2500]])
+    def test_zgodny_z_resample_niezaleznie_od_porcji(self, rozmiary):
+        df = _transakcje()
+        wynik = _agreguj_porcjami(df, rozmiary)
+        oczekiwane = _oczekiwane(df)
+
+        assert np.array_equal(wynik.index.normalize(), oczekiwane.index)
+        for kolumna in ('open', 'high', 'low', 'close'):
+            assert np.allclose(wynik[kolumna].to_numpy(), oczekiwane[kolumna].to_numpy())
+        assert np.array_equal(wynik['volume'].to_numpy(), oczekiwane['volume'].to_numpy())
+
+    def test_otwarta_swieca_przechodzi_miedzy_porcjami(self):
+        agregator = AgregatorSwiec('TEST')
+        dzien = np.datetime64('2024-01-02T10:00', 'ns')
+        pierwsza = agregator.dodaj_transakcje([dzien], [10.0], [5])
+        assert len(pierwsza) == 0
+        druga = agregator.dodaj_transakcje([dzien + np.timedelta64(1, 'h'), dzien + np.timedelta64(1, 'D')],
+                                           [12.0, 11.0], [3, 1])
+        assert len(druga) == 1
+        swieca = druga[0]
+        assert (swieca.otwarcie, swieca.najwyzszy, swieca.najnizszy, swieca.zamkniecie, swieca.wolumen) == \
+               (10.0, 12.0, 10.0, 12.0, 8)
+        assert agregator.otwarta[1] == 11.0
+
+    def test_spoznione_wpisy_pomijane(self):
+        agregator = AgregatorSwiec('TEST')
+        agregator.dodaj_transakcje(np.array(['2024-01-02T10:00', '2024-01-03T10:00'], dtype='datetime64[ns]'),
+                                   [10.0, 11.0], [1, 1])
+        agregator.dodaj_transakcje(np.array(['2024-01-02T15:00'], dtype='datetime64[ns]'), [99.0], [1])
+        assert agregator.odrzucone == 1
+        assert agregator.zakoncz().najwyzszy[0] == 11.0
+
+    def test_swiece_minutowe(self):
+        czas = np.array(['2024-01-02T09:30', '2024-01-02T09:31', '2024-01-03T09:30'], dtype='datetime64[ns]')
+        agregator = AgregatorSwiec('TEST')
+        zamkniete = agregator.dodaj_swiece(czas, [10, 11, 20], [12, 15, 21], [9, 10, 19], [11, 14, 20], [100, 50, 7])
+        assert list(zamkniete.daty) == [np.datetime64('2024-01-02')]
+        assert (zamkniete.otwarcie[0], zamkniete.najwyzszy[0], zamkniete.najnizszy[0],
+                zamkniete.zamkniecie[0], zamkniete.wolumen[0]) == (10, 15, 9, 14, 150)
+
+    def test_tygodnie_od_poniedzialku(self):
+        df = _transakcje()
+        wynik = _agreguj_porcjami(df, [1234, 3766], interwal='7D')
+        assert (wynik.index.dayofweek == 0).all()
+        assert wynik['volume'].sum() == df['wolumen'].sum()
+
+    def test_interwal_krotszy_niz_doba(self):
+        with pytest.raises(ValueError):
+            AgregatorSwiec('TEST', '1h')
+
+
+class TestImportStrumieniowy:
+    """Test suite dla importu plików transakcji do bazy"""
+
+    def test_plik_wielu_tykerow_do_bazy(self, tmp_path, repo):
+        a, b = _transakcje(3000, seed=1), _transakcje(2000, seed=2)
+        a['symbol'], b['symbol'] = 'AAA', 'BBB'
+        plik = pd.concat([a, b]).sort_values('czas', kind='stable')
+        sciezka = tmp_path / 'trades.csv'
+        plik.rename(columns={'czas': 'timestamp', 'cena': 'price', 'wolumen': 'size'}).to_csv(sciezka, index=False)
+
+        statystyki = importuj_strumieniowo(str(sciezka), repo, rozmiar_porcji=700, rozmiar_zapisu=10)
+
+        assert statystyki['wpisy'] == 5000
+        assert statystyki['tykery'] == 2
+        for tyker, df in (('AAA', a), ('BBB', b)):
+            zapisane = repo.pobierz_swiece_df(tyker)
+            oczekiwane = _oczekiwane(df)
+            assert len(zapisane) == len(oczekiwane)
+            assert np.allclose(zapisane['close'].to_numpy(), oczekiwane['close'].to_numpy())
+            assert zapisane['volume'].sum() == df['wolumen'].sum()
+
+    def test_plik_bez_symbolu_wymaga_tykera(self, tmp_path):
+        sciezka = tmp_path / 'trades.csv'
+        _transakcje(10).to_csv(sciezka, index=False)
+        with pytest.raises(ValueError):
+            list(strumien_swiec(str(sciezka)))
+        assert sum(len(b) for b in strumien_swiec(str(sciezka), tyker='AAA')) > 0
+
+    def test_format_czasu_zgadniety_raz(self, tmp_path):
+        """Format z pierwszej porcji; wartości w innym formacie -> powrót do 'mixed'"""
+        df = _transakcje(300, seed=3)
+        sciezka = tmp_path / 'trades.csv'
+        df.to_csv(sciezka, index=False)
+        oczekiwane = polacz_batche(list(strumien_swiec(str(sciezka), tyker='AAA', format_czasu='mixed')))
+
+        inny_format = df.astype({'czas': str})
+        inny_format.loc[250:, 'czas'] = df['czas'].iloc[250:].dt.strftime('%m/%d/%Y %H:%M:%S')
+        inny_format.to_csv(sciezka, index=False)
+
+        for format_czasu in (None, 'mixed'):
+            batch = polacz_batche(list(strumien_swiec(str(sciezka), tyker='AAA', rozmiar_porcji=100,
+                                                      format_czasu=format_czasu)))
+            assert np.array_equal(batch.daty, oczekiwane.daty)
+            assert np.array_equal(batch.zamkniecie, oczekiwane.zamkniecie)
+        with pytest.raises(ValueError):
+            list(strumien_swiec(str(sciezka), tyker='AAA', format_czasu='%Y-%m-%d %H:%M:%S'))
+
+    def test_zgadnij_format(self):
+        assert zgadnij_format_czasu(pd.Series([None, '2024-01-02 09:30:00'])) == '%Y-%m-%d %H:%M:%S'
+        assert zgadnij_format_czasu(['nie data']) == 'mixed'
+        daty, uzyty = parsuj_czas(np.array(['2024-01-02T09:30', '01/03/2024 10:00']))
+        assert uzyty == 'mixed'
+        assert list(daty) == [pd.Timestamp('2024-01-02 09:30'), pd.Timestamp('2024-01-03 10:00')]
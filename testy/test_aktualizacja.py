@@ -0,0 +1,112 @@
+"""
+Testy przyrostowej aktualizacji tykera z wykrywaniem korekt (split / dywidenda).
+"""
+
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dane.baza import BazaDanych
+from dane.importer import ImporterDanych
+from dane.modele import CandleBatch
+from dane.repozytorium import RepozytoriumDanych
+
+START = np.datetime64('2024-01-01')
+
+
+def _batch(tyker, od, n, skala=1.0):
+    daty = np.arange(START + od, START + od + n)
+    ceny = (100.0 + np.arange(od, od + n)) * skala
+    return CandleBatch(tyker, daty, ceny, ceny + 1, ceny - 1, ceny, np.full(n, 1000))
+
+
+@pytest.fixture
+def repo():
+    baza = BazaDanych()
+    baza.polaczenie = sqlite3.connect(':memory:')
+    baza.utworz_tabele()
+    yield RepozytoriumDanych()
+    baza.polaczenie.close()
+    baza.polaczenie = None
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    """Podmienia pobierz_yfinance na źródło z ustaloną 'pełną historią'"""
+    stan = {'historia': _batch('AAA', 0, 30), 'wywolania': []}
+
+    def _pobierz(tyker, okres="2y", interwal="1d", start=None):
+        stan['wywolania'].append(start)
+        h = stan['historia']
+        if start is None:
+            return h
+        maska = h.daty >= np.datetime64(start)
+        return CandleBatch(tyker, h.daty[maska], h.otwarcie[maska], h.najwyzszy[maska],
+                           h.najnizszy[maska], h.zamkniecie[maska], h.wolumen[maska])
+
+    monkeypatch.setattr(ImporterDanych, 'pobierz_yfinance', staticmethod(_pobierz))
+    return stan
+
+
+class TestAktualizacja:
+    """Test suite dla ImporterDanych.aktualizuj_tykera"""
+
+    def test_wykryj_korekte(self):
+        zapisane = _batch('AAA', 20, 5)
+        assert not ImporterDanych.wykryj_korekte(zapisane, _batch('AAA', 20, 10))
+        assert ImporterDanych.wykryj_korekte(zapisane, _batch('AAA', 20, 10, skala=0.5))
+        # Brak wspólnych dat - nie ma czego porównać
+        assert not ImporterDanych.wykryj_korekte(zapisane, _batch('AAA', 40, 5, skala=0.5))
+
+    def test_pierwsze_pobranie_pelne(self, repo, yahoo):
+        wynik = ImporterDanych.aktualizuj_tykera('AAA', repo)
+        assert wynik == {'tryb': 'pelny', 'liczba_swiec': 30}
+        assert yahoo['wywolania'] == [None]
+
+    def test_przyrost(self, repo, yahoo):
+        """Bez korekty pobierany jest tylko ogon od nakładki"""
+        repo.zapisz_swiece(_batch('AAA', 0, 25))
+        wynik = ImporterDanych.aktualizuj_tykera('AAA', repo, nakladka=5)
+
+        assert wynik == {'tryb': 'przyrost', 'liczba_swiec': 5}
+        assert yahoo['wywolania'] == [str(START + 20)]
+        assert len(repo.pobierz_swiece_df('AAA')) == 30
+
+    def test_korekta_przepisuje_historie(self, repo, yahoo):
+        """Split -> cała historia tykera nadpisana, cache unieważniony"""
+        repo.zapisz_swiece(_batch('AAA', 0, 25))
+        repo.zapisz_swiece(_batch('BBB', 0, 25))
+        conn = BazaDanych().pobierz_polaczenie()
+        conn.execute("INSERT INTO cache_wskaznikow VALUES ('AAA', '', 0, '', '', '', x'00')")
+
+        yahoo['historia'] = _batch('AAA', 0, 30, skala=0.5)
+        wynik = ImporterDanych.aktualizuj_tykera('AAA', repo)
+
+        assert wynik == {'tryb': 'korekta', 'liczba_swiec': 30}
+        df = repo.pobierz_swiece_df('AAA')
+        assert len(df) == 30
+        assert df['close'].iloc[0] == 50.0
+        assert len(repo.pobierz_swiece_df('BBB')) == 25
+        assert conn.execute("SELECT COUNT(*) FROM cache_wskaznikow").fetchone()[0] == 0
+
+    def test_poprawiona_ostatnia_swieca_bez_korekty(self, repo, yahoo):
+        """Niepełna ostatnia świeca poprawiona przez dostawcę -> nadpisana, historia i cache bez zmian"""
+        zapisane = _batch('AAA', 0, 25)
+        zapisane.zamkniecie[-1] *= 0.97   # świeca pobrana w trakcie sesji
+        repo.zapisz_swiece(zapisane)
+        conn = BazaDanych().pobierz_polaczenie()
+        conn.execute("INSERT INTO cache_wskaznikow VALUES ('AAA', '', 0, '', '', '', x'00')")
+
+        wynik = ImporterDanych.aktualizuj_tykera('AAA', repo, nakladka=5)
+
+        assert wynik == {'tryb': 'przyrost', 'liczba_swiec': 5}
+        assert yahoo['wywolania'] == [str(START + 20)]
+        df = repo.pobierz_swiece_df('AAA')
+        assert len(df) == 30
+        assert df['close'].iloc[24] == yahoo['historia'].zamkniecie[24]
+        assert conn.execute("SELECT COUNT(*) FROM cache_wskaznikow").fetchone()[0] == 1
@@ -0,0 +1,226 @@
+"""
+Testy dla CacheWskaznikow - trwały cache kolumn wskaźników.
+"""
+
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.cache_wskaznikow import CacheWskaznikow
+from analiza.ranking import RankingEngine
+from analiza.wskazniki import SilnikWskaznikow
+from dane.baza import BazaDanych
+from konfiguracja import Konfiguracja
+from conftest import ramka_ohlcv
+
+
+@pytest.fixture
+def cache():
+    baza = BazaDanych()
+    baza.polaczenie = sqlite3.connect(':memory:')
+    baza.utworz_tabele()
+    yield CacheWskaznikow()
+    baza.polaczenie.close()
+    baza.polaczenie = None
+
+
+@pytest.fixture
+def dane():
+    return ramka_ohlcv(400, seed=1), ramka_ohlcv(400, seed=2)
+
+
+def _licznik_wywolan(monkeypatch):
+    """Podmienia oblicz_wskazniki na wersję zapisującą długości wejścia"""
+    dlugosci = []
+    oryginal = SilnikWskaznikow.oblicz_wskazniki
+
+    def _spy(df, benchmark_df=None):
+        dlugosci.append(len(df))
+        return oryginal(df, benchmark_df)
+
+    monkeypatch.setattr(SilnikWskaznikow, 'oblicz_wskazniki', staticmethod(_spy))
+    return dlugosci
+
+
+class TestCacheWskaznikow:
+    """Test suite dla CacheWskaznikow"""
+
+    def test_pierwsze_obliczenie_zgodne(self, cache, dane):
+        """Pierwsze wywołanie = pełne oblicz_wskazniki"""
+        df, bench = dane
+        wynik = cache.oblicz('AAA', df.copy(), bench)
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench)
+        pd.testing.assert_frame_equal(wynik, oczekiwane)
+
+    def test_trafienie_bez_obliczen(self, cache, dane, monkeypatch):
+        """Niezmieniony tyker -> wskaźniki wczytane z cache"""
+        df, bench = dane
+        oczekiwane = cache.oblicz('AAA', df.copy(), bench)
+
+        dlugosci = _licznik_wywolan(monkeypatch)
+        wynik = cache.oblicz('AAA', df.copy(), bench)
+
+        assert dlugosci == []
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False)
+
+    def test_nowe_swiece_przyrostowo(self, cache, dane, monkeypatch):
+        """Nowe świece -> wiersze dopisane ze stanu, bez oblicz_wskazniki"""
+        df_pelny, bench_pelny = ramka_ohlcv(405, seed=1), ramka_ohlcv(405, seed=2)
+        cache.oblicz('AAA', df_pelny.iloc[:400].copy(), bench_pelny.iloc[:400])
+
+        dlugosci = _licznik_wywolan(monkeypatch)
+        wynik = cache.oblicz('AAA', df_pelny.copy(), bench_pelny)
+
+        assert dlugosci == []
+        monkeypatch.undo()
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df_pelny.copy(), bench_pelny)
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False, rtol=1e-9)
+
+    def test_nowe_swiece_tylko_ogon(self, cache, dane, monkeypatch):
+        """Nowe świece bez stanu przyrostowego -> przeliczany tylko ogon"""
+        df_pelny, bench_pelny = ramka_ohlcv(405, seed=1), ramka_ohlcv(405, seed=2)
+        cache.oblicz('AAA', df_pelny.iloc[:400].copy(), bench_pelny.iloc[:400])
+        cache.polaczenie.execute("DELETE FROM stan_wskaznikow")
+
+        dlugosci = _licznik_wywolan(monkeypatch)
+        wynik = cache.oblicz('AAA', df_pelny.copy(), bench_pelny)
+
+        assert dlugosci == [CacheWskaznikow.rozbieg() + 5]
+        monkeypatch.undo()
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df_pelny.copy(), bench_pelny)
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False, rtol=1e-9)
+
+    def test_zmieniona_historia_pelne_obliczenie(self, cache, dane, monkeypatch):
+        """Przepisana historia (np. split) -> pełne przeliczenie"""
+        df, bench = dane
+        cache.oblicz('AAA', df.copy(), bench)
+
+        zmieniona = df.copy()
+        zmieniona[['open', 'high', 'low', 'close']] *= 0.5
+        dlugosci = _licznik_wywolan(monkeypatch)
+        cache.oblicz('AAA', zmieniona, bench)
+
+        assert dlugosci == [len(df)]
+
+    def test_zmiana_konfiguracji_uniewaznia(self, cache, dane, monkeypatch):
+        """Zmiana okresu SMA zmienia hash -> pełne przeliczenie"""
+        df, bench = dane
+        cache.oblicz('AAA', df.copy(), bench)
+
+        monkeypatch.setattr(Konfiguracja, 'SMA_SZYBKA', 30)
+        dlugosci = _licznik_wywolan(monkeypatch)
+        cache.oblicz('AAA', df.copy(), bench)
+
+        assert dlugosci == [len(df)]
+
+    def test_zmieniony_wolumen_pelne_obliczenie(self, cache, dane, monkeypatch):
+        """Korekta wolumenu w ostatnich świecach zmienia kolumny wolumenu -> pełne przeliczenie"""
+        df, bench = dane
+        cache.oblicz('AAA', df.copy(), bench)
+
+        zmieniona = df.copy()
+        zmieniona.iloc[-10, zmieniona.columns.get_loc('volume')] *= 2
+        dlugosci = _licznik_wywolan(monkeypatch)
+        wynik = cache.oblicz('AAA', zmieniona.copy(), bench)
+
+        assert dlugosci == [len(df)]
+        monkeypatch.undo()
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(zmieniona.copy(), bench)
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False)
+
+    def test_korekta_w_srodku_historii_pelne_obliczenie(self, cache, dane, monkeypatch):
+        """Wsteczna korekta close w środku historii (poza próbką ogona) -> pełne przeliczenie"""
+        df, bench = dane
+        cache.oblicz('AAA', df.copy(), bench)
+
+        zmieniona = df.copy()
+        zmieniona.iloc[len(df) // 2, zmieniona.columns.get_loc('close')] *= 0.98
+        dlugosci = _licznik_wywolan(monkeypatch)
+        wynik = cache.oblicz('AAA', zmieniona.copy(), bench)
+
+        assert dlugosci == [len(df)]
+        monkeypatch.undo()
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(zmieniona.copy(), bench)
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False)
+
+    def test_dopisanie_nie_przepisuje_bloba(self, cache, dane, monkeypatch):
+        """Dopisane świece trafiają do cache_wskaznikow_przyrost, blob pełnego zapisu bez zmian"""
+        df_pelny, bench_pelny = ramka_ohlcv(410, seed=1), ramka_ohlcv(410, seed=2)
+        cache.oblicz('AAA', df_pelny.iloc[:400].copy(), bench_pelny.iloc[:400])
+        blob = cache.polaczenie.execute("SELECT dane FROM cache_wskaznikow").fetchone()[0]
+
+        dlugosci = _licznik_wywolan(monkeypatch)
+        for n in range(401, 411):
+            cache.oblicz('AAA', df_pelny.iloc[:n].copy(), bench_pelny.iloc[:n])
+        wynik = cache.oblicz('AAA', df_pelny.copy(), bench_pelny)
+
+        assert dlugosci == []
+        conn = cache.polaczenie
+        assert conn.execute("SELECT dane FROM cache_wskaznikow").fetchone()[0] == blob
+        assert conn.execute("SELECT COUNT(*) FROM cache_wskaznikow_przyrost").fetchone()[0] == 10
+        monkeypatch.undo()
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df_pelny.copy(), bench_pelny)
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False, rtol=1e-9)
+
+    def test_kompaktowanie_przyrostow(self, cache, dane, monkeypatch):
+        """Po MAKS_PRZYROSTOW kawałkach wpis zapisywany w całości, kawałki usunięte"""
+        monkeypatch.setattr(CacheWskaznikow, 'MAKS_PRZYROSTOW', 3)
+        df_pelny, bench_pelny = ramka_ohlcv(405, seed=1), ramka_ohlcv(405, seed=2)
+        cache.oblicz('AAA', df_pelny.iloc[:400].copy(), bench_pelny.iloc[:400])
+        for n in range(401, 405):
+            cache.oblicz('AAA', df_pelny.iloc[:n].copy(), bench_pelny.iloc[:n])
+
+        conn = cache.polaczenie
+        assert conn.execute("SELECT COUNT(*) FROM cache_wskaznikow_przyrost").fetchone()[0] == 0
+        cache.oblicz('AAA', df_pelny.copy(), bench_pelny)
+        assert conn.execute("SELECT COUNT(*) FROM cache_wskaznikow_przyrost").fetchone()[0] == 1
+        wynik = cache.oblicz('AAA', df_pelny.copy(), bench_pelny)
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df_pelny.copy(), bench_pelny)
+        pd.testing.assert_frame_equal(wynik, oczekiwane, check_freq=False, rtol=1e-9)
+
+    def test_uniewaznij(self, cache, dane, monkeypatch):
+        df, bench = dane
+        cache.oblicz('AAA', df.copy(), bench)
+        cache.uniewaznij('AAA')
+
+        dlugosci = _licznik_wywolan(monkeypatch)
+        cache.oblicz('AAA', df.copy(), bench)
+        assert dlugosci == [len(df)]
+
+    def test_bez_mutacji_ramki(self, cache, dane):
+        """w_miejscu=False -> df bez zmian, zwracane same kolumny wskaźników"""
+        df, bench = dane
+        kolumny = list(df.columns)
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench)
+
+        for _ in range(2):  # pełne obliczenie, potem trafienie w cache
+            wynik = cache.oblicz('AAA', df, bench, w_miejscu=False)
+            assert list(df.columns) == kolumny
+            assert list(wynik.columns) == list(SilnikWskaznikow.KOLUMNY_WSKAZNIKOW)
+            pd.testing.assert_frame_equal(wynik, oczekiwane[wynik.columns], check_freq=False)
+
+    def test_ranking_bez_wpisu_szybka_sciezka(self, cache, dane, monkeypatch):
+        """generuj_ranking: tyker bez wpisu -> oblicz_ostatnie, z wpisem -> cache"""
+        df, bench = dane
+        dane_tykerow = {'AAA': df, 'BBB': ramka_ohlcv(400, seed=3)}
+        bez_cache = RankingEngine.generuj_ranking(dane_tykerow, bench)
+
+        dlugosci = _licznik_wywolan(monkeypatch)
+        ranking = RankingEngine.generuj_ranking(dane_tykerow, bench, cache=cache)
+        assert dlugosci == []
+        assert not cache.ma_wpis('AAA') and not cache.ma_wpis('BBB')
+        pd.testing.assert_frame_equal(ranking, bez_cache)
+
+        monkeypatch.undo()
+        cache.oblicz('AAA', df.copy(), bench)
+        wywolania = []
+        oryginal = cache.oblicz
+        monkeypatch.setattr(cache, 'oblicz', lambda tyker, *a, **kw: wywolania.append(tyker) or oryginal(tyker, *a, **kw))
+        ranking = RankingEngine.generuj_ranking(dane_tykerow, bench, cache=cache)
+        assert set(wywolania) == {'AAA'}
+        pd.testing.assert_frame_equal(ranking, bez_cache, rtol=1e-9)
@@ -0,0 +1,126 @@
+"""
+Testy dla CandleBatch - kolumnowy zestaw świec (import / zapis do bazy).
+"""
+
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dane.baza import BazaDanych
+from dane.importer import ImporterDanych
+from dane.modele import CandleBatch, Swieca, Transakcja
+from dane.repozytorium import RepozytoriumDanych
+
+
+@pytest.fixture
+def repo():
+    """Repozytorium na bazie w pamięci (singleton BazaDanych przełączony na :memory:)"""
+    baza = BazaDanych()
+    baza.polaczenie = sqlite3.connect(':memory:')
+    baza.utworz_tabele()
+    yield RepozytoriumDanych()
+    baza.polaczenie.close()
+    baza.polaczenie = None
+
+
+@pytest.fixture
+def swiece():
+    return [
+        Swieca('AAPL', '2024-01-02', 100.0, 102.0, 99.0, 101.0, 1000),
+        Swieca('AAPL', '2024-01-03', 101.0, 103.0, 100.0, 102.5, 1500),
+        Swieca('AAPL', '2024-01-04', 102.5, 104.0, 101.5, 103.0, 1200),
+    ]
+
+
+class TestCandleBatch:
+    """Test suite dla CandleBatch"""
+
+    def test_z_swiec_roundtrip(self, swiece):
+        """Widok wiersza jest zgodny z oryginalnymi obiektami Swieca"""
+        batch = CandleBatch.z_swiec(swiece)
+
+        assert len(batch) == 3
+        assert batch.daty.dtype == np.dtype('datetime64[D]')
+        for widok, s in zip(batch, swiece):
+            assert widok == s
+            assert widok.jako_swieca() == s
+        assert batch[-1].data == '2024-01-04'
+
+    def test_wiersze_sql(self, swiece):
+        """Krotki SQL mają typy Pythona i format daty ISO"""
+        wiersze = list(CandleBatch.z_swiec(swiece).wiersze_sql())
+        assert wiersze[0] == ('AAPL', '2024-01-02', 100.0, 102.0, 99.0, 101.0, 1000)
+        assert type(wiersze[0][6]) is int
+
+    def test_nierowne_kolumny(self):
+        """Kolumny o różnych długościach -> ValueError"""
+        with pytest.raises(ValueError):
+            CandleBatch('X', ['2024-01-02'], [1.0, 2.0], [1.0], [1.0], [1.0], [1])
+
+    def test_pusty_batch_falsy(self):
+        assert not CandleBatch.pusty('X')
+
+    def test_slots(self, swiece):
+        """Modele nie mają __dict__ (mniej pamięci na obiekt)"""
+        assert not hasattr(swiece[0], '__dict__')
+        t = Transakcja(None, 'AAPL', '2024-01-02', 100.0, None, None, 10, 95.0, 115.0, 0.0, '', '')
+        assert not hasattr(t, '__dict__')
+        assert t.jest_zamknieta is False
+
+    def test_zapis_i_odczyt_repozytorium(self, repo, swiece):
+        """zapisz_swiece przyjmuje CandleBatch i listę Swieca"""
+        repo.zapisz_swiece(CandleBatch.z_swiec(swiece[:2]))
+        repo.zapisz_swiece(swiece)  # INSERT OR IGNORE - duplikaty pomijane
+
+        df = repo.pobierz_swiece_df('AAPL')
+        assert len(df) == 3
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert df['close'].iloc[-1] == 103.0
+
+        batch = CandleBatch.z_dataframe('AAPL', df)
+        pd.testing.assert_frame_equal(batch.to_dataframe(), df, check_dtype=False, check_index_type=False, check_freq=False)
+
+    def test_pobierz_swiece_np(self, repo, swiece):
+        """Odczyt prosto do tablic - zgodny z dawną ścieżką read_sql_query / to_datetime"""
+        repo.zapisz_swiece(swiece)
+        # Starszy format daty z czasem i brakujące wartości
+        repo.db.pobierz_polaczenie_swiec('AAPL').execute(
+            "INSERT INTO swiece (tyker, data, otwarcie, najwyzszy, najnizszy, zamkniecie, wolumen) "
+            "VALUES ('AAPL', '2024-01-05 00:00:00', NULL, 104.0, 102.0, 103.5, NULL)")
+
+        batch = repo.pobierz_swiece_np('AAPL')
+        assert batch.daty.dtype == np.dtype('datetime64[D]')
+        assert list(batch.daty.astype(str)) == ['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']
+        assert batch.zamkniecie.tolist() == [101.0, 102.5, 103.0, 103.5]
+        assert np.isnan(batch.otwarcie[-1])
+        assert batch.wolumen.tolist() == [1000, 1500, 1200, 0]
+
+        df = repo.pobierz_swiece_df('AAPL')
+        pd.testing.assert_frame_equal(df, batch.to_dataframe())
+        assert repo.pobierz_ostatnie_swiece('AAPL', 2).zamkniecie.tolist() == [103.0, 103.5]
+
+    def test_pobierz_swiece_np_brak_tykera(self, repo):
+        assert len(repo.pobierz_swiece_np('BRAK')) == 0
+        assert repo.pobierz_swiece_df('BRAK').empty
+
+    def test_importuj_z_pliku(self, tmp_path):
+        """Import CSV bez iterrows - wiersze bez daty są pomijane"""
+        sciezka = tmp_path / 'aapl.csv'
+        sciezka.write_text(
+            "Date,Open,High,Low,Close,Volume\n"
+            "2024-01-02,100,102,99,101,1000\n"
+            ",1,1,1,1,1\n"
+            "2024-01-03,101,103,100,102.5,1500\n"
+        )
+        batch = ImporterDanych.importuj_z_pliku(str(sciezka), 'AAPL')
+
+        assert len(batch) == 2
+        assert batch[1].data == '2024-01-03'
+        assert batch[1].zamkniecie == 102.5
+        assert batch[1].wolumen == 1500
@@ -0,0 +1,120 @@
+"""
+Testy dla GrafWskaznikow - współdzielone wielkości pośrednie liczone raz na ramkę.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.graf_wskaznikow import GrafWskaznikow
+from analiza.volatility import VolatilityMetrics
+from analiza.wskazniki import SilnikWskaznikow
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(1000, 5000, 300),
+    }, index=pd.bdate_range('2022-01-03', periods=300))
+
+
+class TestGrafWskaznikow:
+    """Test suite dla GrafWskaznikow"""
+
+    def test_tr_liczony_raz(self, df, monkeypatch):
+        """ATR z SilnikWskaznikow i VolatilityMetrics korzysta z jednego TR"""
+        wywolania = []
+        oryginal = GrafWskaznikow._tr
+        monkeypatch.setattr(GrafWskaznikow, '_tr', lambda self, d: wywolania.append(1) or oryginal(self, d))
+
+        VolatilityMetrics.calculate_atr(df)
+        SilnikWskaznikow.oblicz_wskazniki(df)
+
+        assert wywolania == [1]
+
+    def test_oblicz_kolumny_bez_zapamietanego_grafu(self, df):
+        """oblicz_kolumny nie zostawia grafu w pamięci - wyniki są już w bloku kolumn"""
+        SilnikWskaznikow.oblicz_kolumny(df)
+        assert GrafWskaznikow.zapamietany(df) is None
+
+    def test_wartosci_wezlow(self, df):
+        graf = GrafWskaznikow.dla(df)
+        tr = pd.concat([df['high'] - df['low'],
+                        (df['high'] - df['close'].shift()).abs(),
+                        (df['low'] - df['close'].shift()).abs()], axis=1).max(axis=1)
+
+        pd.testing.assert_series_equal(graf['ATR14_sma'], tr.rolling(14).mean(), check_names=False)
+        pd.testing.assert_series_equal(graf['ATR14_ewm'], tr.ewm(span=14, adjust=False).mean(), check_names=False)
+        pd.testing.assert_series_equal(graf['HIGH_MAX_126'], df['high'].rolling(126).max(), check_names=False)
+        assert np.shares_memory(graf['SMA_50'].to_numpy(), graf.pobierz('SMA_50')['SMA_50'].to_numpy())
+
+    def test_nowa_swieca_nowy_graf(self, df):
+        """Zmiana długości ramki -> wyniki liczone od nowa"""
+        krotka = df.iloc[:200].copy()
+        graf = GrafWskaznikow.dla(krotka)
+        assert GrafWskaznikow.dla(krotka) is graf
+
+        krotka.loc[df.index[200]] = df.iloc[200]
+        nowy = GrafWskaznikow.dla(krotka)
+        assert nowy is not graf
+        assert len(nowy['SMA_50']) == 201
+
+    def test_edycja_cen_w_miejscu(self, df):
+        """Zmiana ceny w środku historii (ta sama długość i ostatnia data) -> nowy graf"""
+        przed = VolatilityMetrics.calculate_atr(df)
+        df.loc[df.index[-5], 'high'] *= 2
+
+        po = VolatilityMetrics.calculate_atr(df)
+        pd.testing.assert_series_equal(po, VolatilityMetrics.calculate_atr(df.copy()))
+        assert po.iloc[-5] > przed.iloc[-5]
+
+    def test_zapis_wywolujacego_nie_psuje_grafu(self, df):
+        atr = VolatilityMetrics.calculate_atr(df)
+        oczekiwane = atr.iloc[-1]
+        atr.iloc[-1] = -1
+
+        assert VolatilityMetrics.calculate_atr(df).iloc[-1] == oczekiwane
+        bank = GrafWskaznikow.dla(df).bank_sma(10, 50)
+        bank.iloc[-1, 0] = -1
+        assert GrafWskaznikow.dla(df).bank_sma(10, 50).iloc[-1, 0] != -1
+
+    def test_nieznany_wezel(self, df):
+        with pytest.raises(KeyError):
+            GrafWskaznikow.dla(df)['XYZ_5']
+
+    def test_obsuniecie_i_wybicie(self, df):
+        graf = GrafWskaznikow.dla(df)
+        maks = df['high'].rolling(20).max()
+
+        pd.testing.assert_series_equal(graf['DD_20'], (maks - df['close']) / maks * 100, check_names=False)
+        pd.testing.assert_series_equal(graf['BREAKOUT_20'], df['close'] > maks.shift(1), check_names=False)
+
+    def test_bank_sma(self, df):
+        graf = GrafWskaznikow.dla(df)
+        bank = graf.bank_sma(10, 50, 200)
+
+        assert list(bank.columns) == ['SMA_10', 'SMA_50', 'SMA_200']
+        assert np.shares_memory(graf.bank_sma(10, 50, 200).to_numpy(), bank.to_numpy())
+        pd.testing.assert_series_equal(bank['SMA_50'], graf['SMA_50'], rtol=1e-12)
+
+    def test_wezly_wolumenu(self, df):
+        graf = GrafWskaznikow.dla(df)
+        zmiana = df['close'].diff()
+        wzrosty = sum(df['volume'].shift(i).where(zmiana.shift(i) > 0, 0) for i in range(50))
+        spadki = sum(df['volume'].shift(i).where(zmiana.shift(i) < 0, 0) for i in range(50))
+
+        oczekiwane = (wzrosty / spadki).iloc[50:]
+        pd.testing.assert_series_equal(graf['UPDOWN_VOL_50'].iloc[50:], oczekiwane, check_names=False, rtol=1e-12)
+        pd.testing.assert_series_equal(graf['DOLLAR_VOL_20'], (df['close'] * df['volume']).rolling(20).mean(),
+                                       check_names=False)
@@ -0,0 +1,85 @@
+"""
+Testy dla IndexManager - cache metadanych plików CSV indeksów.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dane import index_manager as im
+from dane.index_manager import IndexManager
+
+
+def _zapisz_csv(sciezka, tykery):
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        f.write("Ticker,Name\n")
+        for t in tykery:
+            f.write(f"{t},{t} Inc\n")
+
+
+class TestIndexManagerCache:
+    """Test suite dla cache'u IndexManager"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        _zapisz_csv(tmp_path / 'sp_500_tickers.csv', ['AAPL', ' MSFT ', 'NVDA'])
+        return IndexManager(data_dir=tmp_path)
+
+    def test_load_tickers_parses_csv(self, manager):
+        """Tykery są wczytywane i przycinane ze spacji"""
+        assert manager.load_tickers('sp_500') == ['AAPL', 'MSFT', 'NVDA']
+
+    def test_second_load_does_not_read_csv(self, manager, monkeypatch):
+        """Drugie wczytanie korzysta z cache (bez pd.read_csv)"""
+        manager.load_tickers('sp_500')
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("CSV nie powinien być czytany ponownie")
+
+        monkeypatch.setattr(im.pd, 'read_csv', _fail)
+        assert manager.load_tickers('sp_500') == ['AAPL', 'MSFT', 'NVDA']
+        assert manager.validate_index('sp_500')['ticker_count'] == 3
+
+    def test_cache_persisted_across_instances(self, manager, tmp_path, monkeypatch):
+        """Cache jest zapisywany na dysku i używany przez nową instancję"""
+        manager.validate_index_files()
+        assert (tmp_path / im.INDEX_CACHE_FILENAME).exists()
+
+        monkeypatch.setattr(im.pd, 'read_csv', lambda *a, **k: pytest.fail("CSV read"))
+        nowy = IndexManager(data_dir=tmp_path)
+        assert nowy.get_stock_count('sp_500') == 3
+
+    def test_cache_invalidated_on_file_change(self, manager, tmp_path):
+        """Zmiana pliku (rozmiar/mtime) powoduje ponowne parsowanie"""
+        assert manager.get_stock_count('sp_500') == 3
+
+        sciezka = tmp_path / 'sp_500_tickers.csv'
+        _zapisz_csv(sciezka, ['AAPL', 'MSFT', 'NVDA', 'META', 'GOOGL'])
+        st = os.stat(sciezka)
+        os.utime(sciezka, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert manager.get_stock_count('sp_500') == 5
+        assert manager.load_tickers('sp_500')[-1] == 'GOOGL'
+
+    def test_missing_csv_falls_back_to_estimate(self, manager):
+        """Brak pliku CSV -> szacunkowa liczba spółek z definicji"""
+        assert manager.get_stock_count('nasdaq') == IndexManager.INDICES['nasdaq'].stock_count
+        status = manager.validate_index('nasdaq')
+        assert status['exists'] is False
+        assert status['valid'] is False
+
+    def test_missing_ticker_column_invalid(self, tmp_path):
+        """CSV bez kolumny 'Ticker' jest niepoprawny"""
+        with open(tmp_path / 'sp_500_tickers.csv', 'w', encoding='utf-8') as f:
+            f.write("Symbol\nAAPL\n")
+        manager = IndexManager(data_dir=tmp_path)
+
+        status = manager.validate_index('sp_500')
+        assert status['exists'] is True
+        assert status['valid'] is False
+        assert 'Ticker' in status['error']
+        with pytest.raises(IOError):
+            manager.load_tickers('sp_500')
@@ -0,0 +1,74 @@
+"""
+Testy dla KalendarzBenchmarku - wyrównanie RS po pozycji zamiast po etykietach.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.kalendarz_benchmarku import KalendarzBenchmarku
+from analiza.kernele import rolling_slope
+from analiza.wskazniki import SilnikWskaznikow
+from conftest import ramka_ohlcv
+
+
+class TestKalendarzBenchmarku:
+    """Test suite dla KalendarzBenchmarku"""
+
+    def test_wyrownaj_jak_reindex(self):
+        bench = ramka_ohlcv(300, seed=1, start='2020-01-01').drop(index=pd.bdate_range('2020-03-02', periods=5))
+        tyker = ramka_ohlcv(250, seed=2, start='2019-12-02')
+
+        wynik = KalendarzBenchmarku.dla(bench).wyrownaj(tyker.index)
+        oczekiwane = bench['close'].reindex(tyker.index).to_numpy()
+        np.testing.assert_array_equal(wynik, oczekiwane)
+
+    def test_rozne_jednostki_dat_i_kolejnosc(self):
+        """Benchmark w datetime64[s], nieposortowany, z duplikatem"""
+        bench = ramka_ohlcv(100, seed=3)
+        bench.index = bench.index.as_unit('s')
+        bench = pd.concat([bench.iloc[50:], bench.iloc[:50], bench.iloc[[10]]])
+        tyker = ramka_ohlcv(100, seed=4)
+        tyker.index = tyker.index.as_unit('ns')
+
+        wynik = KalendarzBenchmarku.dla(bench).wyrownaj(tyker.index)
+        posortowany = bench['close'].sort_index()
+        np.testing.assert_array_equal(wynik, posortowany[~posortowany.index.duplicated()].to_numpy())
+
+    def test_rs_zgodny_z_wyrownaniem_po_etykietach(self):
+        df = ramka_ohlcv(400, seed=5)
+        bench = ramka_ohlcv(400, seed=6).drop(index=pd.bdate_range('2020-06-01', periods=3))
+
+        wynik = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench)
+
+        wspolne = df.index.intersection(bench.index)
+        rs = pd.Series(1.0, index=df.index)
+        rs.loc[wspolne] = df.loc[wspolne, 'close'] / bench.loc[wspolne, 'close']
+        np.testing.assert_array_equal(wynik['RS_Ratio'].to_numpy(), rs.to_numpy())
+        np.testing.assert_allclose(wynik['RS_SMA50'], rs.rolling(50).mean(), rtol=1e-12)
+        np.testing.assert_allclose(wynik['RS_Slope'], rolling_slope(rs, 20), rtol=1e-12)
+
+    def test_brak_wspolnych_dat(self):
+        df = ramka_ohlcv(100, seed=7, start='2015-01-01')
+        bench = ramka_ohlcv(100, seed=8, start='2020-01-01')
+
+        wynik = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench)
+        assert not KalendarzBenchmarku.dla(bench).ma_wspolne(df.index)
+        assert (wynik['RS_Ratio'] == 1.0).all() and (wynik['RS_Slope'] == 0.0).all()
+
+    def test_kalendarz_raz_na_ramke(self):
+        bench = ramka_ohlcv(200, seed=9)
+        kalendarz = KalendarzBenchmarku.dla(bench)
+        assert KalendarzBenchmarku.dla(bench) is kalendarz
+
+        bench.loc[bench.index[-1] + pd.offsets.BDay()] = bench.iloc[-1]
+        nowy = KalendarzBenchmarku.dla(bench)
+        assert nowy is not kalendarz and len(nowy.close) == 201
+
+    def test_polskie_kolumny(self):
+        bench = ramka_ohlcv(50, seed=10).rename(columns={'close': 'zamkniecie'})
+        assert KalendarzBenchmarku.dla(bench).close[0] == bench['zamkniecie'].iloc[0]
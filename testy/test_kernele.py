@@ -0,0 +1,180 @@
+"""
+Testy kerneli wektorowych (analiza/kernele.py) względem referencyjnych rolling().apply().
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.kernele import (
+    last_max, last_min, linear_slope, percentile_rank, rolling_max, rolling_min,
+    rolling_percentile_rank, rolling_slope, sma_bank,
+)
+
+
+def _slope_polyfit(y):
+    """Referencja - dawna implementacja z np.polyfit"""
+    try:
+        m, _ = np.polyfit(np.arange(len(y)), y, 1)
+        srednia = np.mean(y)
+        if srednia == 0:
+            return 0.0
+        return m / srednia * 100
+    except Exception:
+        return 0.0
+
+
+@pytest.fixture
+def seria():
+    rng = np.random.default_rng(7)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 600))))
+
+
+def _slope_macierz(values, window):
+    """Referencja: iloczyn macierzy okien (sliding_window_view) przez wycentrowany x - O(n·window)"""
+    y = np.asarray(values, dtype=np.float64)
+    wynik = np.full(len(y), np.nan)
+    if window < 2 or len(y) < window:
+        return wynik
+    okna = np.lib.stride_tricks.sliding_window_view(y, window)
+    xc = np.arange(window) - (window - 1) / 2.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednia = okna.mean(axis=1)
+        znorm = (okna @ xc) / (xc @ xc) / srednia * 100
+    ma_nan = np.isnan(okna).any(axis=1)
+    znorm[~ma_nan & (~np.isfinite(znorm) | (srednia == 0))] = 0.0
+    znorm[ma_nan] = np.nan
+    wynik[window - 1:] = znorm
+    return wynik
+
+
+class TestRollingSlope:
+    """Test suite dla rolling_slope"""
+
+    @pytest.mark.parametrize('okno', [2, 20, 200, 300])
+    def test_zgodnosc_z_macierza_okien(self, okno):
+        """Sumy bieżące w blokach jak iloczyn macierzy okien - także na długiej historii z NaN / inf"""
+        rng = np.random.default_rng(3)
+        y = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 20_000)))
+        y[[10, 5_000, 5_001]] = np.nan
+        y[12_345] = np.inf
+
+        wynik = rolling_slope(y, okno)
+        oczekiwane = _slope_macierz(y, okno)
+        np.testing.assert_array_equal(np.isnan(wynik), np.isnan(oczekiwane))
+        np.testing.assert_allclose(wynik, oczekiwane, rtol=1e-7, atol=1e-9)
+        assert wynik[12_345] == 0.0
+
+    def test_zgodnosc_z_polyfit(self, seria):
+        oczekiwane = seria.rolling(20).apply(_slope_polyfit, raw=True).to_numpy()
+        np.testing.assert_allclose(rolling_slope(seria, 20), oczekiwane, rtol=1e-9, atol=1e-12)
+
+    def test_nan_w_oknie(self, seria):
+        """NaN (np. rozbieg SMA) daje NaN jak rolling().apply"""
+        z_nan = seria.copy()
+        z_nan.iloc[:50] = np.nan
+        z_nan.iloc[300] = np.nan
+        oczekiwane = z_nan.rolling(20).apply(_slope_polyfit, raw=True).to_numpy()
+        np.testing.assert_allclose(rolling_slope(z_nan, 20), oczekiwane, rtol=1e-9, atol=1e-12)
+
+    def test_srednia_zero_i_krotka_seria(self):
+        assert rolling_slope(np.zeros(30), 10)[-1] == 0.0
+        assert np.isnan(rolling_slope([1.0, 2.0], 5)).all()
+
+    def test_linear_slope(self):
+        y = np.array([100.0, 101, 102, 103, 105])
+        assert linear_slope(y) == pytest.approx(_slope_polyfit(y))
+        assert linear_slope([0.0, 0.0, 0.0]) == 0.0
+
+
+def _percentile_apply(x):
+    """Referencja - dawny percentile_rank z VolatilityMetrics"""
+    return (x <= x[-1]).sum() / len(x) * 100
+
+
+class TestRollingPercentileRank:
+    """Test suite dla rolling_percentile_rank / percentile_rank"""
+
+    def test_zgodnosc_z_apply(self, seria):
+        oczekiwane = seria.rolling(252).apply(_percentile_apply, raw=True).to_numpy()
+        # Mały blok - wymusza wiele przebiegów pętli blokowej
+        np.testing.assert_array_equal(rolling_percentile_rank(seria, 252, blok=37), oczekiwane)
+        np.testing.assert_array_equal(rolling_percentile_rank(seria, 252), oczekiwane)
+
+    def test_nan_i_remisy(self):
+        wartosci = pd.Series([1.0, 2.0, 2.0, np.nan, 3.0, 3.0, 1.0, 2.0, 5.0, 5.0])
+        oczekiwane = wartosci.rolling(3).apply(_percentile_apply, raw=True).to_numpy()
+        np.testing.assert_array_equal(rolling_percentile_rank(wartosci, 3), oczekiwane)
+
+    def test_percentile_rank(self):
+        assert percentile_rank([1.0, 2.0, 3.0, np.nan], 2.0) == 50.0
+        assert np.isnan(percentile_rank([], 1.0))
+
+
+class TestRollingEkstrema:
+    """Test suite dla rolling_max / rolling_min (van Herk / Gil-Werman)"""
+
+    @pytest.mark.parametrize('okno', [1, 2, 7, 20, 126, 300])
+    def test_zgodnosc_z_pandas(self, okno):
+        rng = np.random.default_rng(okno)
+        y = pd.Series(rng.normal(0, 1, 300))
+        y[[5, 140, 141]] = np.nan
+
+        np.testing.assert_array_equal(rolling_max(y, okno), y.rolling(okno).max().to_numpy())
+        np.testing.assert_array_equal(rolling_min(y, okno), y.rolling(okno).min().to_numpy())
+        # skipna - jak min_periods=1 od pierwszego pełnego okna
+        np.testing.assert_array_equal(rolling_max(y, okno, skipna=True)[okno - 1:],
+                                      y.rolling(okno, min_periods=1).max().to_numpy()[okno - 1:])
+
+    def test_2d(self):
+        rng = np.random.default_rng(1)
+        macierz = rng.normal(0, 1, (200, 4))
+        macierz[:30, 2] = np.nan
+        oczekiwane = pd.DataFrame(macierz).rolling(20).max().to_numpy()
+        np.testing.assert_array_equal(rolling_max(macierz, 20), oczekiwane)
+
+    def test_krotka_seria(self):
+        assert np.isnan(rolling_max([1.0, 2.0], 3)).all()
+        assert np.isnan(last_max([1.0, 2.0], 3))
+
+    def test_ostatnia_wartosc(self):
+        y = np.array([3.0, 1.0, np.nan, 4.0, 2.0])
+        assert last_max(y, 2) == 4.0
+        assert np.isnan(last_min(y, 3))
+        assert last_min(y, 3, skipna=True) == 2.0
+        assert np.isnan(last_min([np.nan, np.nan], 2, skipna=True))
+
+
+class TestSmaBank:
+    """Test suite dla sma_bank"""
+
+    def test_zgodnosc_z_rolling_mean(self):
+        rng = np.random.default_rng(3)
+        y = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 1500))))
+        y[[10, 700]] = np.nan
+        okresy = [5, 20, 50, 137, 200]
+
+        bank = sma_bank(y, okresy)
+        assert bank.shape == (1500, 5)
+        for j, okres in enumerate(okresy):
+            np.testing.assert_allclose(bank[:, j], y.rolling(okres).mean(), rtol=1e-11)
+
+    def test_kompensacja(self):
+        """Duży poziom + małe zmiany - suma z kompensacją trzyma precyzję"""
+        rng = np.random.default_rng(4)
+        y = 1e9 + np.cumsum(rng.normal(0, 1e-3, 20000))
+        dokladne = np.array([np.mean(y[i - 49:i + 1]) for i in range(49, len(y))])
+
+        wynik = sma_bank(y, [50], kompensacja=True)[49:, 0]
+        np.testing.assert_allclose(wynik, dokladne, rtol=1e-15, atol=1e-6)
+
+    def test_okres_dluzszy_niz_seria(self):
+        bank = sma_bank([1.0, 2.0, 3.0], [2, 5])
+        np.testing.assert_array_equal(bank[:, 0], [np.nan, 1.5, 2.5])
+        assert np.isnan(bank[:, 1]).all()
+
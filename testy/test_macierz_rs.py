@@ -0,0 +1,70 @@
+"""
+Testy dla MacierzRS - RS wobec wielu benchmarków naraz i przełączanie benchmarku rankingu.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.macierz_rs import MacierzRS
+from analiza.ranking import RankingEngine
+from analiza.wskazniki import SilnikWskaznikow
+from conftest import ramka_ohlcv
+
+
+@pytest.fixture
+def uniwersum():
+    tykery = {f'T{i}': ramka_ohlcv(300 + 20 * i, seed=i) for i in range(8)}
+    tykery['KROTKI'] = ramka_ohlcv(60, seed=50, start='2020-01-01')
+    benchmarki = {
+        'SPY': ramka_ohlcv(400, seed=100),
+        'QQQ': ramka_ohlcv(400, seed=101, dryf=0.002),
+        # Benchmark bez wspólnych dat -> wartości domyślne
+        'STARY': ramka_ohlcv(100, seed=102, start='2005-01-03'),
+    }
+    return tykery, benchmarki
+
+
+class TestMacierzRS:
+    """Test suite dla MacierzRS"""
+
+    def test_zgodnosc_z_oblicz_wskazniki(self, uniwersum):
+        tykery, benchmarki = uniwersum
+        macierz = MacierzRS.oblicz(tykery, benchmarki)
+
+        assert macierz.shape == (len(tykery), 3 * len(benchmarki))
+        for symbol, bench in benchmarki.items():
+            wycinek = MacierzRS.dla_benchmarku(macierz, symbol)
+            for tyker, df in tykery.items():
+                oczekiwany = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench).iloc[-1]
+                # atol: sumy bieżące RS_Slope przecentrowane w innych miejscach niż dla samego okna
+                np.testing.assert_allclose(wycinek.loc[tyker].to_numpy(),
+                                           oczekiwany[list(MacierzRS.KOLUMNY)].to_numpy(dtype=float),
+                                           rtol=1e-9, atol=1e-12)
+
+    def test_przelacz_benchmark(self, uniwersum):
+        """Przełączenie na QQQ = ranking policzony od razu z QQQ"""
+        tykery, benchmarki = uniwersum
+        ranking = RankingEngine.generuj_ranking({t: df.copy() for t, df in tykery.items()},
+                                                benchmarki['SPY'], benchmarki=benchmarki)
+        przelaczony = RankingEngine.przelacz_benchmark(ranking, 'QQQ')
+        oczekiwany = RankingEngine.generuj_ranking({t: df.copy() for t, df in tykery.items()}, benchmarki['QQQ'])
+
+        kolumny = ['Status', 'ChecklistScore', 'Tier', 'RS_Ratio', 'RS_SMA50', 'RS_Slope']
+        pd.testing.assert_frame_equal(przelaczony.set_index('Tyker').sort_index()[kolumny],
+                                      oczekiwany.set_index('Tyker').sort_index()[kolumny], rtol=1e-9)
+        assert przelaczony['Status'].map({'TRADEABLE': 0, 'SETUP': 1, 'OUT': 2}).is_monotonic_increasing
+
+        powrot = RankingEngine.przelacz_benchmark(przelaczony, 'SPY')
+        pd.testing.assert_frame_equal(powrot.set_index('Tyker').sort_index()[kolumny],
+                                      ranking.set_index('Tyker').sort_index()[kolumny], rtol=1e-9)
+
+    def test_nieznany_benchmark(self, uniwersum):
+        tykery, benchmarki = uniwersum
+        ranking = RankingEngine.generuj_ranking({t: df.copy() for t, df in tykery.items()}, benchmarki['SPY'])
+        assert RankingEngine.przelacz_benchmark(ranking, 'IWM') is ranking
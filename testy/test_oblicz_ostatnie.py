@@ -0,0 +1,83 @@
+"""
+Testy dla SilnikWskaznikow.oblicz_ostatnie - tylko ostatni wiersz wskaźników z ogona historii.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.ranking import RankingEngine
+from analiza.wskazniki import SilnikWskaznikow
+from konfiguracja import Konfiguracja
+from conftest import ramka_ohlcv
+
+
+class TestObliczOstatnie:
+    """Test suite dla SilnikWskaznikow.oblicz_ostatnie"""
+
+    @pytest.mark.parametrize('n', [60, 150, 220, 221, 800])
+    @pytest.mark.parametrize('z_benchmarkiem', [True, False])
+    def test_zgodnosc_z_pelnym_obliczeniem(self, n, z_benchmarkiem):
+        df = ramka_ohlcv(n, seed=n)
+        bench = None
+        if z_benchmarkiem:
+            # Brak notowania benchmarku w ostatnich dniach -> RS_Ratio = 1.0 w ogonie
+            bench = ramka_ohlcv(n, seed=n + 1)
+            bench = bench.drop(index=bench.index[[-1, -7]])
+
+        ostatni = SilnikWskaznikow.oblicz_ostatnie(df, bench)
+        pelny = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench).iloc[-1]
+
+        pd.testing.assert_series_equal(ostatni, pelny, rtol=1e-9)
+
+    def test_benchmark_tylko_w_starej_historii(self):
+        """Wspólne daty poza ogonem nadal włączają RS (jak w pełnym obliczeniu)"""
+        df = ramka_ohlcv(600, seed=2)
+        bench = ramka_ohlcv(600, seed=3).iloc[:100]
+
+        ostatni = SilnikWskaznikow.oblicz_ostatnie(df, bench)
+        pelny = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench).iloc[-1]
+
+        pd.testing.assert_series_equal(ostatni, pelny, rtol=1e-9)
+
+    def test_bez_wolumenu(self):
+        """Ramka bez kolumny volume -> kolumny wolumenu NaN (jak oblicz_wskazniki)"""
+        df = ramka_ohlcv(300, seed=6).drop(columns='volume')
+        ostatni = SilnikWskaznikow.oblicz_ostatnie(df)
+        pelny = SilnikWskaznikow.oblicz_wskazniki(df.copy()).iloc[-1]
+
+        pd.testing.assert_series_equal(ostatni, pelny, rtol=1e-9)
+        assert ostatni[list(SilnikWskaznikow.KOLUMNY_WOLUMENU)].isna().all()
+
+    def test_prog_nachylen_z_sma_wolnej(self, monkeypatch):
+        """Nachylenia liczone od OKRES_NACHYLENIA + SMA_WOLNA świec (nie stałe 200)"""
+        monkeypatch.setattr(Konfiguracja, 'SMA_WOLNA', 100)
+        df = ramka_ohlcv(150, seed=8)
+
+        ostatni = SilnikWskaznikow.oblicz_ostatnie(df)
+        pelny = SilnikWskaznikow.oblicz_wskazniki(df.copy()).iloc[-1]
+
+        assert pelny['SMA200_Slope'] != 0.0
+        pd.testing.assert_series_equal(ostatni, pelny, rtol=1e-9)
+
+    def test_nie_modyfikuje_wejscia(self):
+        df = ramka_ohlcv(300, seed=4)
+        SilnikWskaznikow.oblicz_ostatnie(df)
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+
+    def test_ranking_bez_cache(self):
+        """Ranking z szybkiej ścieżki = checklist z pełnych kolumn"""
+        dane = {f'T{i}': ramka_ohlcv(400, seed=10 + i) for i in range(3)}
+        bench = ramka_ohlcv(400, seed=99)
+
+        ranking = RankingEngine.generuj_ranking({t: df.copy() for t, df in dane.items()}, bench)
+
+        for _, wiersz in ranking.iterrows():
+            pelny = SilnikWskaznikow.oblicz_wskazniki(dane[wiersz['Tyker']].copy(), bench)
+            oczekiwany = RankingEngine.calculate_checklist_score(wiersz['Tyker'], pelny, bench)
+            assert wiersz['ChecklistScore'] == oczekiwany['checklist_score']
+            assert wiersz['SMA200_Slope'] == pytest.approx(pelny['SMA200_Slope'].iloc[-1], rel=1e-9)
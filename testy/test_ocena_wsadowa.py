@@ -0,0 +1,151 @@
+"""
+Testy dla wsadowej checklisty i statusu (RankingEngine.checklist_wsadowo,
+SilnikStatusu.okresl_status_wsadowo) - zgodność z funkcjami skalarnymi.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.ranking import RankingEngine
+from analiza.status import SilnikStatusu
+from analiza.widoki_interwalow import WidokiInterwalow
+from analiza.wskazniki import SilnikWskaznikow
+from konfiguracja import Konfiguracja
+
+
+def _metryki(n=2000, seed=0, nan=0.05):
+    """Losowe ostatnie wiersze - wartości z małych zbiorów, żeby trafiać w progi i równości"""
+    rng = np.random.default_rng(seed)
+    prog = Konfiguracja.SLOPE_RISING_THRESHOLD
+    zbiory = {
+        'close': [90.0, 100.0, 110.0],
+        'SMA200': [95.0, 100.0, 105.0],
+        'SMA50': [95.0, 100.0, 105.0],
+        'SMA200_Slope': [-0.5, 0.0, prog, prog + 0.1],
+        'SMA50_Slope': [-0.5, 0.0, prog, prog + 0.1],
+        'RS_Slope': [-0.1, 0.0, 0.1],
+        'RS_Ratio': [0.9, 1.0, 1.1],
+        'RS_SMA50': [0.0, 1.0, 1.05],
+        'Mom3M': [-0.1, 0.0, 0.1],
+        'Mom6M': [-0.1, 0.0, 0.1],
+        'ATR_Pct': [2.0, Konfiguracja.ATR_MAX_PCT, 6.0],
+        'Dist_SMA200': [Konfiguracja.DISTANCE_MIN_PCT - 1, Konfiguracja.DISTANCE_MIN_PCT, 0.0,
+                        Konfiguracja.DISTANCE_MAX_PCT, Konfiguracja.DISTANCE_MAX_PCT + 1],
+    }
+    dane = {}
+    for kolumna, wartosci in zbiory.items():
+        x = rng.choice(np.array(wartosci), n)
+        x[rng.random(n) < nan] = np.nan
+        dane[kolumna] = x
+    return pd.DataFrame(dane, index=[f'T{i}' for i in range(n)])
+
+
+class TestOcenaWsadowa:
+    """Test suite dla checklist_wsadowo / okresl_status_wsadowo"""
+
+    @pytest.mark.parametrize('nan', [0.0, 0.1])
+    def test_checklista_zgodna_ze_skalarna(self, nan):
+        metryki = _metryki(nan=nan)
+        wsadowo = RankingEngine.checklist_wsadowo(metryki)
+
+        for tyker, wiersz in metryki.iterrows():
+            skalarnie = RankingEngine.checklist_z_wiersza(tyker, wiersz)
+            assert wsadowo.at[tyker, 'checklist_score'] == skalarnie['checklist_score']
+            assert wsadowo.at[tyker, 'tier'] == skalarnie['tier']
+            for warunek, wartosc in skalarnie['checklist_details'].items():
+                assert wsadowo.at[tyker, warunek] == wartosc, (tyker, warunek)
+
+    @pytest.mark.parametrize('nan', [0.0, 0.1])
+    def test_status_zgodny_ze_skalarnym(self, nan):
+        metryki = _metryki(nan=nan)
+        wsadowo = SilnikStatusu.okresl_status_wsadowo(metryki)
+        skalarnie = [SilnikStatusu.okresl_status(w) for _, w in metryki.iterrows()]
+        assert list(wsadowo) == skalarnie
+        assert {'TRADEABLE', 'SETUP', 'OUT'} <= set(skalarnie)
+
+    def test_brakujace_kolumny_jak_get(self):
+        """Brak kolumny -> domyślna wartość jak .get w funkcjach skalarnych"""
+        metryki = _metryki(200, seed=3)[['close', 'SMA200', 'SMA200_Slope', 'RS_Ratio']]
+        wsadowo = RankingEngine.checklist_wsadowo(metryki)
+        statusy = SilnikStatusu.okresl_status_wsadowo(metryki)
+        for i, (tyker, wiersz) in enumerate(metryki.iterrows()):
+            assert wsadowo.at[tyker, 'checklist_score'] == RankingEngine.checklist_z_wiersza(
+                tyker, wiersz)['checklist_score']
+            assert statusy[i] == SilnikStatusu.okresl_status(wiersz)
+
+    def test_pusta_macierz(self):
+        metryki = _metryki(0)
+        assert len(RankingEngine.checklist_wsadowo(metryki)) == 0
+        assert len(SilnikStatusu.okresl_status_wsadowo(metryki)) == 0
+
+    def test_szybkosc_6000_tykerow(self):
+        metryki = _metryki(6000, seed=5)
+        start = time.perf_counter()
+        RankingEngine.checklist_wsadowo(metryki)
+        SilnikStatusu.okresl_status_wsadowo(metryki)
+        # Kilka ms w praktyce - próg z zapasem na wolne maszyny CI
+        assert time.perf_counter() - start < 0.5
+
+
+def _uniwersum(n=40, seed=7):
+    """Ramki ze wskaźnikami (oblicz_wskazniki) - także krótkie, puste i bez RS"""
+    rng = np.random.default_rng(seed)
+    bench = None
+    dane = {}
+    for i in range(n):
+        dlugosc = 30 if i % 13 == 5 else 320
+        close = 100 * np.exp(np.cumsum(rng.normal(rng.normal(0, 0.002), 0.015, dlugosc)))
+        df = pd.DataFrame({
+            'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+            'volume': rng.integers(1000, 5000, dlugosc).astype(float),
+        }, index=pd.bdate_range('2022-01-03', periods=dlugosc))
+        if bench is None:
+            bench = df
+        dane[f'T{i}'] = SilnikWskaznikow.oblicz_wskazniki(df, bench)
+    dane['T3'] = dane['T3'].drop(columns=['RS_Ratio', 'RS_SMA50'])
+    dane['T4'].iloc[-1, dane['T4'].columns.get_loc('Mom3M')] = np.nan
+    dane['PUSTY'] = pd.DataFrame(columns=['close'])
+    return dane, bench
+
+
+class TestCompositeWsadowo:
+    """Test suite dla RankingEngine.composite_wsadowo"""
+
+    def test_zgodny_ze_skalarnym(self):
+        dane, bench = _uniwersum()
+        wsadowo = RankingEngine.composite_wsadowo(dane, bench)
+
+        assert list(wsadowo.index) == list(dane)
+        for tyker, df in dane.items():
+            skalarnie = RankingEngine.calculate_composite_score(tyker, df, bench, dane)
+            assert wsadowo.loc[tyker].to_dict() == skalarnie, tyker
+
+    def test_rozne_poziomy(self):
+        dane, bench = _uniwersum()
+        wsadowo = RankingEngine.composite_wsadowo(dane, bench)
+        assert wsadowo['rs_percentile'].nunique() > 10
+        assert set(wsadowo['tier']) <= {'A', 'B', 'C'}
+
+    @pytest.mark.parametrize('dlugosc', [200, 240, 250, 255, 300])
+    def test_tydzien_zgodny_z_widokiem(self, dlugosc):
+        """Warunek tygodniowy z tablic = widok tygodniowy WidokiInterwalow (także świece weekendowe)"""
+        rng = np.random.default_rng(dlugosc)
+        daty = pd.date_range('2022-01-01', periods=dlugosc, freq='D')
+        close = 100 + np.cumsum(rng.normal(0, 1, dlugosc))
+        sma200 = pd.Series(close).rolling(200).mean().to_numpy().copy()
+        sma200[-3:-1] = np.nan
+        df = pd.DataFrame({'close': close, 'SMA200': sma200}, index=daty)
+
+        tydzien = WidokiInterwalow.dla(df).tygodniowy()[['close', 'SMA200']].dropna()
+        oczekiwane = len(tydzien) >= 10 and tydzien.iloc[-1]['close'] > tydzien.iloc[-1]['SMA200']
+        assert RankingEngine._tydzien_nad_sma200(df) == oczekiwane
+
+    def test_pusta_watchlista(self):
+        assert RankingEngine.composite_wsadowo({}).empty
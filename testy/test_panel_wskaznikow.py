@@ -0,0 +1,93 @@
+"""
+Testy dla PanelWskaznikow - wskaźniki całego uniwersum jako tablice (daty x tykery).
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.panel_wskaznikow import PanelWskaznikow
+from analiza.top1_engine import SilnikDecyzyjny
+from analiza.wskazniki import SilnikWskaznikow
+from conftest import ramka_ohlcv
+
+
+@pytest.fixture
+def uniwersum():
+    luka = ramka_ohlcv(400, seed=5)
+    return {
+        'DLUGI': ramka_ohlcv(600, seed=1),
+        'KROTKI': ramka_ohlcv(150, seed=2, start='2019-06-03'),      # bez nachyleń (za krótki)
+        'NOWY': ramka_ohlcv(300, seed=3, start='2019-01-01'),        # historia od środka kalendarza
+        'STARY': ramka_ohlcv(250, seed=4),                           # historia kończy się wcześniej
+        'LUKA': luka.drop(index=luka.index[[100, 101]]),             # luka w notowaniach -> osobno
+        'ODWROCONY': ramka_ohlcv(300, seed=6).iloc[::-1],            # nieposortowane daty -> osobno
+    }
+
+
+@pytest.fixture
+def benchmark():
+    bench = ramka_ohlcv(600, seed=9)
+    return bench.drop(index=bench.index[[300]])
+
+
+class TestPanelWskaznikow:
+    """Test suite dla PanelWskaznikow"""
+
+    def test_podzial_panel_i_osobno(self, uniwersum):
+        kalendarz, panel, osobno = PanelWskaznikow.podziel(uniwersum)
+        assert set(panel) == {'DLUGI', 'KROTKI', 'NOWY', 'STARY'}
+        assert osobno == ['LUKA', 'ODWROCONY']
+        # Wiersz panelu to ta sama data dla wszystkich tykerów
+        for start, df in panel.values():
+            assert kalendarz[start:start + len(df)].equals(df.index.as_unit('ns'))
+
+    @pytest.mark.parametrize('z_benchmarkiem', [True, False])
+    def test_zgodnosc_z_oblicz_wskazniki(self, uniwersum, benchmark, z_benchmarkiem):
+        bench = benchmark if z_benchmarkiem else None
+        wynik = PanelWskaznikow.oblicz({t: df.copy() for t, df in uniwersum.items()}, bench)
+
+        assert list(wynik) == list(uniwersum)
+        for tyker, df in uniwersum.items():
+            oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench)
+            pd.testing.assert_frame_equal(wynik[tyker], oczekiwane, check_freq=False, rtol=1e-9)
+
+    def test_wejscie_bez_zmian(self, uniwersum, benchmark):
+        """Zwracane są nowe ramki - kolumny wskaźników nie trafiają do ramek wywołującego"""
+        kolumny = {t: list(df.columns) for t, df in uniwersum.items()}
+        wynik = PanelWskaznikow.oblicz(uniwersum, benchmark)
+
+        for tyker, df in uniwersum.items():
+            assert list(df.columns) == kolumny[tyker]
+            assert wynik[tyker] is not df
+            assert 'SMA200' in wynik[tyker].columns
+
+    def test_top1_bez_mutacji(self, uniwersum, benchmark):
+        """wybierz_top1 liczy wskaźniki panelem, ramki wywołującego zostają bez zmian"""
+        kolumny = {t: list(df.columns) for t, df in uniwersum.items()}
+        rynek = SilnikWskaznikow.oblicz_wskazniki(benchmark.copy())
+        wynik = SilnikDecyzyjny.wybierz_top1(uniwersum, rynek)
+
+        assert 'status' in wynik
+        assert {t: list(df.columns) for t, df in uniwersum.items()} == kolumny
+
+    def test_nietypowa_data_jednego_tykera(self, benchmark):
+        """Świeca w sobotę u jednego tykera nie wyrzuca pozostałych z panelu"""
+        uniwersum = {f'T{i:03d}': ramka_ohlcv(300, seed=100 + i, start='2015-06-01') for i in range(200)}
+        dziwny = ramka_ohlcv(300, seed=99, start='2015-06-01')
+        sobota = dziwny.iloc[[150]].set_axis(pd.DatetimeIndex(['2016-01-02'], name='data'))
+        uniwersum['DZIWNY'] = pd.concat([dziwny, sobota]).sort_index()
+        bench = ramka_ohlcv(300, seed=9, start='2015-06-01')
+
+        kalendarz, panel, osobno = PanelWskaznikow.podziel(uniwersum)
+        assert len(panel) == 200 and osobno == ['DZIWNY']
+        assert pd.Timestamp('2016-01-02') not in kalendarz
+
+        wynik = PanelWskaznikow.oblicz({t: df.copy() for t, df in uniwersum.items()}, bench)
+        for tyker in ('T000', 'T199', 'DZIWNY'):
+            oczekiwane = SilnikWskaznikow.oblicz_wskazniki(uniwersum[tyker].copy(), bench)
+            pd.testing.assert_frame_equal(wynik[tyker], oczekiwane, check_freq=False, rtol=1e-9)
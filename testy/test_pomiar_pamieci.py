@@ -0,0 +1,93 @@
+"""
+Testy dla potoku wskaźników bez kopii (SilnikWskaznikow.oblicz_kolumny) i PomiarPamieci.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.pomiar_pamieci import PomiarPamieci
+from analiza.wskazniki import SilnikWskaznikow
+from conftest import ramka_ohlcv
+
+
+class TestObliczKolumny:
+    """Test suite dla SilnikWskaznikow.oblicz_kolumny"""
+
+    def test_zgodne_z_oblicz_wskazniki(self):
+        df, bench = ramka_ohlcv(400, seed=1), ramka_ohlcv(400, seed=2)
+        kolumny = SilnikWskaznikow.oblicz_kolumny(df, bench)
+        pelne = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench)
+        pd.testing.assert_frame_equal(kolumny, pelne[list(SilnikWskaznikow.KOLUMNY_WSKAZNIKOW)])
+
+    def test_wejscie_bez_zmian(self):
+        df = ramka_ohlcv(300, seed=3)
+        kopia = df.copy()
+        SilnikWskaznikow.oblicz_kolumny(df)
+        pd.testing.assert_frame_equal(df, kopia)
+
+    def test_jeden_blok_bez_ohlcv(self):
+        df = ramka_ohlcv(300, seed=4)
+        kolumny = SilnikWskaznikow.oblicz_kolumny(df)
+        assert list(kolumny.columns) == list(SilnikWskaznikow.KOLUMNY_WSKAZNIKOW)
+        # Wszystkie kolumny to widoki jednej prealokowanej tablicy
+        blok = kolumny.to_numpy()
+        assert np.shares_memory(kolumny['SMA50'].to_numpy(), blok)
+        assert np.shares_memory(kolumny['DollarVol20'].to_numpy(), blok)
+
+    def test_polskie_nazwy_kolumn_w_miejscu(self):
+        df = ramka_ohlcv(300, seed=5).rename(columns={
+            'open': 'otwarcie', 'high': 'najwyzszy', 'low': 'najnizszy', 'close': 'zamkniecie', 'volume': 'wolumen'})
+        wynik = SilnikWskaznikow.oblicz_wskazniki(df)
+        assert 'close' in wynik.columns and 'SMA50' in wynik.columns
+        # OHLCV nie jest kopiowane przy zmianie nazw
+        assert np.shares_memory(wynik['close'].to_numpy(), df['zamkniecie'].to_numpy())
+
+    def test_normalizuj_kolumny_bez_kopii(self):
+        """rename na polskich nazwach (copy-on-write) - kolumny OHLCV wspólne z wejściem"""
+        df = ramka_ohlcv(300, seed=6).rename(columns={v: k for k, v in SilnikWskaznikow.MAPA_KOLUMN.items()})
+        wynik = SilnikWskaznikow.normalizuj_kolumny(df)
+        for polska, angielska in SilnikWskaznikow.MAPA_KOLUMN.items():
+            if polska in df.columns:
+                assert np.shares_memory(wynik[angielska].to_numpy(), df[polska].to_numpy())
+
+    def test_plytka_kopia_bez_kopii_ohlcv(self):
+        """oblicz_wskazniki na copy(deep=False) (rezim, top1, cache) - OHLCV wspólne, df bez zmian"""
+        df = ramka_ohlcv(300, seed=7)
+        kolumny = list(df.columns)
+        wynik = SilnikWskaznikow.oblicz_wskazniki(df.copy(deep=False))
+        assert list(df.columns) == kolumny
+        for kolumna in kolumny:
+            assert np.shares_memory(wynik[kolumna].to_numpy(), df[kolumna].to_numpy())
+
+
+class TestPomiarPamieci:
+    """Test suite dla PomiarPamieci"""
+
+    def test_szczyt(self):
+        wynik, bajty = PomiarPamieci.szczyt(np.ones, 1_000_000)
+        assert len(wynik) == 1_000_000
+        assert bajty >= 8_000_000
+
+    def test_raport_na_tyker(self):
+        dane = {'AAA': ramka_ohlcv(500, seed=6), 'BBB': ramka_ohlcv(250, seed=7), 'PUSTY': pd.DataFrame()}
+        kolumny = {t: list(df.columns) for t, df in dane.items()}
+
+        raport = PomiarPamieci.na_tyker(dane, ramka_ohlcv(500, seed=8))
+
+        assert list(raport['Tyker']) == ['AAA', 'BBB']
+        assert list(raport['Swiece']) == [500, 250]
+        assert (raport['Szczyt_KB'] > 0).all()
+        assert (raport['Wynik_KB'] > 0).all()
+        assert {t: list(df.columns) for t, df in dane.items()} == kolumny
+
+    @pytest.mark.parametrize('w_miejscu', [True, False])
+    def test_ramki_wejsciowe_bez_zmian(self, w_miejscu):
+        dane = {'AAA': ramka_ohlcv(300, seed=9)}
+        PomiarPamieci.na_tyker(dane, w_miejscu=w_miejscu)
+        assert list(dane['AAA'].columns) == ['open', 'high', 'low', 'close', 'volume']
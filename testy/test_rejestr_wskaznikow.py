@@ -0,0 +1,146 @@
+"""
+Testy dla RejestrWskaznikow - wskaźniki liczone tylko na żądanie (RSI, MACD, Bollinger, ADX).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.graf_wskaznikow import GrafWskaznikow
+from analiza.ranking import RankingEngine
+from analiza.rejestr_wskaznikow import RejestrWskaznikow
+from conftest import ramka_ohlcv
+from konfiguracja import Konfiguracja
+
+
+def _rsi_petla(close, n):
+    """Referencja: RSI Wildera liczony świeca po świecy"""
+    zmiany = np.diff(close)
+    wynik = np.full(len(close), np.nan)
+    # Wygładzanie ewm(adjust=False) startuje od pierwszej zmiany, nie od średniej z n zmian
+    sr_w = max(zmiany[0], 0.0)
+    sr_s = max(-zmiany[0], 0.0)
+    for i, zmiana in enumerate(zmiany[1:], start=2):
+        sr_w += (max(zmiana, 0.0) - sr_w) / n
+        sr_s += (max(-zmiana, 0.0) - sr_s) / n
+        if i >= n:
+            wynik[i] = 100 * sr_w / (sr_w + sr_s)
+    return wynik
+
+
+class TestRejestrWskaznikow:
+    """Test suite dla RejestrWskaznikow"""
+
+    def test_rsi_zgodny_z_petla(self):
+        df = ramka_ohlcv()
+        rsi = RejestrWskaznikow.oblicz(df, ['RSI14'])['RSI14'].to_numpy()
+        assert np.allclose(rsi, _rsi_petla(df['close'].to_numpy(), 14), equal_nan=True)
+        assert np.isnan(rsi[:14]).all() and not np.isnan(rsi[14:]).any()
+        assert ((rsi[14:] >= 0) & (rsi[14:] <= 100)).all()
+
+    def test_macd_i_bollinger(self):
+        df = ramka_ohlcv()
+        wynik = RejestrWskaznikow.oblicz(df, ['MACD', 'MACD_Signal', 'MACD_Hist', 'BB_Width'])
+
+        macd = df['close'].ewm(span=12, adjust=False).mean() - df['close'].ewm(span=26, adjust=False).mean()
+        sygnal = macd.ewm(span=9, adjust=False).mean()
+        srednia = df['close'].rolling(20).mean()
+        odchylenie = df['close'].rolling(20).std(ddof=0)
+        szerokosc = ((srednia + 2 * odchylenie) - (srednia - 2 * odchylenie)) / srednia * 100
+
+        assert np.allclose(wynik['MACD'].iloc[25:], macd.iloc[25:])
+        assert np.allclose(wynik['MACD_Signal'].iloc[33:], sygnal.iloc[33:])
+        assert np.allclose(wynik['MACD_Hist'].iloc[33:], (macd - sygnal).iloc[33:])
+        assert np.allclose(wynik['BB_Width'].iloc[19:], szerokosc.iloc[19:])
+        assert wynik['MACD'].iloc[:25].isna().all()
+
+    def test_adx_sila_trendu(self):
+        trend = RejestrWskaznikow.ostatnie(ramka_ohlcv(dryf=0.01), ['ADX14', 'DI_Plus14', 'DI_Minus14'])
+        boczny = RejestrWskaznikow.ostatnie(ramka_ohlcv(dryf=0.0), ['ADX14'])
+        assert trend['ADX14'] > boczny['ADX14']
+        assert trend['DI_Plus14'] > trend['DI_Minus14']
+        assert 0 <= boczny['ADX14'] <= 100
+
+    def test_liczone_tylko_zadane(self):
+        df = ramka_ohlcv()
+        wynik = RejestrWskaznikow.oblicz(df, ['RSI14'])
+        assert list(wynik.columns) == ['RSI14']
+        wezly = GrafWskaznikow.dla(df)._wyniki
+        assert 'RSI_14' in wezly
+        assert not any(w.startswith(('ADX', 'MACD', 'EMA', 'BB_WIDTH')) for w in wezly)
+
+    def test_wspolne_wezly_liczone_raz(self, monkeypatch):
+        df = ramka_ohlcv()
+        wywolania = []
+        oryginal = GrafWskaznikow._ema
+
+        def _spy(self, df, n):
+            wywolania.append(n)
+            return oryginal(self, df, n)
+
+        monkeypatch.setattr(GrafWskaznikow, '_ema', _spy)
+        RejestrWskaznikow.oblicz(df, ['MACD', 'MACD_Signal', 'MACD_Hist'])
+        assert sorted(wywolania) == [12, 26]
+
+    def test_wlasny_wskaznik(self):
+        @RejestrWskaznikow.zarejestruj('Stoch14', wejscia=('high', 'low', 'close'), rozbieg=14)
+        def _stochastic(graf, df):
+            return (df['close'] - graf['LOW_MIN_14']) / (graf['HIGH_MAX_14'] - graf['LOW_MIN_14']) * 100
+
+        try:
+            assert RejestrWskaznikow.wymagane(['Tyker', 'Stoch14', 'SMA50', 'Stoch14']) == ('Stoch14',)
+            wynik = RejestrWskaznikow.oblicz(ramka_ohlcv(), ['Stoch14'])['Stoch14']
+            assert wynik.iloc[:13].isna().all()
+            assert ((wynik.iloc[13:] >= 0) & (wynik.iloc[13:] <= 100)).all()
+            with pytest.raises(ValueError):
+                RejestrWskaznikow.zarejestruj('Stoch14')(_stochastic)
+        finally:
+            RejestrWskaznikow.wyrejestruj('Stoch14')
+
+    def test_nazwa_kolumny_silnika_zajeta(self):
+        with pytest.raises(ValueError):
+            RejestrWskaznikow.zarejestruj('SMA50')(lambda graf, df: df['close'])
+
+    def test_brak_wejscia_nan(self):
+        df = ramka_ohlcv()[['close']]
+        wynik = RejestrWskaznikow.oblicz(df, ['ADX14', 'RSI14'])
+        assert wynik['ADX14'].isna().all()
+        assert wynik['RSI14'].notna().any()
+
+    def test_nieznany_wskaznik(self):
+        with pytest.raises(KeyError):
+            RejestrWskaznikow.oblicz(ramka_ohlcv(), ['XYZ'])
+
+    def test_rozbieg(self):
+        assert RejestrWskaznikow.rozbieg(['RSI14', 'ADX14']) == 27
+        assert RejestrWskaznikow.rozbieg([]) == 0
+
+    def test_ranking_z_wskaznikami(self):
+        dane = {'AAA': ramka_ohlcv(300, seed=1, dryf=0.002), 'BBB': ramka_ohlcv(300, seed=2)}
+        bench = ramka_ohlcv(300, seed=3)
+        ranking = RankingEngine.generuj_ranking(dane, bench, wskazniki=['RSI14', 'ADX14', 'Tyker'])
+        assert {'RSI14', 'ADX14'} <= set(ranking.columns)
+        assert 'MACD' not in ranking.columns
+        wiersz = ranking.set_index('Tyker').loc['AAA']
+        assert wiersz['RSI14'] == pytest.approx(RejestrWskaznikow.ostatnie(dane['AAA'], ['RSI14'])['RSI14'])
+
+    def test_nazwa_i_rozbieg_z_biezacej_konfiguracji(self, monkeypatch):
+        monkeypatch.setattr(Konfiguracja, 'OKRES_RSI', 10)
+        monkeypatch.setattr(Konfiguracja, 'OKRES_ADX', 7)
+
+        assert {'RSI10', 'ADX7', 'DI_Plus7'} <= set(RejestrWskaznikow.nazwy())
+        assert 'RSI14' not in RejestrWskaznikow.nazwy()
+        assert RejestrWskaznikow.rozbieg(['RSI10', 'ADX7']) == 13
+        rsi = RejestrWskaznikow.oblicz(ramka_ohlcv(), ['RSI10'])['RSI10'].to_numpy()
+        assert np.isnan(rsi[:10]).all() and not np.isnan(rsi[10:]).any()
+
+    def test_dolacz_nowa_ramka(self):
+        df = ramka_ohlcv()
+        wynik = RejestrWskaznikow.dolacz(df)
+        assert list(wynik.columns) == list(df.columns) + list(RejestrWskaznikow.nazwy())
+        assert 'RSI14' not in df.columns
+        assert wynik['ADX14'].iloc[-1] == pytest.approx(RejestrWskaznikow.ostatnie(df, ['ADX14'])['ADX14'])
@@ -0,0 +1,106 @@
+"""
+Testy dla shardowanego magazynu świec (dane/shardy.py + routing w RepozytoriumDanych).
+"""
+
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dane import shardy
+from dane.baza import BazaDanych
+from dane.modele import CandleBatch
+from dane.repozytorium import RepozytoriumDanych
+from konfiguracja import Konfiguracja
+
+TYKERY = ['AAPL', 'MSFT', 'NVDA', 'AMZN', 'META', 'GOOG', 'TSLA', 'SPY']
+
+
+def _batch(tyker, n=5):
+    daty = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-01') + n)
+    ceny = np.linspace(100.0, 100.0 + n, n)
+    return CandleBatch(tyker, daty, ceny, ceny + 1, ceny - 1, ceny, np.full(n, 1000))
+
+
+def _liczba_swiec(sciezka):
+    conn = sqlite3.connect(sciezka)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM swiece").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def katalog(tmp_path, monkeypatch):
+    """Baza główna i shardy w katalogu tymczasowym"""
+    monkeypatch.chdir(tmp_path)
+    baza = BazaDanych()
+    baza.inicjalizuj()
+    yield tmp_path
+    baza.zamknij_shardy()
+    baza.polaczenie.close()
+    baza.polaczenie = None
+
+
+class TestShardy:
+    """Test suite dla shardów świec"""
+
+    def test_numer_sharda_stabilny(self):
+        """crc32 - ten sam tyker zawsze w tym samym shardzie"""
+        assert shardy.numer_sharda('AAPL', 4) == shardy.numer_sharda('AAPL', 4)
+        assert {shardy.numer_sharda(t, 4) for t in TYKERY} <= set(range(4))
+
+    def test_repozytorium_routing(self, katalog, monkeypatch):
+        """Ten sam interfejs repozytorium przy LICZBA_SHARDOW > 0"""
+        monkeypatch.setattr(Konfiguracja, 'LICZBA_SHARDOW', 3)
+        repo = RepozytoriumDanych()
+        for t in TYKERY:
+            repo.zapisz_swiece(_batch(t))
+
+        assert repo.pobierz_wszystkie_tykery() == sorted(TYKERY)
+        assert len(repo.pobierz_swiece_df('NVDA')) == 5
+        assert repo.pobierz_ostatnia_data('NVDA') == '2024-01-05'
+        assert repo.usun_dane_tykera('NVDA') == 5
+        assert not repo.czy_ticker_istnieje('NVDA')
+
+        # Świece nie trafiają do głównej bazy
+        assert _liczba_swiec(shardy.sciezka_glowna()) == 0
+        liczby = [_liczba_swiec(s) for s in shardy.sciezki_swiec(3)]
+        assert sum(liczby) == 5 * (len(TYKERY) - 1)
+
+    def test_zapis_rownolegly(self, katalog):
+        """Zapis z osobnych procesów - każdy tyker w swoim shardzie"""
+        zapisane = shardy.zapisz_rownolegle([_batch(t) for t in TYKERY], liczba_shardow=4, procesy=2)
+        assert zapisane == 5 * len(TYKERY)
+
+        for t in TYKERY:
+            conn = shardy.otworz_do_odczytu(shardy.sciezka_dla_tykera(t, 4))
+            try:
+                assert conn.execute("SELECT COUNT(*) FROM swiece WHERE tyker = ?", (t,)).fetchone()[0] == 5
+            finally:
+                conn.close()
+
+    def test_przeshardyj_i_scal(self, katalog):
+        """0 -> 3 -> 5 shardów i z powrotem do jednego pliku bez utraty danych"""
+        repo = RepozytoriumDanych()
+        for t in TYKERY:
+            repo.zapisz_swiece(_batch(t))
+        razem = 5 * len(TYKERY)
+
+        assert sum(shardy.przeshardyj(3, stara_liczba=0, usun_stare=True).values()) == razem
+        assert _liczba_swiec(shardy.sciezka_glowna()) == 0
+
+        assert sum(shardy.przeshardyj(5, stara_liczba=3, usun_stare=True).values()) == razem
+        assert not any(os.path.exists(s) for s in shardy.sciezki_swiec(3))
+        for numer, sciezka in enumerate(shardy.sciezki_swiec(5)):
+            conn = sqlite3.connect(sciezka)
+            tykery = [r[0] for r in conn.execute("SELECT DISTINCT tyker FROM swiece")]
+            conn.close()
+            assert all(shardy.numer_sharda(t, 5) == numer for t in tykery)
+
+        assert shardy.scal_shardy(5, usun_shardy=True) == razem
+        assert repo.pobierz_wszystkie_tykery() == sorted(TYKERY)
@@ -0,0 +1,63 @@
+"""
+Testy dla StanWskaznikow - przyrostowa aktualizacja wskaźników o jedną świecę.
+"""
+
+import os
+import pickle
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.stan_wskaznikow import StanWskaznikow
+from analiza.wskazniki import SilnikWskaznikow
+from conftest import ramka_ohlcv
+
+
+def _przyrostowo(df, bench, start):
+    """Stan z pierwszych start świec, reszta dopisywana po jednej"""
+    poczatek = SilnikWskaznikow.oblicz_wskazniki(df.iloc[:start].copy(), bench)
+    stan = StanWskaznikow.z_ramki(poczatek, rs_aktywny=bench is not None)
+    bench_close = bench['close'] if bench is not None else pd.Series(dtype=float)
+
+    wiersze = []
+    for data, wiersz in df.iloc[start:].iterrows():
+        cb = bench_close[data] if data in bench_close.index else None
+        wiersze.append(stan.dodaj_swiece(data, wiersz['high'], wiersz['low'], wiersz['close'], cb, wiersz['volume']))
+    return stan, pd.DataFrame(wiersze, index=df.index[start:])
+
+
+class TestStanWskaznikow:
+    """Test suite dla StanWskaznikow"""
+
+    @pytest.mark.parametrize('z_benchmarkiem', [True, False])
+    def test_zgodnosc_z_pelnym_obliczeniem(self, z_benchmarkiem):
+        """600 dopisanych świec (kilka okresowych przeliczeń) = pełne oblicz_wskazniki"""
+        df = ramka_ohlcv(900, seed=3)
+        bench = None
+        if z_benchmarkiem:
+            # Dwie sesje bez notowań benchmarku -> RS_Ratio = 1.0 w tych dniach
+            bench = ramka_ohlcv(900, seed=4)
+            bench = bench.drop(index=bench.index[[450, 700]])
+
+        stan, wynik = _przyrostowo(df, bench, 300)
+        pelne = SilnikWskaznikow.oblicz_wskazniki(df.copy(), bench).iloc[300:]
+
+        assert stan.liczba_swiec == 900
+        pd.testing.assert_frame_equal(wynik, pelne[wynik.columns], check_freq=False, rtol=1e-9)
+
+    def test_za_krotka_historia(self):
+        df = SilnikWskaznikow.oblicz_wskazniki(ramka_ohlcv(100, seed=1))
+        assert StanWskaznikow.z_ramki(df, rs_aktywny=False) is None
+
+    def test_serializacja(self):
+        """Stan po pickle daje te same wyniki"""
+        df = ramka_ohlcv(400, seed=5)
+        stan, _ = _przyrostowo(df.iloc[:399], None, 300)
+        kopia = pickle.loads(pickle.dumps(stan))
+
+        ostatnia = df.iloc[-1]
+        swieca = (df.index[-1], ostatnia['high'], ostatnia['low'], ostatnia['close'], None, ostatnia['volume'])
+        assert kopia.dodaj_swiece(*swieca) == stan.dodaj_swiece(*swieca)
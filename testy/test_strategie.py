@@ -0,0 +1,66 @@
+"""
+Testy dla SmaZBanku i banku SMA w optymalizacji (wymagają backtradera).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+bt = pytest.importorskip('backtrader')
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.kernele import sma_bank
+from backtesting.silnik_backtestingu import SilnikBacktestingu, _dataframe_do_feed
+from backtesting.strategie import SmaZBanku
+from conftest import ramka_ohlcv
+
+
+class _Porownanie(bt.Strategy):
+    """Zapisuje SmaZBanku i btind.SMA tego samego okresu dla każdej świecy."""
+
+    params = (('wartosci', None), ('period', 20))
+
+    def __init__(self):
+        self.z_banku = SmaZBanku(self.data.close, wartosci=self.p.wartosci, period=self.p.period)
+        self.sma = bt.indicators.SMA(self.data.close, period=self.p.period)
+        self.pary = []
+
+    def next(self):
+        self.pary.append((float(self.z_banku[0]), float(self.sma[0])))
+
+
+class TestSmaZBanku:
+    """Test suite dla SmaZBanku"""
+
+    @pytest.mark.parametrize('runonce', [True, False])
+    @pytest.mark.parametrize('okres', [20, 50])
+    def test_zgodny_z_btind_sma(self, runonce, okres):
+        df = ramka_ohlcv(300, seed=1)
+        cerebro = bt.Cerebro(stdstats=False)
+        cerebro.adddata(_dataframe_do_feed(df))
+        cerebro.addstrategy(_Porownanie, wartosci=sma_bank(df['close'], [okres])[:, 0], period=okres)
+        strategia = cerebro.run(runonce=runonce, preload=True)[0]
+
+        pary = np.array(strategia.pary)
+        assert len(pary) == len(df) - okres + 1
+        np.testing.assert_allclose(pary[:, 0], pary[:, 1], rtol=1e-9)
+
+
+class TestOptymalizacjaZBankiem:
+    """Test suite dla uruchom_optymalizacje z bankiem SMA"""
+
+    def test_metryki_jak_bez_banku(self):
+        df = ramka_ohlcv(600, seed=2)
+        siatka = {'sma_fast': [20, 50], 'sma_slow': [100, 200]}
+        wynik = SilnikBacktestingu.uruchom_optymalizacje(df, 'SMA Crossover (baseline)', siatka)
+
+        assert len(wynik) == 4
+        for _, wiersz in wynik.iterrows():
+            params = {'sma_fast': int(wiersz['sma_fast']), 'sma_slow': int(wiersz['sma_slow'])}
+            bez_banku = SilnikBacktestingu.uruchom(df, 'SMA Crossover (baseline)', params)
+            assert bez_banku['error'] is None
+            for klucz, wartosc in bez_banku['metryki'].items():
+                assert wiersz[klucz] == pytest.approx(wartosc, rel=1e-12)
@@ -0,0 +1,102 @@
+"""
+Testy dla TypyKompaktowe - tryb zwartych typów (float32 / category / int8).
+"""
+
+import os
+import pickle
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.cache_wskaznikow import CacheWskaznikow
+from analiza.panel_wskaznikow import PanelWskaznikow
+from analiza.ranking import RankingEngine
+from analiza.typy_kompaktowe import TypyKompaktowe
+from analiza.wskazniki import SilnikWskaznikow
+from dane.baza import BazaDanych
+from konfiguracja import Konfiguracja
+from conftest import ramka_ohlcv
+
+
+@pytest.fixture
+def kompaktowy(monkeypatch):
+    monkeypatch.setattr(Konfiguracja, 'TRYB_KOMPAKTOWY', True)
+
+
+@pytest.fixture
+def dane():
+    return {f'T{i}': ramka_ohlcv(400, seed=i) for i in range(6)}, ramka_ohlcv(400, seed=100)
+
+
+class TestTypyKompaktowe:
+    """Test suite dla TypyKompaktowe"""
+
+    def test_ranking(self, dane, monkeypatch):
+        tykery, bench = dane
+        pelny = RankingEngine.generuj_ranking({t: df.copy() for t, df in tykery.items()}, bench)
+        monkeypatch.setattr(Konfiguracja, 'TRYB_KOMPAKTOWY', True)
+        zwarty = RankingEngine.generuj_ranking({t: df.copy() for t, df in tykery.items()}, bench)
+
+        assert isinstance(zwarty['Status'].dtype, pd.CategoricalDtype)
+        assert isinstance(zwarty['Tier'].dtype, pd.CategoricalDtype)
+        assert isinstance(zwarty['Tyker'].dtype, pd.CategoricalDtype)
+        assert zwarty['ChecklistScore'].dtype == np.int8
+        assert zwarty['RS_Ratio'].dtype == np.float32
+        assert zwarty['Tyker'].tolist() == pelny['Tyker'].tolist()
+        assert (zwarty['Status'] == 'TRADEABLE').tolist() == (pelny['Status'] == 'TRADEABLE').tolist()
+        np.testing.assert_allclose(zwarty['SMA200'], pelny['SMA200'], rtol=TypyKompaktowe.TOLERANCJA_FLOAT32)
+        assert zwarty.memory_usage(deep=True).sum() < pelny.memory_usage(deep=True).sum()
+
+    def test_panel_float32(self, dane, kompaktowy):
+        tykery, bench = dane
+        wynik = PanelWskaznikow.oblicz({t: df.copy() for t, df in tykery.items()}, bench)
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(tykery['T0'].copy(), bench)
+
+        for kolumna in PanelWskaznikow.KOLUMNY:
+            assert wynik['T0'][kolumna].dtype == np.float32
+            np.testing.assert_allclose(wynik['T0'][kolumna], oczekiwane[kolumna],
+                                       rtol=TypyKompaktowe.TOLERANCJA_FLOAT32, atol=1e-12)
+        assert wynik['T0']['close'].dtype == np.float64
+
+    def test_cache(self, dane, kompaktowy):
+        baza = BazaDanych()
+        baza.polaczenie = sqlite3.connect(':memory:')
+        baza.utworz_tabele()
+        try:
+            cache = CacheWskaznikow()
+            df = dane[0]['T1']
+            pierwszy = cache.oblicz('T1', df.copy())
+            drugi = cache.oblicz('T1', df.copy())
+        finally:
+            baza.polaczenie.close()
+            baza.polaczenie = None
+
+        assert pierwszy['SMA50'].dtype == np.float32
+        pd.testing.assert_frame_equal(pierwszy, drugi)
+
+    def test_cache_trzyma_float64(self, dane, kompaktowy):
+        """Cache i dopisane wiersze w float64 - zwężana tylko zwracana ramka"""
+        baza = BazaDanych()
+        baza.polaczenie = sqlite3.connect(':memory:')
+        baza.utworz_tabele()
+        try:
+            cache = CacheWskaznikow()
+            df = dane[0]['T1']
+            cache.oblicz('T1', df.iloc[:-3].copy())
+            zapisane = pickle.loads(cache.polaczenie.execute("SELECT dane FROM cache_wskaznikow").fetchone()[0])
+            wynik = cache.oblicz('T1', df.copy())
+            wpis = cache._wczytaj('T1')
+        finally:
+            baza.polaczenie.close()
+            baza.polaczenie = None
+
+        assert (zapisane.dtypes == np.float64).all()
+        assert (wpis['dane'].dtypes == np.float64).all()
+        assert wynik['SMA50'].dtype == np.float32
+        oczekiwane = SilnikWskaznikow.oblicz_wskazniki(df.copy())
+        np.testing.assert_allclose(wpis['dane']['SMA50'], oczekiwane['SMA50'], rtol=1e-9)
@@ -134,6 +134,12 @@ class TestVolatilityMetrics:
         assert metrics['atr_pct'] >= 0, "ATR% powinno być >= 0"
         assert 0 <= metrics['atr_percentile'] <= 100, "ATR percentile powinno być 0-100"
 
+    def test_calculate_volatility_metrics_nie_modyfikuje_wejscia(self, ohlc_data):
+        """Metryki liczone bez dopisywania kolumn do ramki wywołującego"""
+        kolumny = list(ohlc_data.columns)
+        VolatilityMetrics.calculate_volatility_metrics(ohlc_data)
+        assert list(ohlc_data.columns) == kolumny, "Ramka wejściowa nie powinna dostać kolumny ATR14"
+
     def test_calculate_volatility_metrics_empty_dataframe(self):
         """Test obsługi pustego DataFrame"""
         empty_df = pd.DataFrame()
@@ -0,0 +1,90 @@
+"""
+Testy dla WidokiInterwalow - wspólny cache widoków tygodniowych i miesięcznych.
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analiza.kernele import rolling_slope
+from analiza.ranking import RankingEngine
+from analiza.rezim import SilnikRezimu
+from analiza.slope import SlopeMetrics
+from analiza.widoki_interwalow import WidokiInterwalow
+from analiza.wskazniki import SilnikWskaznikow
+from conftest import ramka_ohlcv
+
+
+def _ramka(n, seed=7):
+    return SilnikWskaznikow.oblicz_wskazniki(ramka_ohlcv(n, seed, zmiennosc=0.01))
+
+
+def _oczekiwany(df, regula):
+    agregacja = {k: WidokiInterwalow.AGREGACJA_OHLCV.get(k, 'last') for k in df.columns}
+    return df.resample(regula).agg(agregacja).dropna(subset=['close'])
+
+
+class TestWidokiInterwalow:
+    """Test suite dla WidokiInterwalow"""
+
+    @pytest.mark.parametrize('interwal, regula', [('W', 'W'), ('M', pd.offsets.MonthEnd())])
+    def test_zgodnosc_z_resample(self, interwal, regula):
+        df = _ramka(500)
+        pd.testing.assert_frame_equal(WidokiInterwalow.dla(df)[interwal], _oczekiwany(df, regula), check_freq=False)
+
+    def test_resample_raz_na_ramke(self, monkeypatch):
+        """Slope, ranking i reżim korzystają z jednego widoku tygodniowego"""
+        df = _ramka(500)
+        wywolania = []
+        oryginal = WidokiInterwalow._resample
+        monkeypatch.setattr(WidokiInterwalow, '_resample',
+                            lambda self, d, i: wywolania.append(i) or oryginal(self, d, i))
+
+        SlopeMetrics.calculate_multi_slope(df)
+        RankingEngine.calculate_composite_score('X', df, df)
+        SilnikRezimu.detect_regime(df)
+
+        assert wywolania == ['W']
+
+    def test_nachylenie_tygodniowe(self):
+        df = _ramka(500)
+        tydzien = _oczekiwany(df, 'W')['SMA200'].dropna()
+        oczekiwane = rolling_slope(tydzien, 20)[-1]
+
+        assert WidokiInterwalow.dla(df).nachylenie('W', 'SMA200', 20) == pytest.approx(oczekiwane)
+        assert SlopeMetrics.calculate_multi_slope(df)['sma200_slope_weekly'] == pytest.approx(oczekiwane)
+
+    @pytest.mark.parametrize('interwal, regula', [('W', 'W'), ('M', pd.offsets.MonthEnd())])
+    def test_przyrostowo_ostatnia_swieca(self, interwal, regula, monkeypatch):
+        """Dopisana / poprawiona świeca -> przeliczany tylko ogon od przedostatniego okresu"""
+        pelny = _ramka(400)
+        df = pelny.iloc[:399].copy()
+        widoki = WidokiInterwalow.dla(df)
+        widoki[interwal]
+
+        dlugosci = []
+        oryginal = WidokiInterwalow._resample
+        monkeypatch.setattr(WidokiInterwalow, '_resample',
+                            lambda self, d, i: dlugosci.append(len(d)) or oryginal(self, d, i))
+
+        df.loc[pelny.index[-1]] = pelny.iloc[-1]
+        assert WidokiInterwalow.dla(df) is widoki
+        pd.testing.assert_frame_equal(widoki[interwal], _oczekiwany(df, regula), check_freq=False)
+
+        df.loc[df.index[-1], 'close'] *= 1.05
+        WidokiInterwalow.dla(df)
+        pd.testing.assert_frame_equal(widoki[interwal], _oczekiwany(df, regula), check_freq=False)
+
+        assert len(dlugosci) == 2 and max(dlugosci) < 50
+
+    def test_nowe_kolumny_pelne_przeliczenie(self):
+        df = _ramka(300)[['open', 'high', 'low', 'close', 'volume']].copy()
+        widoki = WidokiInterwalow.dla(df)
+        assert 'SMA200' not in widoki['W'].columns
+
+        SilnikWskaznikow.oblicz_wskazniki(df)
+        assert 'SMA200' in WidokiInterwalow.dla(df)['W'].columns